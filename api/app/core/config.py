@@ -10,12 +10,35 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     LOG_LEVEL: str | int = Field(default=logging.INFO)
     STORAGE_PATH: str = "storage"
+    MAX_UPLOAD_BYTES: int = 500 * 1024 * 1024
+    UPLOAD_BATCH_MAX_FILES: int = 100
+    UPLOAD_BATCH_CONCURRENCY: int = 8
+    FILES_PAGE_DEFAULT_SIZE: int = 50
+    FILES_PAGE_MAX_SIZE: int = 200
+    FILE_CLEANUP_BATCH_SIZE: int = 500
+    STORAGE_BACKEND: str = "local"
+    STORAGE_CACHE_PATH: str = "storage_cache"
+    STORAGE_CACHE_MAX_BYTES: int = 5 * 1024 * 1024 * 1024
+    STORAGE_CACHE_MIN_AGE_SECONDS: int = 900
+    S3_BUCKET: str = ""
+    S3_ENDPOINT_URL: str = ""
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY_ID: str = ""
+    S3_SECRET_ACCESS_KEY: str = ""
+    S3_MULTIPART_PART_BYTES: int = 8 * 1024 * 1024
+    S3_TRANSFER_CONCURRENCY: int = 4
 
     DB_HOST: str = ""
     DB_PORT: str = ""
     DB_NAME: str = ""
     DB_USER: str = ""
     DB_PASS: str = ""
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
 
     WORKOS_API_KEY: str = ""
     WORKOS_CLIENT_ID: str = ""
@@ -31,6 +54,48 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     CHAT_MODEL: str = "gpt-4o-mini"
     MAX_TOKENS: int = 1000
+    PROMPT_LAYOUT: str = "context_first"
+    REQUEST_DEADLINE_MS: int = 30000
+    CHUNK_SUMMARIES_ENABLED: bool = False
+    CHUNK_SUMMARY_MAX_TOKENS: int = 150
+    CHUNK_SUMMARY_BATCH_SIZE: int = 50000
+    INGESTION_JOB_HISTORY_SIZE: int = 10000
+    IMAGE_MIN_DIMENSION: int = 64
+    IMAGE_DISPLAY_MAX_DIMENSION: int = 1280
+    IMAGE_THUMBNAIL_MAX_DIMENSION: int = 256
+    IMAGE_WEBP_QUALITY: int = 80
+    IMAGE_PROCESSING_WORKERS: int = 2
+
+    LLM_HEDGING_ENABLED: bool = True
+    LLM_HEDGE_PERCENTILE: float = 95.0
+    LLM_HEDGE_DELAY_MS: int = 5000
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+
+    TRANSCRIPTION_BACKEND: str = "openai"
+    TRANSCRIPTION_MODEL: str = "whisper-1"
+    TRANSCRIPTION_LANGUAGE: str = "en"
+    AUDIO_MAX_UPLOAD_BYTES: int = 25 * 1024 * 1024
+    AUDIO_MAX_DURATION_SECONDS: int = 300
+    AUDIO_NORMALIZATION_ENABLED: bool = True
+    AUDIO_ENCODE_BITRATE: str = "24k"
+    AUDIO_SEGMENTATION_MIN_SECONDS: int = 30
+    AUDIO_SEGMENT_MAX_SECONDS: int = 20
+    AUDIO_SILENCE_TOP_DB: int = 35
+    TRANSCRIPTION_CONCURRENCY: int = 4
+    TRANSCRIPTION_CACHE_ENABLED: bool = True
+    TRANSCRIPTION_CACHE_MEMORY_SIZE: int = 1024
+    LOCAL_WHISPER_MODEL: str = "base"
+    LOCAL_WHISPER_WORKERS: int = 1
+
+    LLM_PROVIDER: str = "openai"
+    LLM_BATCH_CONCURRENCY: int = 16
+    LLM_BATCH_POLL_INTERVAL_SECONDS: int = 30
+    LOCAL_LLM_BASE_URL: str = "http://localhost:8001/v1"
+    LOCAL_LLM_PORT: int = 8001
+    LOCAL_LLM_MODE: str = "echo"
+    LOCAL_LLM_CANNED_ANSWER: str = "This is a canned answer from the local LLM stand-in."
+    LOCAL_LLM_LATENCY_MS: int = 0
+    LOCAL_LLM_TOKENS_PER_SECOND: float = 0.0
 
     model_config = SettingsConfigDict(
         env_file=Path(__file__).parent.parent.parent / ".env",
@@ -46,6 +111,10 @@ class Settings(BaseSettings):
     def STORAGE_DIR(self) -> Path:  # noqa: N802
         return Path(__file__).parent.parent.parent / self.STORAGE_PATH
 
+    @computed_field
+    def STORAGE_CACHE_DIR(self) -> Path:  # noqa: N802
+        return Path(__file__).parent.parent.parent / self.STORAGE_CACHE_PATH
+
     @computed_field
     def WORKOS_COOKIE_PASSWORD(self) -> str:  # noqa: N802
         if not self.WORKOS_COOKIE_SECRET:
@@ -1,16 +1,65 @@
+import time
 from collections.abc import AsyncGenerator
 from typing import Any, cast
 
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio.engine import create_async_engine
 from sqlalchemy.ext.asyncio.session import async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.core.latency import LatencyTracker
+from app.core.schema import DatabasePoolMetrics
+
+
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_latency = LatencyTracker(window_size=1000)
+        self.timeouts = 0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_latency.record(time.perf_counter() - started)
+
+    def get_metrics(self) -> DatabasePoolMetrics:
+        def to_ms(seconds: float | None) -> float | None:
+            return round(seconds * 1000, 3) if seconds is not None else None
+
+        return DatabasePoolMetrics(
+            pool_size=self.size(),
+            max_overflow=self._max_overflow,
+            checked_out=self.checkedout(),
+            checked_in=self.checkedin(),
+            overflow=max(self.overflow(), 0),
+            timeouts=self.timeouts,
+            wait_p50_ms=to_ms(self.wait_latency.percentile(50)),
+            wait_p95_ms=to_ms(self.wait_latency.percentile(95)),
+            wait_max_ms=to_ms(self.wait_latency.percentile(100)),
+        )
+
 
 engine = create_async_engine(
     cast(str, settings.DB_URL),
     echo=settings.LOG_LEVEL == "DEBUG",
     future=True,
+    poolclass=MonitoredQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
 )
 
 async_session = async_sessionmaker(
@@ -20,6 +69,10 @@ async_session = async_sessionmaker(
 )
 
 
+def get_pool_metrics() -> DatabasePoolMetrics:
+    return cast(MonitoredQueuePool, engine.pool).get_metrics()
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession | Any, Any]:
     async with async_session() as session:
         try:
@@ -0,0 +1,35 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from app.core.exceptions import DeadlineExceededError
+
+
+class Deadline:
+    def __init__(self, timeout: float | None = None) -> None:
+        self._expires_at = None if timeout is None else time.monotonic() + timeout
+
+    @classmethod
+    def from_ms(cls, timeout_ms: int) -> "Deadline":
+        return cls(timeout_ms / 1000 if timeout_ms > 0 else None)
+
+    def remaining(self) -> float | None:
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    @asynccontextmanager
+    async def limit(self, stage: str) -> AsyncIterator[None]:
+        if self.expired:
+            raise DeadlineExceededError(f"Deadline exceeded before {stage}")
+        try:
+            async with asyncio.timeout(self.remaining()):
+                yield
+        except TimeoutError as e:
+            raise DeadlineExceededError(f"Deadline exceeded during {stage}") from e
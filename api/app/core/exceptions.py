@@ -1 +1,4 @@
 class BaseServiceError(Exception): ...
+
+
+class DeadlineExceededError(BaseServiceError): ...
@@ -0,0 +1,20 @@
+import math
+from collections import deque
+
+
+class LatencyTracker:
+    def __init__(self, window_size: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=window_size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))
+        return ordered[index]
@@ -10,3 +10,9 @@ from app.core.database import get_db_session
 class Repository(ABC):
     def __init__(self, session: Annotated[AsyncSession, Depends(get_db_session)]) -> None:
         self._session = session
+
+    async def commit(self) -> None:
+        await self._session.commit()
+
+    async def rollback(self) -> None:
+        await self._session.rollback()
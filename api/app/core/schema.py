@@ -1,5 +1,24 @@
+from enum import StrEnum
+
 from pydantic import BaseModel
 
 
+class StorageBackend(StrEnum):
+    LOCAL = "local"
+    S3 = "s3"
+
+
 class MessageResponse(BaseModel):
     message: str
+
+
+class DatabasePoolMetrics(BaseModel):
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    timeouts: int
+    wait_p50_ms: float | None = None
+    wait_p95_ms: float | None = None
+    wait_max_ms: float | None = None
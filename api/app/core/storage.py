@@ -0,0 +1,254 @@
+import asyncio
+import contextlib
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import aiofiles
+import aiofiles.os
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.schema import StorageBackend
+
+if TYPE_CHECKING:
+    from aiobotocore.client import AioBaseClient
+
+logger = get_logger(__name__)
+
+
+class Storage(ABC):
+    _READ_CHUNK_SIZE = 1024 * 1024
+
+    @abstractmethod
+    async def put(self, key: str, source: Path) -> None:
+        pass
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        pass
+
+    @abstractmethod
+    async def fetch(self, key: str) -> Path:
+        pass
+
+    def get_local_path(self, key: str) -> Path | None:
+        return None
+
+
+class LocalStorage(Storage):
+    def __init__(self, root: Path) -> None:
+        logger.info(f"Initializing LocalStorage at {root}")
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def get_local_path(self, key: str) -> Path:
+        return self.root / key
+
+    async def put(self, key: str, source: Path) -> None:
+        path = self.get_local_path(key)
+        await aiofiles.os.makedirs(path.parent, exist_ok=True)
+        await aiofiles.os.replace(source, path)
+
+    async def exists(self, key: str) -> bool:
+        exists: bool = await aiofiles.os.path.exists(self.get_local_path(key))
+        return exists
+
+    async def delete(self, key: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            await aiofiles.os.remove(self.get_local_path(key))
+
+    async def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        async with aiofiles.open(self.get_local_path(key), "rb") as f:
+            await f.seek(start)
+            remaining = end - start
+            while remaining > 0 and (chunk := await f.read(min(self._READ_CHUNK_SIZE, remaining))):
+                remaining -= len(chunk)
+                yield chunk
+
+    async def fetch(self, key: str) -> Path:
+        return self.get_local_path(key)
+
+
+class S3Storage(Storage):
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str | None,
+        region: str,
+        access_key_id: str,
+        secret_access_key: str,
+        cache_dir: Path,
+    ) -> None:
+        logger.info(f"Initializing S3Storage with bucket: {bucket}, endpoint: {endpoint_url or 'default'}")
+        self.bucket = bucket
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._client_config = {
+            "endpoint_url": endpoint_url,
+            "region_name": region,
+            "aws_access_key_id": access_key_id or None,
+            "aws_secret_access_key": secret_access_key or None,
+        }
+        self._client: AioBaseClient | None = None
+        self._client_lock = asyncio.Lock()
+        self._exit_stack = contextlib.AsyncExitStack()
+        self._fetch_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+    async def _get_client(self) -> "AioBaseClient":
+        async with self._client_lock:
+            if self._client is None:
+                from aiobotocore.session import get_session
+
+                self._client = await self._exit_stack.enter_async_context(
+                    get_session().create_client("s3", **self._client_config)
+                )
+        return self._client
+
+    async def put(self, key: str, source: Path) -> None:
+        client = await self._get_client()
+        try:
+            size = (await aiofiles.os.stat(source)).st_size
+            if size <= settings.S3_MULTIPART_PART_BYTES:
+                async with aiofiles.open(source, "rb") as f:
+                    await client.put_object(Bucket=self.bucket, Key=key, Body=await f.read())
+            else:
+                await self._multipart_upload(client, key, source, size)
+            logger.debug(f"Uploaded {size} bytes to s3://{self.bucket}/{key}")
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                await aiofiles.os.remove(source)
+
+    async def _multipart_upload(self, client: "AioBaseClient", key: str, source: Path, size: int) -> None:
+        part_size = settings.S3_MULTIPART_PART_BYTES
+        semaphore = asyncio.Semaphore(settings.S3_TRANSFER_CONCURRENCY)
+        upload = await client.create_multipart_upload(Bucket=self.bucket, Key=key)
+        upload_id = upload["UploadId"]
+
+        async def upload_part(part_number: int, offset: int) -> dict[str, Any]:
+            async with semaphore:
+                async with aiofiles.open(source, "rb") as f:
+                    await f.seek(offset)
+                    body = await f.read(part_size)
+                response = await client.upload_part(
+                    Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=body
+                )
+                return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+        try:
+            parts = await asyncio.gather(
+                *(upload_part(index + 1, offset) for index, offset in enumerate(range(0, size, part_size)))
+            )
+            await client.complete_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": list(parts)}
+            )
+        except BaseException:
+            logger.error(f"Multipart upload of {key} failed, aborting upload {upload_id}")
+            await client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+
+    async def exists(self, key: str) -> bool:
+        client = await self._get_client()
+        try:
+            await client.head_object(Bucket=self.bucket, Key=key)
+        except client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    async def delete(self, key: str) -> None:
+        client = await self._get_client()
+        await client.delete_object(Bucket=self.bucket, Key=key)
+        with contextlib.suppress(FileNotFoundError):
+            await aiofiles.os.remove(self.cache_dir / key)
+
+    async def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        if start >= end:
+            return
+        client = await self._get_client()
+        response = await client.get_object(Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end - 1}")
+        async with response["Body"] as stream:
+            async for chunk in stream.iter_chunks(self._READ_CHUNK_SIZE):
+                yield chunk
+
+    async def fetch(self, key: str) -> Path:
+        cache_path = self.cache_dir / key
+        lock = self._fetch_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if await aiofiles.os.path.exists(cache_path):
+                logger.debug(f"Storage cache hit for {key}")
+                await asyncio.to_thread(cache_path.touch)
+                return cache_path
+
+            logger.info(f"Storage cache miss for {key}, downloading from s3://{self.bucket}")
+            await self._download(key, cache_path)
+
+        await asyncio.to_thread(self._evict_cache)
+        return cache_path
+
+    async def _download(self, key: str, destination: Path) -> None:
+        client = await self._get_client()
+        size = (await client.head_object(Bucket=self.bucket, Key=key))["ContentLength"]
+        part_size = settings.S3_MULTIPART_PART_BYTES
+        semaphore = asyncio.Semaphore(settings.S3_TRANSFER_CONCURRENCY)
+        temp_path = destination.with_name(f".{destination.name}.part")
+        await aiofiles.os.makedirs(destination.parent, exist_ok=True)
+        async with aiofiles.open(temp_path, "wb") as f:
+            await f.truncate(size)
+
+        async def download_part(offset: int) -> None:
+            async with semaphore:
+                body = b"".join([chunk async for chunk in self.iter_range(key, offset, min(offset + part_size, size))])
+                async with aiofiles.open(temp_path, "r+b") as f:
+                    await f.seek(offset)
+                    await f.write(body)
+
+        try:
+            await asyncio.gather(*(download_part(offset) for offset in range(0, size, part_size)))
+            await aiofiles.os.replace(temp_path, destination)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                await aiofiles.os.remove(temp_path)
+
+    def _evict_cache(self) -> None:
+        cached_files = [
+            (path.stat(), path)
+            for path in self.cache_dir.rglob("*")
+            if path.is_file() and not path.name.endswith(".part")
+        ]
+        total_size = sum(stat.st_size for stat, _ in cached_files)
+        accessed_after = time.time() - settings.STORAGE_CACHE_MIN_AGE_SECONDS
+        for stat, path in sorted(cached_files, key=lambda item: item[0].st_mtime):
+            if total_size <= settings.STORAGE_CACHE_MAX_BYTES or stat.st_mtime > accessed_after:
+                break
+            logger.debug(f"Evicting {path} from storage cache")
+            path.unlink(missing_ok=True)
+            total_size -= stat.st_size
+
+
+@lru_cache
+def get_storage() -> Storage:
+    backend = StorageBackend(settings.STORAGE_BACKEND)
+    if backend == StorageBackend.S3:
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL or None,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            cache_dir=settings.STORAGE_CACHE_DIR,
+        )
+    return LocalStorage(settings.STORAGE_DIR)
@@ -0,0 +1,17 @@
+import uvicorn
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.logging import get_logger, setup_logging
+from app.local_llm.views import router as local_llm_router
+
+setup_logging()
+logger = get_logger(__name__)
+
+app = FastAPI(title="Local LLM stand-in")
+app.include_router(local_llm_router)
+
+
+if __name__ == "__main__":
+    logger.info(f"Starting local LLM stand-in in '{settings.LOCAL_LLM_MODE}' mode on port {settings.LOCAL_LLM_PORT}")
+    uvicorn.run(app, host="0.0.0.0", port=settings.LOCAL_LLM_PORT)
@@ -0,0 +1,80 @@
+import asyncio
+import hashlib
+import time
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.local_llm.schema import (
+    ChatCompletionChoice,
+    ChatCompletionRequest,
+    ChatCompletionResponse,
+    ChatCompletionUsage,
+    ChatMessage,
+    LocalLLMMode,
+)
+
+logger = get_logger(__name__)
+
+
+class LocalLLMService:
+    def __init__(self) -> None:
+        self.mode = LocalLLMMode(settings.LOCAL_LLM_MODE)
+        self.canned_answer = settings.LOCAL_LLM_CANNED_ANSWER
+        self.latency_ms = settings.LOCAL_LLM_LATENCY_MS
+        self.tokens_per_second = settings.LOCAL_LLM_TOKENS_PER_SECOND
+
+    async def create_chat_completion(self, request: ChatCompletionRequest) -> ChatCompletionResponse:
+        max_tokens = request.max_completion_tokens or request.max_tokens
+        tokens = self._build_answer(request.messages).split()
+        finish_reason = "stop"
+        if max_tokens is not None and len(tokens) > max_tokens:
+            tokens = tokens[:max_tokens]
+            finish_reason = "length"
+
+        prompt_tokens = sum(self._count_tokens(message.content) for message in request.messages)
+        completion_tokens = len(tokens)
+
+        delay = self._calculate_delay(completion_tokens)
+        logger.debug(f"Local completion: {completion_tokens} tokens, simulated delay {delay:.3f}s")
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        return ChatCompletionResponse(
+            id=self._completion_id(request),
+            created=int(time.time()),
+            model=request.model,
+            choices=[
+                ChatCompletionChoice(
+                    index=0,
+                    message=ChatMessage(role="assistant", content=" ".join(tokens)),
+                    finish_reason=finish_reason,
+                )
+            ],
+            usage=ChatCompletionUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        )
+
+    def _build_answer(self, messages: list[ChatMessage]) -> str:
+        if self.mode == LocalLLMMode.CANNED:
+            return self.canned_answer
+
+        for message in reversed(messages):
+            if message.role == "user" and message.content:
+                return message.content
+        return ""
+
+    def _calculate_delay(self, completion_tokens: int) -> float:
+        delay = self.latency_ms / 1000
+        if self.tokens_per_second > 0:
+            delay += completion_tokens / self.tokens_per_second
+        return delay
+
+    def _count_tokens(self, text: str | None) -> int:
+        return len(text.split()) if text else 0
+
+    def _completion_id(self, request: ChatCompletionRequest) -> str:
+        digest = hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+        return f"chatcmpl-local-{digest[:24]}"
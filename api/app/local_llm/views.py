@@ -0,0 +1,20 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.local_llm.schema import ChatCompletionRequest, ChatCompletionResponse
+from app.local_llm.service import LocalLLMService
+
+router = APIRouter(prefix="/v1", tags=["local-llm"])
+
+
+@router.post("/chat/completions")
+async def create_chat_completion(
+    request: ChatCompletionRequest,
+    llm_service: Annotated[LocalLLMService, Depends(LocalLLMService)],
+) -> ChatCompletionResponse:
+    if request.stream:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Streaming is not supported")
+
+    return await llm_service.create_chat_completion(request)
@@ -14,6 +14,7 @@ from app.core.exceptions import BaseServiceError
 from app.core.logging import get_logger, setup_logging
 from app.modules.auth.views import router as auth_router
 from app.modules.files.views import router as files_router
+from app.modules.metrics.views import router as metrics_router
 from app.modules.rag.views import router as rag_router
 
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -32,6 +33,7 @@ app.add_middleware(
 app.include_router(files_router)
 app.include_router(auth_router)
 app.include_router(rag_router)
+app.include_router(metrics_router)
 
 
 @app.exception_handler(HTTPException)
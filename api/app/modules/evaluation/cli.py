@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from app.core.database import async_session
+from app.core.logging import get_logger, setup_logging
+from app.modules.evaluation.repository import EvaluationRepository
+from app.modules.evaluation.schema import EvaluationQuestion, EvaluationRunResponse
+from app.modules.evaluation.service import EvaluationService
+from app.modules.rag.repositories.document_chunk import DocumentChunkRepository
+from app.modules.rag.repositories.qa import QARepository
+from app.modules.rag.services.llm_provider import get_llm_provider
+from app.modules.rag.services.openai_service import OpenAIService
+from app.modules.rag.services.vector_store_manager import VectorStoreManager
+
+logger = get_logger(__name__)
+
+
+def load_questions_file(path: Path) -> list[EvaluationQuestion]:
+    content = path.read_text()
+    if path.suffix == ".json":
+        items = json.loads(content)
+    elif path.suffix == ".jsonl":
+        items = [json.loads(line) for line in content.splitlines() if line.strip()]
+    else:
+        items = [line.strip() for line in content.splitlines() if line.strip()]
+
+    return [
+        EvaluationQuestion(question_text=item) if isinstance(item, str) else EvaluationQuestion(**item)
+        for item in items
+    ]
+
+
+async def run_evaluation(args: argparse.Namespace) -> EvaluationRunResponse:
+    async with async_session() as session:
+        service = EvaluationService(
+            vector_store=VectorStoreManager(DocumentChunkRepository(session)),
+            openai_service=OpenAIService(get_llm_provider()),
+            qa_repository=QARepository(session),
+            repository=EvaluationRepository(session),
+        )
+
+        if args.questions_file:
+            questions = load_questions_file(args.questions_file)
+        else:
+            questions = await service.load_history_questions(args.limit)
+
+        run = await service.run(questions, name=args.name)
+        return EvaluationRunResponse.model_validate(run, from_attributes=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run an offline bulk evaluation of the RAG pipeline")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--questions-file", type=Path, help="Question set as .txt (one per line), .json or .jsonl")
+    source.add_argument("--from-history", action="store_true", help="Replay distinct questions from history")
+    parser.add_argument("--limit", type=int, default=100, help="Maximum number of history questions to replay")
+    parser.add_argument("--name", help="Optional name for the evaluation run")
+    args = parser.parse_args()
+
+    setup_logging()
+    run = asyncio.run(run_evaluation(args))
+    print(run.model_dump_json(indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
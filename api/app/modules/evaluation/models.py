@@ -0,0 +1,39 @@
+from sqlalchemy import ForeignKey
+from sqlmodel import Column, Field
+
+from app.core.models import BaseModel
+from app.modules.evaluation.schema import EvaluationRunStatus
+
+
+class EvaluationRun(BaseModel, table=True):
+    __tablename__ = "evaluation_runs"
+
+    name: str | None = Field(default=None, nullable=True)
+    status: EvaluationRunStatus = Field(default=EvaluationRunStatus.RUNNING, nullable=False)
+    provider: str = Field(nullable=False)
+    model: str = Field(nullable=False)
+    batch_id: str | None = Field(default=None, nullable=True)
+    question_count: int = Field(default=0, nullable=False)
+    failed_count: int = Field(default=0, nullable=False)
+    embedding_ms: int | None = Field(default=None, nullable=True)
+    search_ms: int | None = Field(default=None, nullable=True)
+    generation_ms: int | None = Field(default=None, nullable=True)
+    total_ms: int | None = Field(default=None, nullable=True)
+    error_message: str | None = Field(default=None, nullable=True)
+
+
+class EvaluationResult(BaseModel, table=True):
+    __tablename__ = "evaluation_results"
+
+    run_id: int = Field(
+        sa_column=Column(ForeignKey("evaluation_runs.id", ondelete="CASCADE"), nullable=False, index=True),
+    )
+    question_id: int | None = Field(default=None, nullable=True)
+    question_text: str = Field(nullable=False)
+    answer_text: str | None = Field(default=None, nullable=True)
+    sources_used: str | None = Field(default=None, nullable=True)
+    confidence_score: float = Field(default=0.0, nullable=False)
+    search_ms: int | None = Field(default=None, nullable=True)
+    prompt_tokens: int | None = Field(default=None, nullable=True)
+    cached_prompt_tokens: int | None = Field(default=None, nullable=True)
+    error_message: str | None = Field(default=None, nullable=True)
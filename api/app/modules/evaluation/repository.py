@@ -0,0 +1,32 @@
+from sqlmodel import select
+
+from app.core.repositories import Repository
+from app.modules.evaluation.models import EvaluationResult, EvaluationRun
+
+
+class EvaluationRepository(Repository):
+    async def create_run(self, run: EvaluationRun) -> EvaluationRun:
+        self._session.add(run)
+        await self._session.commit()
+        await self._session.refresh(run)
+        return run
+
+    async def update_run(self, run: EvaluationRun) -> EvaluationRun:
+        self._session.add(run)
+        await self._session.commit()
+        await self._session.refresh(run)
+        return run
+
+    async def create_results(self, results: list[EvaluationResult]) -> None:
+        self._session.add_all(results)
+        await self._session.commit()
+
+    async def get_run(self, run_id: int) -> EvaluationRun | None:
+        result = await self._session.exec(select(EvaluationRun).where(EvaluationRun.id == run_id))
+        return result.first()
+
+    async def get_results(self, run_id: int) -> list[EvaluationResult]:
+        result = await self._session.exec(
+            select(EvaluationResult).where(EvaluationResult.run_id == run_id).order_by(EvaluationResult.id)
+        )
+        return list(result.all())
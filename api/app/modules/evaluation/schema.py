@@ -0,0 +1,32 @@
+from datetime import datetime
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+
+class EvaluationRunStatus(StrEnum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class EvaluationQuestion(BaseModel):
+    question_text: str
+    question_id: int | None = None
+
+
+class EvaluationRunResponse(BaseModel):
+    id: int
+    name: str | None
+    status: EvaluationRunStatus
+    provider: str
+    model: str
+    batch_id: str | None
+    question_count: int
+    failed_count: int
+    embedding_ms: int | None
+    search_ms: int | None
+    generation_ms: int | None
+    total_ms: int | None
+    error_message: str | None
+    created_at: datetime
@@ -0,0 +1,125 @@
+import json
+import time
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.modules.evaluation.models import EvaluationResult, EvaluationRun
+from app.modules.evaluation.repository import EvaluationRepository
+from app.modules.evaluation.schema import EvaluationQuestion, EvaluationRunStatus
+from app.modules.rag.repositories.qa import QARepository
+from app.modules.rag.services.openai_service import OpenAIService
+from app.modules.rag.services.search_results import build_context, build_sources, calculate_confidence
+from app.modules.rag.services.vector_store_manager import VectorStoreManager
+
+logger = get_logger(__name__)
+
+
+class EvaluationService:
+    def __init__(
+        self,
+        vector_store: Annotated[VectorStoreManager, Depends(VectorStoreManager)],
+        openai_service: Annotated[OpenAIService, Depends(OpenAIService)],
+        qa_repository: Annotated[QARepository, Depends(QARepository)],
+        repository: Annotated[EvaluationRepository, Depends(EvaluationRepository)],
+    ) -> None:
+        self.vector_store = vector_store
+        self.openai_service = openai_service
+        self.qa_repository = qa_repository
+        self.repository = repository
+
+    async def load_history_questions(self, limit: int = 100) -> list[EvaluationQuestion]:
+        rows = await self.qa_repository.get_distinct_recent_questions(limit)
+        logger.info(f"Loaded {len(rows)} distinct questions from history")
+        return [EvaluationQuestion(question_id=question_id, question_text=text) for question_id, text in rows]
+
+    async def run(self, questions: list[EvaluationQuestion], name: str | None = None) -> EvaluationRun:
+        run = await self.repository.create_run(
+            EvaluationRun(
+                name=name,
+                provider=settings.LLM_PROVIDER,
+                model=settings.CHAT_MODEL,
+                question_count=len(questions),
+            )
+        )
+        run_id = run.id
+        logger.info(f"Starting evaluation run {run_id} with {len(questions)} questions")
+        start_time = time.monotonic()
+        stage_timings: dict[str, int] = {}
+        batch_id = None
+        failed_count = 0
+        error_message = None
+
+        try:
+            stage_start = time.monotonic()
+            embeddings = await self.vector_store.embed_queries([q.question_text for q in questions])
+            stage_timings["embedding_ms"] = self._elapsed_ms(stage_start)
+
+            stage_start = time.monotonic()
+            search_results = []
+            search_times = []
+            for embedding in embeddings:
+                question_start = time.monotonic()
+                search_results.append(await self.vector_store.search_by_embedding(embedding, n_results=5))
+                search_times.append(self._elapsed_ms(question_start))
+            stage_timings["search_ms"] = self._elapsed_ms(stage_start)
+
+            answerable = [index for index, results in enumerate(search_results) if results]
+            stage_start = time.monotonic()
+            batch = await self.openai_service.generate_answers_batch(
+                [(questions[index].question_text, build_context(search_results[index])) for index in answerable]
+            )
+            stage_timings["generation_ms"] = self._elapsed_ms(stage_start)
+            batch_id = batch["batch_id"]
+            answers = dict(zip(answerable, batch["answers"], strict=True))
+
+            results = []
+            for index, question in enumerate(questions):
+                sources = build_sources(search_results[index])
+                answer = answers.get(index)
+                result_error = None
+                if not search_results[index]:
+                    result_error = "No relevant information found in the documents."
+                elif answer is None:
+                    result_error = "Completion request failed."
+
+                results.append(
+                    EvaluationResult(
+                        run_id=run_id,
+                        question_id=question.question_id,
+                        question_text=question.question_text,
+                        answer_text=answer["answer_text"] if answer else None,
+                        sources_used=json.dumps([s.model_dump() for s in sources]) if sources else None,
+                        confidence_score=calculate_confidence(search_results[index]),
+                        search_ms=search_times[index],
+                        prompt_tokens=answer["prompt_tokens"] if answer else None,
+                        cached_prompt_tokens=answer["cached_tokens"] if answer else None,
+                        error_message=result_error,
+                    )
+                )
+
+            await self.repository.create_results(results)
+            failed_count = sum(1 for result in results if result.error_message)
+            status = EvaluationRunStatus.COMPLETED
+        except Exception as e:
+            logger.error(f"Evaluation run {run_id} failed: {str(e)}", exc_info=True)
+            await self.repository.rollback()
+            status = EvaluationRunStatus.FAILED
+            error_message = str(e)
+
+        run.status = status
+        run.batch_id = batch_id
+        run.failed_count = failed_count
+        run.error_message = error_message
+        run.embedding_ms = stage_timings.get("embedding_ms")
+        run.search_ms = stage_timings.get("search_ms")
+        run.generation_ms = stage_timings.get("generation_ms")
+        run.total_ms = self._elapsed_ms(start_time)
+        run = await self.repository.update_run(run)
+        logger.info(f"Evaluation run {run_id} finished with status {status} in {run.total_ms}ms")
+        return run
+
+    def _elapsed_ms(self, start_time: float) -> int:
+        return int((time.monotonic() - start_time) * 1000)
@@ -0,0 +1,25 @@
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.modules.files.janitor import purge_deleted_files
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Remove deleted files together with their chunks, images and blobs")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.FILE_CLEANUP_BATCH_SIZE,
+        help="Number of rows to delete per statement",
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    purged = asyncio.run(purge_deleted_files(args.batch_size))
+    print(f"Purged {purged} deleted files")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -2,3 +2,9 @@ from app.core.exceptions import BaseServiceError
 
 
 class UnsupportedFileTypeError(BaseServiceError): ...
+
+
+class FileTooLargeError(BaseServiceError): ...
+
+
+class InvalidCursorError(BaseServiceError): ...
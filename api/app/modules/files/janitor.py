@@ -0,0 +1,66 @@
+import asyncio
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.logging import get_logger
+from app.core.storage import get_storage
+from app.modules.files.repository import BlobRepository, FileRepository
+from app.modules.rag.repositories.document_chunk import DocumentChunkRepository
+from app.modules.rag.repositories.image import ImageRepository
+
+logger = get_logger(__name__)
+
+_janitor_lock = asyncio.Lock()
+_background_tasks: set[asyncio.Task[None]] = set()
+
+
+async def purge_deleted_files(batch_size: int) -> int:
+    purged = 0
+    storage = get_storage()
+    async with async_session() as session:
+        file_repository = FileRepository(session)
+        blob_repository = BlobRepository(session)
+        chunk_repository = DocumentChunkRepository(session)
+        image_repository = ImageRepository(session)
+
+        while files := await file_repository.get_deleted(batch_size):
+            file_ids = [file.id for file in files]
+
+            while await chunk_repository.delete_by_file_ids(file_ids, batch_size):
+                pass
+
+            image_keys: set[str] = set()
+            while deleted_keys := await image_repository.delete_by_file_ids(file_ids, batch_size):
+                image_keys.update(key for keys in deleted_keys for key in keys if key)
+
+            orphaned_paths = await blob_repository.release([file.blob_id for file in files if file.blob_id is not None])
+            orphaned_paths.extend(file.file_path for file in files if file.blob_id is None)
+            await file_repository.delete_by_ids(file_ids)
+
+            if image_keys:
+                locked_keys = await image_repository.try_lock_storage_keys(sorted(image_keys))
+                if skipped := len(image_keys) - len(locked_keys):
+                    logger.info(f"Keeping {skipped} images that are being stored by a running ingestion")
+                orphaned_paths.extend(locked_keys - await image_repository.get_referenced_keys(list(locked_keys)))
+            for path in orphaned_paths:
+                await storage.delete(path)
+            await file_repository.commit()
+
+            purged += len(files)
+            logger.info(f"Purged {len(files)} deleted files and {len(orphaned_paths)} orphaned blobs")
+
+    return purged
+
+
+async def _purge_in_background() -> None:
+    async with _janitor_lock:
+        try:
+            await purge_deleted_files(settings.FILE_CLEANUP_BATCH_SIZE)
+        except Exception as e:
+            logger.error(f"Error purging deleted files: {str(e)}", exc_info=True)
+
+
+def schedule_file_cleanup() -> None:
+    task = asyncio.create_task(_purge_in_background())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
@@ -1,10 +1,28 @@
-from sqlmodel import Field
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Index, text
+from sqlmodel import Column, Field
 
 from app.core.models import BaseModel
 from app.modules.files.schema import FileType
 
 
+class Blob(BaseModel, table=True):
+    __tablename__ = "blobs"
+
+    content_hash: str = Field(nullable=False, unique=True, index=True)
+    file_path: str = Field(nullable=False)
+    file_size: int = Field(nullable=False)
+    ref_count: int = Field(nullable=False, default=1)
+
+
 class File(BaseModel, table=True):
+    __table_args__ = (
+        Index("ix_file_created_at_id", "created_at", "id"),
+        Index("ix_file_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_file_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
+
     filename: str = Field(index=True, nullable=False)
     original_filename: str = Field(nullable=False)
     file_path: str = Field(nullable=False)
@@ -12,3 +30,8 @@ class File(BaseModel, table=True):
     file_type: FileType = Field(nullable=False)
     user_id: int = Field(foreign_key="user.id", nullable=False)
     content_hash: str = Field(index=True, nullable=True)
+    blob_id: int | None = Field(
+        default=None,
+        sa_column=Column(ForeignKey("blobs.id"), nullable=True, index=True),
+    )
+    deleted_at: datetime | None = Field(default=None, nullable=True)
@@ -1,42 +1,178 @@
+from collections import Counter
 from collections.abc import Sequence
+from datetime import datetime
 
-from sqlmodel import select
+from sqlalchemy import text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import delete, select, update
 
 from app.core.repositories import Repository
-from app.modules.files.models import File
+from app.modules.files.models import Blob, File
+from app.modules.files.schema import FileType
 
 
 class FileRepository(Repository):
     async def create(self, file_record: File) -> File:
         self._session.add(file_record)
         await self._session.commit()
-        await self._session.refresh(file_record)
         return file_record
 
+    async def create_batch(self, file_records: list[File]) -> list[File]:
+        for file_record in file_records:
+            self._session.add(file_record)
+
+        await self._session.commit()
+        return file_records
+
     async def get_by_id(self, file_id: int, user_id: int) -> File | None:
-        result = await self._session.exec(select(File).where(File.id == file_id, File.user_id == user_id))
+        result = await self._session.exec(
+            select(File).where(File.id == file_id, File.user_id == user_id, File.deleted_at.is_(None))
+        )
         return result.first()
 
+    async def get_by_ids(self, file_ids: list[int]) -> Sequence[File]:
+        result = await self._session.exec(select(File).where(File.id.in_(file_ids), File.deleted_at.is_(None)))
+        return result.all()
+
     async def get_by_hash(self, content_hash: str, user_id: int) -> File | None:
         result = await self._session.exec(
-            select(File).where(File.content_hash == content_hash, File.user_id == user_id)
+            select(File).where(File.content_hash == content_hash, File.user_id == user_id, File.deleted_at.is_(None))
         )
         return result.first()
 
+    async def get_by_hashes(self, content_hashes: list[str], user_id: int) -> dict[str, File]:
+        if not content_hashes:
+            return {}
+
+        result = await self._session.exec(
+            select(File).where(
+                File.content_hash.in_(content_hashes), File.user_id == user_id, File.deleted_at.is_(None)
+            )
+        )
+        return {file_record.content_hash: file_record for file_record in result.all()}
+
     async def update(self, file_record: File) -> File:
         await self._session.commit()
-        await self._session.refresh(file_record)
         return file_record
 
-    async def delete(self, file_id: int, user_id: int) -> bool:
-        file_record = await self.get_by_id(file_id, user_id)
-        if not file_record:
-            return False
-
-        await self._session.delete(file_record)
+    async def mark_deleted(self, file_id: int, user_id: int) -> bool:
+        result = await self._session.execute(
+            update(File)
+            .where(File.id == file_id, File.user_id == user_id, File.deleted_at.is_(None))
+            .values(deleted_at=datetime.now())
+            .returning(File.id)
+        )
+        deleted_id = result.scalar_one_or_none()
         await self._session.commit()
-        return True
+        return deleted_id is not None
+
+    async def get_deleted(self, limit: int) -> Sequence[File]:
+        statement = select(File).where(File.deleted_at.is_not(None)).order_by(File.deleted_at).limit(limit)
+        result = await self._session.exec(statement)
+        return result.all()
+
+    async def delete_by_ids(self, file_ids: list[int]) -> None:
+        await self._session.execute(delete(File).where(File.id.in_(file_ids)))
+
+    async def has_files(self, file_types: list[FileType]) -> bool:
+        statement = select(File.id).where(File.file_type.in_(file_types), File.deleted_at.is_(None)).limit(1)
+        result = await self._session.exec(statement)
+        return result.first() is not None
 
     async def get_all(self) -> Sequence[File]:
-        result = await self._session.exec(select(File))
+        result = await self._session.exec(select(File).where(File.deleted_at.is_(None)))
+        return result.all()
+
+    async def get_page(
+        self,
+        limit: int,
+        before: tuple[datetime, int] | None = None,
+        user_id: int | None = None,
+        file_type: FileType | None = None,
+    ) -> Sequence[File]:
+        statement = select(File).where(File.deleted_at.is_(None))
+        if user_id is not None:
+            statement = statement.where(File.user_id == user_id)
+        if file_type is not None:
+            statement = statement.where(File.file_type == file_type)
+        if before is not None:
+            statement = statement.where(tuple_(File.created_at, File.id) < tuple_(*before))
+
+        statement = statement.order_by(File.created_at.desc(), File.id.desc()).limit(limit)
+        result = await self._session.exec(statement)
         return result.all()
+
+    async def estimate_count(self) -> int | None:
+        result = await self._session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": File.__tablename__},
+        )
+        estimate = result.scalar_one_or_none()
+        return estimate if estimate is not None and estimate >= 0 else None
+
+
+class BlobRepository(Repository):
+    async def acquire(self, content_hash: str, file_path: str, file_size: int) -> Blob:
+        now = datetime.now()
+        statement = (
+            insert(Blob)
+            .values(
+                content_hash=content_hash,
+                file_path=file_path,
+                file_size=file_size,
+                ref_count=1,
+                created_at=now,
+                updated_at=now,
+            )
+            .on_conflict_do_update(
+                index_elements=["content_hash"],
+                set_={"ref_count": Blob.ref_count + 1, "updated_at": now},
+            )
+            .returning(Blob)
+            .execution_options(populate_existing=True)
+        )
+        result = await self._session.execute(statement)
+        blob: Blob = result.scalars().one()
+        return blob
+
+    async def acquire_many(self, blobs: list[tuple[str, str, int]]) -> dict[str, Blob]:
+        if not blobs:
+            return {}
+
+        now = datetime.now()
+        values = [
+            {
+                "content_hash": content_hash,
+                "file_path": file_path,
+                "file_size": file_size,
+                "ref_count": 1,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for content_hash, file_path, file_size in sorted(blobs)
+        ]
+        statement = (
+            insert(Blob)
+            .values(values)
+            .on_conflict_do_update(
+                index_elements=["content_hash"],
+                set_={"ref_count": Blob.ref_count + 1, "updated_at": now},
+            )
+            .returning(Blob)
+            .execution_options(populate_existing=True)
+        )
+        result = await self._session.execute(statement)
+        return {blob.content_hash: blob for blob in result.scalars().all()}
+
+    async def release(self, blob_ids: list[int]) -> list[str]:
+        references = Counter(blob_ids)
+        blob_ids_by_count: dict[int, list[int]] = {}
+        for blob_id, count in references.items():
+            blob_ids_by_count.setdefault(count, []).append(blob_id)
+
+        for count, ids in blob_ids_by_count.items():
+            await self._session.execute(update(Blob).where(Blob.id.in_(ids)).values(ref_count=Blob.ref_count - count))
+        result = await self._session.execute(
+            delete(Blob).where(Blob.id.in_(list(references)), Blob.ref_count <= 0).returning(Blob.file_path)
+        )
+        return list(result.scalars().all())
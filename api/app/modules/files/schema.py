@@ -9,6 +9,12 @@ class FileType(StrEnum):
     DOCX = "docx"
 
 
+class UploadStatus(StrEnum):
+    CREATED = "created"
+    DUPLICATE = "duplicate"
+    FAILED = "failed"
+
+
 class FileBase(BaseModel):
     filename: str
     original_filename: str
@@ -36,7 +42,31 @@ class FileResponse(BaseModel):
     download_url: str | None = None
 
 
-class FileContentResponse(BaseModel):
-    content: bytes
+class FileListResponse(BaseModel):
+    files: list[FileResponse]
+    next_cursor: str | None = None
+    estimated_total: int | None = None
+
+
+class FileDownload(BaseModel):
+    file_path: str
+    file_size: int
     original_filename: str
     content_type: str
+    etag: str | None = None
+    not_modified: bool = False
+
+
+class FileUploadResult(BaseModel):
+    filename: str
+    status: UploadStatus
+    file: FileResponse | None = None
+    ingestion_job_id: str | None = None
+    error: str | None = None
+
+
+class BatchUploadResponse(BaseModel):
+    results: list[FileUploadResult]
+    created: int
+    duplicates: int
+    failed: int
@@ -1,100 +1,287 @@
+import asyncio
+import base64
+import binascii
 import hashlib
 import mimetypes
 import uuid
 from collections.abc import Sequence
+from datetime import datetime
 from pathlib import Path
 from typing import Annotated
 
 import aiofiles
-from fastapi import Depends
+import aiofiles.os
+from fastapi import Depends, UploadFile
 
 from app.core.config import settings
+from app.core.exceptions import BaseServiceError
 from app.core.logging import get_logger
-from app.modules.files.exceptions import UnsupportedFileTypeError
-from app.modules.files.models import File
-from app.modules.files.repository import FileRepository
-from app.modules.files.schema import FileContentResponse, FileType
+from app.core.storage import Storage, get_storage
+from app.modules.files.exceptions import FileTooLargeError, InvalidCursorError, UnsupportedFileTypeError
+from app.modules.files.models import Blob, File
+from app.modules.files.repository import BlobRepository, FileRepository
+from app.modules.files.schema import FileDownload, FileResponse, FileType, FileUploadResult, UploadStatus
 from app.modules.rag.services import VectorStoreManager
 
 logger = get_logger(__name__)
 
 
 class FileService:
+    _UPLOAD_CHUNK_SIZE = 1024 * 1024
+
     def __init__(
         self,
         file_repository: Annotated[FileRepository, Depends(FileRepository)],
+        blob_repository: Annotated[BlobRepository, Depends(BlobRepository)],
         vector_store: Annotated[VectorStoreManager, Depends(VectorStoreManager)],
+        storage: Annotated[Storage, Depends(get_storage)],
     ) -> None:
         self.file_repository = file_repository
+        self.blob_repository = blob_repository
+        self.storage = storage
         self.upload_dir = settings.STORAGE_DIR
         self.upload_dir.mkdir(parents=True, exist_ok=True)
         self.vector_store = vector_store
 
-    async def save_file(self, file_content: bytes, filename: str, user_id: int) -> File:
+    async def save_file(self, upload: UploadFile, user_id: int) -> File:
+        filename = upload.filename or ""
         file_type = self._get_file_type(filename)
-        content_hash = hashlib.sha256(file_content).hexdigest()
+        temp_path = self._get_temp_path(filename)
+
+        try:
+            content_hash, file_size = await self._stream_to_temp_file(upload, temp_path)
+
+            existing_file = await self.file_repository.get_by_hash(content_hash, user_id)
+            if existing_file:
+                logger.info(f"Upload {filename} matches existing file {existing_file.id}, discarding copy")
+                return existing_file
+
+            blob = await self.blob_repository.acquire(content_hash, self._get_blob_key(content_hash), file_size)
+            await self._write_blob(blob, temp_path, filename)
+        finally:
+            await self._remove_temp_file(temp_path)
+
+        return await self.file_repository.create(self._build_file_record(blob, filename, file_type, user_id))
+
+    async def save_files(self, uploads: list[UploadFile], user_id: int) -> list[FileUploadResult]:
+        semaphore = asyncio.Semaphore(settings.UPLOAD_BATCH_CONCURRENCY)
+
+        async def stage(upload: UploadFile) -> tuple[Path, str, int]:
+            async with semaphore:
+                temp_path = self._get_temp_path(upload.filename or "")
+                try:
+                    content_hash, file_size = await self._stream_to_temp_file(upload, temp_path)
+                except BaseException:
+                    await self._remove_temp_file(temp_path)
+                    raise
+                return temp_path, content_hash, file_size
+
+        async def write(index: int) -> bool:
+            async with semaphore:
+                return await self._write_blob(blobs[index], staged[index][0], results[index].filename)
+
+        results = [FileUploadResult(filename=upload.filename or "", status=UploadStatus.FAILED) for upload in uploads]
+        staged: dict[int, tuple[Path, str, int]] = {}
+        blobs: dict[int, Blob] = {}
+        written_paths: list[str] = []
+        file_records: dict[int, File] = {}
+        try:
+            pending = []
+            for index, result in enumerate(results):
+                try:
+                    self._get_file_type(result.filename)
+                    pending.append(index)
+                except UnsupportedFileTypeError as e:
+                    result.error = str(e)
+
+            outcomes = await asyncio.gather(*(stage(uploads[index]) for index in pending), return_exceptions=True)
+            for index, outcome in zip(pending, outcomes, strict=True):
+                if isinstance(outcome, BaseException):
+                    results[index].error = str(outcome)
+                else:
+                    staged[index] = outcome
+            if unexpected := next(
+                (e for e in outcomes if isinstance(e, BaseException) and not isinstance(e, BaseServiceError)), None
+            ):
+                raise unexpected
+
+            first_index_by_hash: dict[str, int] = {}
+            batch_duplicates: dict[int, int] = {}
+            for index, (_, content_hash, _) in staged.items():
+                if content_hash in first_index_by_hash:
+                    batch_duplicates[index] = first_index_by_hash[content_hash]
+                else:
+                    first_index_by_hash[content_hash] = index
+
+            existing_files = await self.file_repository.get_by_hashes(list(first_index_by_hash), user_id)
+            new_blobs = []
+            for content_hash, index in first_index_by_hash.items():
+                if existing_file := existing_files.get(content_hash):
+                    logger.info(
+                        f"Batch upload {results[index].filename} matches file {existing_file.id}, discarding copy"
+                    )
+                    results[index].status = UploadStatus.DUPLICATE
+                    file_records[index] = existing_file
+                else:
+                    new_blobs.append((content_hash, self._get_blob_key(content_hash), staged[index][2]))
+
+            acquired = await self.blob_repository.acquire_many(new_blobs)
+            for content_hash, _, _ in new_blobs:
+                blobs[first_index_by_hash[content_hash]] = acquired[content_hash]
+
+            written = await asyncio.gather(*(write(index) for index in blobs), return_exceptions=True)
+            failed_blob_ids = []
+            for index, stored in zip(list(blobs), written, strict=True):
+                if isinstance(stored, BaseException):
+                    logger.error(f"Could not store batch upload {results[index].filename}: {str(stored)}")
+                    results[index].error = str(stored)
+                    failed_blob_ids.append(blobs.pop(index).id)
+                    continue
+
+                if stored:
+                    written_paths.append(blobs[index].file_path)
+                file_type = self._get_file_type(results[index].filename)
+                file_records[index] = self._build_file_record(blobs[index], results[index].filename, file_type, user_id)
+                results[index].status = UploadStatus.CREATED
+
+            for index, first_index in batch_duplicates.items():
+                if first_index in file_records:
+                    logger.info(f"Batch upload {results[index].filename} duplicates {results[first_index].filename}")
+                    results[index].status = UploadStatus.DUPLICATE
+                    file_records[index] = file_records[first_index]
+                else:
+                    results[index].error = results[first_index].error
+
+            if failed_blob_ids:
+                for path in await self.blob_repository.release(failed_blob_ids):
+                    await self.storage.delete(path)
+            await self.file_repository.create_batch([file_records[index] for index in blobs])
+        except BaseException:
+            for path in written_paths:
+                await self.storage.delete(path)
+            await self.file_repository.rollback()
+            raise
+        finally:
+            for temp_path, _, _ in staged.values():
+                await self._remove_temp_file(temp_path)
+
+        for index, file_record in file_records.items():
+            results[index].file = FileResponse.model_validate(file_record, from_attributes=True)
+
+        logger.info(f"Batch upload stored {len(blobs)} new files out of {len(uploads)} uploads for user {user_id}")
+        return results
 
-        existing_file = await self.file_repository.get_by_hash(content_hash, user_id)
-        if existing_file:
-            return existing_file
+    def _get_temp_path(self, filename: str) -> Path:
+        return self.upload_dir / f".{uuid.uuid4()}{Path(filename).suffix}.part"
 
-        file_extension = Path(filename).suffix
-        uuid_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = self.upload_dir / uuid_filename
+    async def _remove_temp_file(self, temp_path: Path) -> None:
+        if await aiofiles.os.path.exists(temp_path):
+            await aiofiles.os.remove(temp_path)
 
-        async with aiofiles.open(file_path, "wb") as f:
-            await f.write(file_content)
+    async def _write_blob(self, blob: Blob, temp_path: Path, filename: str) -> bool:
+        if blob.ref_count == 1 or not await self.storage.exists(blob.file_path):
+            await self.storage.put(blob.file_path, temp_path)
+            return blob.ref_count == 1
 
-        file_record = File(
-            filename=uuid_filename,
+        logger.info(f"Upload {filename} shares blob {blob.id} ({blob.ref_count} references)")
+        return False
+
+    def _build_file_record(self, blob: Blob, filename: str, file_type: FileType, user_id: int) -> File:
+        return File(
+            filename=f"{uuid.uuid4()}{Path(filename).suffix}",
             original_filename=filename,
-            file_path=str(file_path),
-            file_size=len(file_content),
+            file_path=blob.file_path,
+            file_size=blob.file_size,
             file_type=file_type,
             user_id=user_id,
-            content_hash=content_hash,
+            content_hash=blob.content_hash,
+            blob_id=blob.id,
         )
 
-        return await self.file_repository.create(file_record)
+    async def _stream_to_temp_file(self, upload: UploadFile, temp_path: Path) -> tuple[str, int]:
+        sha256 = hashlib.sha256()
+        file_size = 0
+        async with aiofiles.open(temp_path, "wb") as f:
+            while chunk := await upload.read(self._UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > settings.MAX_UPLOAD_BYTES:
+                    raise FileTooLargeError(f"File exceeds the maximum size of {settings.MAX_UPLOAD_BYTES} bytes")
+                sha256.update(chunk)
+                await f.write(chunk)
+
+        return sha256.hexdigest(), file_size
+
+    def _get_blob_key(self, content_hash: str) -> str:
+        return f"blobs/{content_hash[:2]}/{content_hash}"
 
     async def get_file(self, file_id: int, user_id: int) -> File | None:
         return await self.file_repository.get_by_id(file_id, user_id)
 
-    async def get_files(self) -> Sequence[File]:
-        return await self.file_repository.get_all()
+    async def get_files_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        user_id: int | None = None,
+        file_type: FileType | None = None,
+    ) -> tuple[Sequence[File], str | None]:
+        before = self._decode_cursor(cursor) if cursor else None
+        files = await self.file_repository.get_page(limit + 1, before, user_id, file_type)
+        if len(files) <= limit:
+            return files, None
 
-    async def delete_file(self, file_id: int, user_id: int) -> bool:
-        file_record = await self.file_repository.get_by_id(file_id, user_id)
-        if not file_record:
-            return False
+        files = files[:limit]
+        return files, self._encode_cursor(files[-1])
+
+    async def estimate_file_count(self) -> int | None:
+        return await self.file_repository.estimate_count()
 
-        if Path(file_record.file_path).exists():
-            Path(file_record.file_path).unlink()
+    def _encode_cursor(self, file_record: File) -> str:
+        position = f"{file_record.created_at.isoformat()}|{file_record.id}"
+        return base64.urlsafe_b64encode(position.encode()).decode()
 
-        return await self.file_repository.delete(file_id, user_id)
+    def _decode_cursor(self, cursor: str) -> tuple[datetime, int]:
+        try:
+            created_at, _, file_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+            return datetime.fromisoformat(created_at), int(file_id)
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise InvalidCursorError("Invalid pagination cursor") from e
+
+    async def delete_file(self, file_id: int, user_id: int) -> bool:
+        return await self.file_repository.mark_deleted(file_id, user_id)
 
-    async def get_file_content(self, file_id: int, user_id: int) -> FileContentResponse | None:
+    async def get_file_download(
+        self, file_id: int, user_id: int, if_none_match: str | None = None
+    ) -> FileDownload | None:
         file_record = await self.file_repository.get_by_id(file_id, user_id)
         if not file_record:
             return None
 
-        file_path = Path(file_record.file_path)
-        if not file_path.exists():
-            return None
-
-        async with aiofiles.open(file_path, "rb") as f:
-            content = await f.read()
-
         content_type, _ = mimetypes.guess_type(file_record.original_filename)
-        if not content_type:
-            content_type = "application/octet-stream"
-
-        return FileContentResponse(
-            content=content,
+        etag = f'"{file_record.content_hash}"' if file_record.content_hash else None
+        download = FileDownload(
+            file_path=file_record.file_path,
+            file_size=file_record.file_size,
             original_filename=file_record.original_filename,
-            content_type=content_type,
+            content_type=content_type or "application/octet-stream",
+            etag=etag,
         )
 
+        if etag and if_none_match and self._etag_matches(if_none_match, etag):
+            download.not_modified = True
+            return download
+
+        if not await self.storage.exists(file_record.file_path):
+            return None
+
+        return download
+
+    @staticmethod
+    def _etag_matches(if_none_match: str, etag: str) -> bool:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+        return etag in candidates
+
     def _get_file_type(self, filename: str) -> FileType:
         extension = Path(filename).suffix.lower()
         type_mapping = {
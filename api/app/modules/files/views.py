@@ -1,14 +1,28 @@
 from http import HTTPStatus
 from typing import Annotated
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import FileResponse as FileStreamResponse
+from fastapi.responses import Response, StreamingResponse
 
+from app.core.config import settings
 from app.core.schema import MessageResponse
+from app.core.storage import Storage, get_storage
 from app.modules.auth.middleware import get_current_admin_user
 from app.modules.auth.models import User
-from app.modules.files.schema import FileResponse
+from app.modules.files.exceptions import FileTooLargeError, InvalidCursorError
+from app.modules.files.janitor import schedule_file_cleanup
+from app.modules.files.schema import (
+    BatchUploadResponse,
+    FileDownload,
+    FileListResponse,
+    FileResponse,
+    FileType,
+    UploadStatus,
+)
 from app.modules.files.service import FileService
+from app.modules.rag.services.ingestion_service import schedule_ingestion
 
 router = APIRouter(prefix="/files", tags=["files"])
 
@@ -29,8 +43,8 @@ async def upload_file_view(
         raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="No file provided")
 
     try:
-        file_content = await file.read()
-        file_record = await file_service.save_file(file_content, file.filename, current_user.id)
+        file_record = await file_service.save_file(file, current_user.id)
+        schedule_ingestion([file_record.id])
 
         return FileResponse(
             id=file_record.id,
@@ -41,17 +55,63 @@ async def upload_file_view(
             updated_at=file_record.updated_at,
             download_url=_get_download_url(request, file_record.id),
         )
+    except FileTooLargeError as e:
+        raise HTTPException(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(HTTPStatus.BAD_REQUEST, detail="Could not save file") from e
 
 
+@router.post("/upload-batch")
+async def upload_files_view(
+    files: Annotated[list[UploadFile], File()],
+    file_service: Annotated[FileService, Depends(FileService)],
+    current_user: Annotated[User, Depends(get_current_admin_user)],
+    request: Request,
+) -> BatchUploadResponse:
+    if not files:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="No files provided")
+    if len(files) > settings.UPLOAD_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"At most {settings.UPLOAD_BATCH_MAX_FILES} files can be uploaded at once",
+        )
+
+    try:
+        results = await file_service.save_files(files, current_user.id)
+    except Exception as e:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, detail="Could not save files") from e
+
+    created = [result for result in results if result.status == UploadStatus.CREATED]
+    job_ids = schedule_ingestion([result.file.id for result in created if result.file])
+    for result in results:
+        if result.file:
+            result.file.download_url = _get_download_url(request, result.file.id)
+            if result.status == UploadStatus.CREATED:
+                result.ingestion_job_id = job_ids.get(result.file.id)
+
+    return BatchUploadResponse(
+        results=results,
+        created=len(created),
+        duplicates=sum(result.status == UploadStatus.DUPLICATE for result in results),
+        failed=sum(result.status == UploadStatus.FAILED for result in results),
+    )
+
+
 @router.get("/")
 async def get_files_view(
     file_service: Annotated[FileService, Depends(FileService)],
     current_user: Annotated[User, Depends(get_current_admin_user)],
     request: Request,
-) -> list[FileResponse]:
-    files = await file_service.get_files()
+    limit: int = Query(default=settings.FILES_PAGE_DEFAULT_SIZE, ge=1, le=settings.FILES_PAGE_MAX_SIZE),
+    cursor: str | None = None,
+    user_id: int | None = None,
+    file_type: FileType | None = None,
+    include_total: bool = False,
+) -> FileListResponse:
+    try:
+        files, next_cursor = await file_service.get_files_page(limit, cursor, user_id, file_type)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e)) from e
 
     file_list = []
     for file in files:
@@ -67,7 +127,11 @@ async def get_files_view(
             )
         )
 
-    return file_list
+    estimated_total = None
+    if include_total and user_id is None and file_type is None:
+        estimated_total = await file_service.estimate_file_count()
+
+    return FileListResponse(files=file_list, next_cursor=next_cursor, estimated_total=estimated_total)
 
 
 @router.get("/{file_id}")
@@ -97,16 +161,88 @@ async def get_file_view(
 async def download_file_view(
     file_id: int,
     file_service: Annotated[FileService, Depends(FileService)],
+    storage: Annotated[Storage, Depends(get_storage)],
     current_user: Annotated[User, Depends(get_current_admin_user)],
+    request: Request,
 ) -> Response:
-    file_data = await file_service.get_file_content(file_id, current_user.id)
+    download = await file_service.get_file_download(file_id, current_user.id, request.headers.get("if-none-match"))
 
-    if not file_data:
+    if not download:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="File not found")
 
-    headers = {"Content-Disposition": f'attachment; filename="{file_data.original_filename}"'}
+    headers = {"Cache-Control": "private, no-cache"}
+    if download.etag:
+        headers["ETag"] = download.etag
+
+    if download.not_modified:
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    if local_path := storage.get_local_path(download.file_path):
+        return FileStreamResponse(
+            local_path,
+            media_type=download.content_type,
+            filename=download.original_filename,
+            headers=headers,
+        )
+
+    return _stream_download(storage, download, request, headers)
+
+
+def _stream_download(storage: Storage, download: FileDownload, request: Request, headers: dict[str, str]) -> Response:
+    file_size = download.file_size
+    headers["Accept-Ranges"] = "bytes"
+    headers["Content-Disposition"] = _content_disposition(download.original_filename)
+
+    byte_range = _parse_range(request.headers.get("range"), file_size)
+    if_range = request.headers.get("if-range")
+    if if_range and if_range != download.etag:
+        byte_range = None
+    if byte_range is None:
+        headers["Content-Length"] = str(file_size)
+        return StreamingResponse(
+            storage.iter_range(download.file_path, 0, file_size), media_type=download.content_type, headers=headers
+        )
+
+    start, end = byte_range
+    if start >= end:
+        headers["Content-Range"] = f"bytes */{file_size}"
+        return Response(status_code=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+
+    headers["Content-Range"] = f"bytes {start}-{end - 1}/{file_size}"
+    headers["Content-Length"] = str(end - start)
+    return StreamingResponse(
+        storage.iter_range(download.file_path, start, end),
+        status_code=HTTPStatus.PARTIAL_CONTENT,
+        media_type=download.content_type,
+        headers=headers,
+    )
+
+
+def _content_disposition(filename: str) -> str:
+    quoted_filename = quote(filename)
+    if quoted_filename == filename:
+        return f'attachment; filename="{filename}"'
+
+    fallback = "".join(
+        char if char.isascii() and char.isprintable() and char not in '"\\' else "_" for char in filename
+    )
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quoted_filename}"
+
+
+def _parse_range(range_header: str | None, file_size: int) -> tuple[int, int] | None:
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+
+    start_text, _, end_text = range_header.removeprefix("bytes=").strip().partition("-")
+    try:
+        if not start_text:
+            return max(file_size - int(end_text), 0), file_size
+        start = int(start_text)
+        end = min(int(end_text) + 1, file_size) if end_text else file_size
+    except ValueError:
+        return None
 
-    return Response(content=file_data.content, media_type=file_data.content_type, headers=headers)
+    return (start, end) if start < file_size else (file_size, file_size)
 
 
 @router.delete("/{file_id}")
@@ -120,4 +256,5 @@ async def delete_file_view(
     if not success:
         raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="File not found")
 
+    schedule_file_cleanup()
     return MessageResponse(message="File deleted successfully")
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+from app.core.schema import DatabasePoolMetrics
+
+
+class MetricsResponse(BaseModel):
+    database: DatabasePoolMetrics
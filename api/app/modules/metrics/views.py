@@ -0,0 +1,17 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from app.core.database import get_pool_metrics
+from app.modules.auth.middleware import get_current_admin_user
+from app.modules.auth.models import User
+from app.modules.metrics.schema import MetricsResponse
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def get_metrics_view(
+    current_user: Annotated[User, Depends(get_current_admin_user)],
+) -> MetricsResponse:
+    return MetricsResponse(database=get_pool_metrics())
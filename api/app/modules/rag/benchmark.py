@@ -0,0 +1,158 @@
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import event
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import async_session, engine
+from app.core.latency import LatencyTracker
+from app.core.logging import get_logger, setup_logging
+from app.modules.auth.models import User
+from app.modules.rag.models import Answer, DocumentChunk, Question
+from app.modules.rag.repositories.document_chunk import DocumentChunkRepository
+from app.modules.rag.repositories.image import ImageRepository
+from app.modules.rag.repositories.qa import QARepository
+
+logger = get_logger(__name__)
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *args: Any) -> None:
+        self.count += 1
+
+
+async def seed_session(session: AsyncSession, turns: int, sources_per_turn: int) -> str:
+    user = User(workos_id=f"benchmark-{uuid.uuid4()}", email=None)
+    session.add(user)
+    await session.flush()
+
+    result = await session.exec(select(DocumentChunk.file_id, DocumentChunk.chunk_index).limit(100))
+    positions = list(result.all())
+
+    session_id = f"benchmark-{uuid.uuid4()}"
+    started_at = datetime.now()
+    questions = [
+        Question(
+            question_text=f"Benchmark question {turn}",
+            user_id=user.id,
+            session_id=session_id,
+            context_files=None,
+            created_at=started_at + timedelta(seconds=turn),
+            updated_at=started_at + timedelta(seconds=turn),
+        )
+        for turn in range(turns)
+    ]
+    session.add_all(questions)
+    await session.flush()
+
+    for turn, question in enumerate(questions):
+        cited = [positions[(turn + i) % len(positions)] for i in range(sources_per_turn)] if positions else []
+        session.add(
+            Answer(
+                question_id=question.id,
+                answer_text=f"Benchmark answer {turn}",
+                confidence_score=0.5,
+                sources_used=json.dumps(
+                    [
+                        {"file_id": file_id, "filename": "benchmark", "chunk_index": chunk_index}
+                        for file_id, chunk_index in cited
+                    ]
+                ),
+                processing_time_ms=None,
+                created_at=question.created_at,
+                updated_at=question.created_at,
+            )
+        )
+
+    await session.flush()
+    logger.info(f"Seeded session {session_id} with {turns} turns citing {len(positions)} distinct chunks")
+    return session_id
+
+
+async def load_per_turn(session: AsyncSession, session_id: str) -> int:
+    qa_repository = QARepository(session)
+    chunk_repository = DocumentChunkRepository(session)
+    image_repository = ImageRepository(session)
+
+    images = 0
+    for question in await qa_repository.get_questions_by_session(session_id):
+        for answer in (await qa_repository.get_answers_by_question_id(question.id))[:1]:
+            for source in json.loads(answer.sources_used or "[]"):
+                chunk = await chunk_repository.get_by_file_id_and_chunk_index(source["file_id"], source["chunk_index"])
+                if chunk:
+                    images += len(await image_repository.get_by_chunk_id(chunk.id))
+    return images
+
+
+async def load_single_query(session: AsyncSession, session_id: str) -> int:
+    qa_pairs = await QARepository(session).get_session_history(session_id)
+    return sum(len(images) for _, _, images in qa_pairs)
+
+
+async def measure(
+    session: AsyncSession,
+    session_id: str,
+    load: Callable[[AsyncSession, str], Awaitable[int]],
+    repeat: int,
+) -> dict[str, Any]:
+    counter = QueryCounter()
+    latency = LatencyTracker(window_size=repeat)
+    images = 0
+
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            images = await load(session, session_id)
+            latency.record(time.perf_counter() - started)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+    return {
+        "queries": counter.count // repeat,
+        "images": images,
+        "p50_ms": round((latency.percentile(50) or 0) * 1000, 2),
+        "p95_ms": round((latency.percentile(95) or 0) * 1000, 2),
+    }
+
+
+async def run_benchmark(turns: int, sources_per_turn: int, repeat: int) -> dict[str, dict[str, Any]]:
+    async with async_session() as session:
+        try:
+            session_id = await seed_session(session, turns, sources_per_turn)
+            return {
+                "per_turn": await measure(session, session_id, load_per_turn, repeat),
+                "single_query": await measure(session, session_id, load_single_query, repeat),
+            }
+        finally:
+            await session.rollback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-turn and single-query session history loading")
+    parser.add_argument("--turns", type=int, default=150, help="Number of question/answer turns in the session")
+    parser.add_argument("--sources-per-turn", type=int, default=3, help="Number of chunks cited by each answer")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of timed loads per strategy")
+    args = parser.parse_args()
+
+    setup_logging()
+    results = asyncio.run(run_benchmark(args.turns, args.sources_per_turn, args.repeat))
+    for name, result in results.items():
+        print(  # noqa: T201
+            f"{name:<13} queries={result['queries']:<5} images={result['images']:<5} "
+            f"p50={result['p50_ms']}ms p95={result['p95_ms']}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import asyncio
+
+from app.core.database import async_session
+from app.core.logging import get_logger, setup_logging
+from app.core.storage import get_storage
+from app.modules.rag.repositories.image import ImageRepository
+from app.modules.rag.services.image_storage_service import ImageStorageService
+
+logger = get_logger(__name__)
+
+
+async def migrate_images(batch_size: int) -> int:
+    migrated = 0
+    async with async_session() as session:
+        image_repository = ImageRepository(session)
+        image_storage = ImageStorageService(get_storage())
+
+        while images := await image_repository.get_inline(batch_size):
+            for image in images:
+                stored_image = await image_storage.store_base64(image.image_data or "")
+                image.content_hash = stored_image["content_hash"]
+                image.storage_key = stored_image["storage_key"]
+                image.mime_type = stored_image["mime_type"]
+                image.file_size = stored_image["file_size"]
+                image.image_data = None
+
+            await image_repository.update_batch(images)
+            migrated += len(images)
+            logger.info(f"Moved {migrated} images to blob storage")
+
+    return migrated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Move inline base64 images into blob storage")
+    parser.add_argument("--batch-size", type=int, default=500, help="Number of images to migrate per transaction")
+    args = parser.parse_args()
+
+    setup_logging()
+    migrated = asyncio.run(migrate_images(args.batch_size))
+    print(f"Migrated {migrated} images")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
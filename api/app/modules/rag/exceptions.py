@@ -0,0 +1,10 @@
+from app.core.exceptions import BaseServiceError
+
+
+class AudioValidationError(BaseServiceError): ...
+
+
+class AudioTooLargeError(AudioValidationError): ...
+
+
+class AudioTooLongError(AudioValidationError): ...
@@ -1,8 +1,9 @@
+from datetime import datetime
 from typing import Any
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import JSON, ForeignKey, Text
-from sqlmodel import Column, Field, Relationship
+from sqlalchemy import JSON, ForeignKey, Index, Text, UniqueConstraint
+from sqlmodel import Column, Field, Relationship, SQLModel
 
 from app.core.models import BaseModel
 
@@ -20,6 +21,7 @@ class Question(BaseModel, table=True):
 
 class Answer(BaseModel, table=True):
     __tablename__ = "answers"
+    __table_args__ = (Index("ix_answers_question_id", "question_id"),)
 
     answer_text: str = Field(nullable=False)
     question_id: int = Field(
@@ -28,12 +30,41 @@ class Answer(BaseModel, table=True):
     confidence_score: float = Field(nullable=False)
     sources_used: str | None = Field(nullable=True)
     processing_time_ms: int | None = Field(nullable=True)
+    prompt_tokens: int | None = Field(default=None, nullable=True)
+    cached_prompt_tokens: int | None = Field(default=None, nullable=True)
 
     question: Question = Relationship(back_populates="answers")
 
 
+class UserQuestionStats(SQLModel, table=True):
+    __tablename__ = "user_question_stats"
+
+    user_id: int = Field(
+        sa_column=Column(ForeignKey("user.id", ondelete="CASCADE"), primary_key=True),
+    )
+    question_count: int = Field(default=0, nullable=False)
+    answer_count: int = Field(default=0, nullable=False)
+    confidence_total: float = Field(default=0.0, nullable=False)
+    prompt_tokens: int = Field(default=0, nullable=False)
+    cached_prompt_tokens: int = Field(default=0, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.now, nullable=False)
+
+
+class ChunkImage(SQLModel, table=True):
+    __tablename__ = "chunk_images"
+
+    chunk_id: int = Field(
+        sa_column=Column(ForeignKey("document_chunks.id", ondelete="CASCADE"), primary_key=True),
+    )
+    image_id: int = Field(
+        sa_column=Column(ForeignKey("images.id", ondelete="CASCADE"), primary_key=True, index=True),
+    )
+    image_index: int = Field(nullable=False, default=0)
+
+
 class DocumentChunk(BaseModel, table=True):
     __tablename__ = "document_chunks"
+    __table_args__ = (Index("ix_document_chunks_file_id_chunk_index", "file_id", "chunk_index"),)
 
     text: str = Field(nullable=False)
     embedding: Any = Field(
@@ -45,26 +76,38 @@ class DocumentChunk(BaseModel, table=True):
     chunk_index: int = Field(nullable=False)
     page_number: int | None = Field(nullable=True)
     chunk_metadata: dict | None = Field(default=None, sa_column=Column(JSON))
+    summary: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
 
-    images: list["Image"] = Relationship(back_populates="chunk")
+    images: list["Image"] = Relationship(back_populates="chunks", link_model=ChunkImage)
 
 
 class Image(BaseModel, table=True):
     __tablename__ = "images"
-
-    chunk_id: int = Field(
-        sa_column=Column(
-            ForeignKey("document_chunks.id", ondelete="CASCADE"),
-            nullable=False,
-            index=True,
-        ),
-    )
-    image_data: str = Field(sa_column=Column(Text, nullable=False))
+    __table_args__ = (UniqueConstraint("file_id", "content_hash"),)
+
+    image_data: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
+    content_hash: str | None = Field(default=None, nullable=True, index=True)
+    storage_key: str | None = Field(default=None, nullable=True)
+    mime_type: str = Field(default="image/png", nullable=False)
+    file_size: int | None = Field(default=None, nullable=True)
+    thumbnail_key: str | None = Field(default=None, nullable=True)
+    width: int | None = Field(default=None, nullable=True)
+    height: int | None = Field(default=None, nullable=True)
     file_id: int = Field(
         sa_column=Column(ForeignKey("file.id", ondelete="CASCADE"), nullable=False, index=True),
     )
     page_number: int | None = Field(nullable=True)
     description: str | None = Field(nullable=True)
-    image_index: int = Field(nullable=False, default=0)
 
-    chunk: DocumentChunk = Relationship(back_populates="images")
+    chunks: list[DocumentChunk] = Relationship(back_populates="images", link_model=ChunkImage)
+
+
+class TranscriptionCache(BaseModel, table=True):
+    __tablename__ = "transcription_cache"
+    __table_args__ = (UniqueConstraint("audio_hash", "model", "language"),)
+
+    audio_hash: str = Field(nullable=False, index=True)
+    model: str = Field(nullable=False)
+    language: str = Field(nullable=False)
+    transcript_text: str = Field(sa_column=Column(Text, nullable=False))
+    audio_metadata: dict[str, Any] | None = Field(default=None, sa_column=Column(JSON))
@@ -1,6 +1,11 @@
-from sqlmodel import select
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, tuple_
+from sqlmodel import delete, select, update
 
 from app.core.repositories import Repository
+from app.modules.files.models import File
+from app.modules.files.schema import FileType
 from app.modules.rag.models import DocumentChunk
 
 
@@ -9,15 +14,16 @@ class DocumentChunkRepository(Repository):
         for chunk in chunks:
             self._session.add(chunk)
 
-        await self._session.commit()
-        for chunk in chunks:
-            await self._session.refresh(chunk)
-
+        await self._session.flush()
         return chunks
 
     async def search_by_embedding(self, query_embedding: list[float], n_results: int = 5) -> list[DocumentChunk]:
         statement = (
-            select(DocumentChunk).order_by(DocumentChunk.embedding.cosine_distance(query_embedding)).limit(n_results)
+            select(DocumentChunk)
+            .join(File, File.id == DocumentChunk.file_id)
+            .where(File.deleted_at.is_(None))
+            .order_by(DocumentChunk.embedding.cosine_distance(query_embedding))
+            .limit(n_results)
         )
 
         result = await self._session.exec(statement)
@@ -35,7 +41,61 @@ class DocumentChunkRepository(Repository):
         result = await self._session.exec(statement)
         return result.first()
 
+    async def get_ids_by_positions(self, positions: list[tuple[int, int]]) -> dict[tuple[int, int], int]:
+        if not positions:
+            return {}
+
+        statement = select(DocumentChunk.file_id, DocumentChunk.chunk_index, DocumentChunk.id).where(
+            tuple_(DocumentChunk.file_id, DocumentChunk.chunk_index).in_(positions)
+        )
+        result = await self._session.exec(statement)
+        return {(file_id, chunk_index): chunk_id for file_id, chunk_index, chunk_id in result.all()}
+
+    async def get_unsummarized_by_file_id(self, file_id: int) -> list[DocumentChunk]:
+        statement = (
+            select(DocumentChunk)
+            .where(DocumentChunk.file_id == file_id, DocumentChunk.summary.is_(None))
+            .order_by(DocumentChunk.chunk_index)
+        )
+        result = await self._session.exec(statement)
+        return list(result.all())
+
+    async def update_summaries(self, summaries: dict[int, str]) -> None:
+        if not summaries:
+            return
+
+        await self._session.execute(
+            update(DocumentChunk),
+            [{"id": chunk_id, "summary": summary} for chunk_id, summary in summaries.items()],
+        )
+        await self._session.commit()
+
+    async def get_ingested_file_id(self, content_hash: str) -> int | None:
+        statement = (
+            select(DocumentChunk.file_id)
+            .join(File, File.id == DocumentChunk.file_id)
+            .where(File.content_hash == content_hash, File.deleted_at.is_(None))
+            .limit(1)
+        )
+        result = await self._session.exec(statement)
+        return result.first()
+
+    async def get_pending_file_ids(self, file_types: list[FileType]) -> list[int]:
+        has_chunks = select(DocumentChunk.id).where(DocumentChunk.file_id == File.id).exists()
+        statement = select(File.id).where(File.file_type.in_(file_types), File.deleted_at.is_(None), ~has_chunks)
+        result = await self._session.exec(statement)
+        return list(result.all())
+
     async def chunk_exists(self, file_id: int) -> bool:
         statement = select(DocumentChunk).where(DocumentChunk.file_id == file_id).limit(1)
         result = await self._session.exec(statement)
         return result.first() is not None
+
+    async def delete_by_file_ids(self, file_ids: list[int], limit: int) -> int:
+        batch = select(DocumentChunk.id).where(DocumentChunk.file_id.in_(file_ids)).limit(limit)
+        result = cast(
+            CursorResult[Any],
+            await self._session.execute(delete(DocumentChunk).where(DocumentChunk.id.in_(batch.scalar_subquery()))),
+        )
+        await self._session.commit()
+        return result.rowcount
@@ -1,7 +1,10 @@
-from sqlmodel import select
+from typing import Any, cast
+
+from sqlalchemy import CompoundSelect, CursorResult, text
+from sqlmodel import delete, select, union
 
 from app.core.repositories import Repository
-from app.modules.rag.models import Image
+from app.modules.rag.models import ChunkImage, Image
 
 
 class ImageRepository(Repository):
@@ -9,32 +12,114 @@ class ImageRepository(Repository):
         for image in images:
             self._session.add(image)
 
-        await self._session.commit()
-        for image in images:
-            await self._session.refresh(image)
-
+        await self._session.flush()
         return images
 
+    async def get_by_id(self, image_id: int) -> Image | None:
+        result = await self._session.exec(select(Image).where(Image.id == image_id))
+        return result.first()
+
     async def get_by_chunk_id(self, chunk_id: int) -> list[Image]:
-        statement = select(Image).where(Image.chunk_id == chunk_id).order_by(Image.image_index)
+        statement = (
+            select(Image)
+            .join(ChunkImage, ChunkImage.image_id == Image.id)
+            .where(ChunkImage.chunk_id == chunk_id)
+            .order_by(ChunkImage.image_index)
+        )
         result = await self._session.exec(statement)
         return list(result.all())
 
-    async def get_by_chunk_ids(self, chunk_ids: list[int]) -> list[Image]:
-        statement = select(Image).where(Image.chunk_id.in_(chunk_ids)).order_by(Image.chunk_id, Image.image_index)
+    async def get_by_chunk_ids(self, chunk_ids: list[int]) -> dict[int, list[Image]]:
+        if not chunk_ids:
+            return {}
+
+        statement = (
+            select(ChunkImage.chunk_id, Image)
+            .join(ChunkImage, ChunkImage.image_id == Image.id)
+            .where(ChunkImage.chunk_id.in_(chunk_ids))
+            .order_by(ChunkImage.chunk_id, ChunkImage.image_index)
+        )
         result = await self._session.exec(statement)
-        return list(result.all())
+        images: dict[int, list[Image]] = {}
+        for chunk_id, image in result.all():
+            images.setdefault(chunk_id, []).append(image)
+        return images
 
     async def get_by_file_id(self, file_id: int) -> list[Image]:
-        statement = select(Image).where(Image.file_id == file_id).order_by(Image.image_index)
+        statement = select(Image).where(Image.file_id == file_id).order_by(Image.id)
         result = await self._session.exec(statement)
         return list(result.all())
 
-    async def delete_by_file_id(self, file_id: int) -> int:
-        statement = select(Image).where(Image.file_id == file_id)
+    async def get_links_by_file_id(self, file_id: int) -> list[ChunkImage]:
+        statement = (
+            select(ChunkImage)
+            .join(Image, Image.id == ChunkImage.image_id)
+            .where(Image.file_id == file_id)
+            .order_by(ChunkImage.chunk_id, ChunkImage.image_index)
+        )
         result = await self._session.exec(statement)
-        images = list(result.all())
+        return list(result.all())
+
+    async def create_links(self, links: list[ChunkImage]) -> list[ChunkImage]:
+        self._session.add_all(links)
+        await self._session.flush()
+        return links
+
+    async def get_inline(self, limit: int) -> list[Image]:
+        statement = select(Image).where(Image.storage_key.is_(None)).order_by(Image.id).limit(limit)
+        result = await self._session.exec(statement)
+        return list(result.all())
+
+    async def update_batch(self, images: list[Image]) -> list[Image]:
         for image in images:
-            await self._session.delete(image)
+            self._session.add(image)
+
+        await self._session.commit()
+        return images
+
+    async def delete_by_file_id(self, file_id: int) -> int:
+        result = cast(CursorResult[Any], await self._session.execute(delete(Image).where(Image.file_id == file_id)))
         await self._session.commit()
-        return len(images)
+        return result.rowcount
+
+    async def delete_by_file_ids(self, file_ids: list[int], limit: int) -> list[tuple[str | None, str | None]]:
+        batch = select(Image.id).where(Image.file_id.in_(file_ids)).limit(limit)
+        result = await self._session.execute(
+            delete(Image).where(Image.id.in_(batch.scalar_subquery())).returning(Image.storage_key, Image.thumbnail_key)
+        )
+        deleted_keys = [tuple(row) for row in result.all()]
+        await self._session.commit()
+        return deleted_keys
+
+    async def lock_storage_keys(self, keys: list[str]) -> None:
+        if not keys:
+            return
+
+        await self._session.execute(
+            text(
+                "SELECT pg_advisory_xact_lock_shared(hashtextextended(key, 0)) "
+                "FROM unnest(CAST(:keys AS text[])) AS key"
+            ),
+            {"keys": keys},
+        )
+
+    async def try_lock_storage_keys(self, keys: list[str]) -> set[str]:
+        if not keys:
+            return set()
+
+        result = await self._session.execute(
+            text(
+                "SELECT key FROM unnest(CAST(:keys AS text[])) AS key "
+                "WHERE pg_try_advisory_xact_lock(hashtextextended(key, 0))"
+            ),
+            {"keys": keys},
+        )
+        return set(result.scalars().all())
+
+    async def get_referenced_keys(self, keys: list[str]) -> set[str]:
+        statement: CompoundSelect[str | None] = union(
+            select(Image.storage_key).where(Image.storage_key.in_(keys)),
+            select(Image.thumbnail_key).where(Image.thumbnail_key.in_(keys)),
+        )
+        result = await self._session.execute(statement)
+        return set(result.scalars().all())
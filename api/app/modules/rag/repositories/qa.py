@@ -1,23 +1,38 @@
-from sqlmodel import select
+from typing import Any
+
+from sqlalchemy import BigInteger, ColumnElement, Integer, ScalarSelect, case, column, literal_column, table
+from sqlalchemy.dialects.postgresql import JSON, JSONB, aggregate_order_by, insert
+from sqlalchemy.orm import aliased
+from sqlmodel import cast, func, select
+from sqlmodel.sql.expression import Select
 
 from app.core.repositories import Repository
-from app.modules.rag.models import Answer, Question
-from app.modules.rag.schema import AnswerCreate, QuestionCreate, QuestionStats
+from app.modules.files.models import File
+from app.modules.rag.models import Answer, ChunkImage, DocumentChunk, Image, Question, UserQuestionStats
+from app.modules.rag.schema import AnswerCreate, AnswerImage, QuestionCreate, QuestionStats, RAGStats
+
+pg_class = table("pg_class", column("oid"), column("reltuples"))
 
 
 class QARepository(Repository):
     async def create_question(self, question_data: QuestionCreate) -> Question:
         question = Question(**question_data.model_dump())
         self._session.add(question)
-        await self._session.commit()
-        await self._session.refresh(question)
+        await self._session.flush()
+        await self._increment_user_stats(question.user_id, question_count=1)
         return question
 
     async def create_answer(self, answer_data: AnswerCreate) -> Answer:
         answer = Answer(**answer_data.model_dump())
         self._session.add(answer)
-        await self._session.commit()
-        await self._session.refresh(answer)
+        await self._session.flush()
+        await self._increment_user_stats(
+            select(Question.user_id).where(Question.id == answer.question_id).scalar_subquery(),
+            answer_count=1,
+            confidence_total=answer.confidence_score,
+            prompt_tokens=answer.prompt_tokens or 0,
+            cached_prompt_tokens=answer.cached_prompt_tokens or 0,
+        )
         return answer
 
     async def get_question_by_id(self, question_id: int) -> Question | None:
@@ -40,6 +55,16 @@ class QARepository(Repository):
         )
         return list(result.all())
 
+    async def get_distinct_recent_questions(self, limit: int = 100) -> list[tuple[int, str]]:
+        latest_id = func.max(Question.id)
+        result = await self._session.exec(
+            select(latest_id, Question.question_text)
+            .group_by(Question.question_text)
+            .order_by(latest_id.desc())
+            .limit(limit)
+        )
+        return list(result.all())
+
     async def get_qa_pairs(self, limit: int = 50) -> list[tuple[Question, Answer]]:
         result = await self._session.exec(
             select(Question, Answer)
@@ -49,6 +74,70 @@ class QARepository(Repository):
         )
         return list(result.all())
 
+    async def get_history(self, limit: int = 50) -> list[tuple[Question, Answer, list[AnswerImage]]]:
+        result = await self._session.exec(
+            self._qa_pairs_with_images().order_by(Question.created_at.desc()).limit(limit)
+        )
+        return list(result.all())
+
+    async def get_session_history(self, session_id: str) -> list[tuple[Question, Answer, list[AnswerImage]]]:
+        result = await self._session.exec(
+            self._qa_pairs_with_images().where(Question.session_id == session_id).order_by(Question.created_at.asc())
+        )
+        return list(result.all())
+
+    @staticmethod
+    def _qa_pairs_with_images() -> Select[Question, Answer, Any]:
+        source = (
+            func.jsonb_array_elements(func.jsonb_array_or_empty(Answer.sources_used, type_=JSONB))
+            .table_valued(column("value", JSONB), with_ordinality="position")
+            .render_derived(name="source")
+        )
+        image = func.json_build_object(
+            "image_id",
+            Image.id,
+            "description",
+            Image.description,
+            "page_number",
+            Image.page_number,
+            "file_id",
+            DocumentChunk.file_id,
+            "chunk_index",
+            DocumentChunk.chunk_index,
+            "filename",
+            source.c.value["filename"].astext,
+            "source_page_number",
+            QARepository._json_int(source.c.value, "page_number"),
+        )
+        images = (
+            select(
+                func.coalesce(
+                    func.json_agg(aggregate_order_by(image, source.c.position, ChunkImage.image_index)),
+                    literal_column("'[]'::json"),
+                    type_=JSON,
+                )
+            )
+            .select_from(source)
+            .join(
+                DocumentChunk,
+                (DocumentChunk.file_id == QARepository._json_int(source.c.value, "file_id"))
+                & (DocumentChunk.chunk_index == QARepository._json_int(source.c.value, "chunk_index")),
+            )
+            .join(ChunkImage, ChunkImage.chunk_id == DocumentChunk.id)
+            .join(Image, Image.id == ChunkImage.image_id)
+            .scalar_subquery()
+        )
+        first_answer = aliased(Answer)
+        first_answer_id = (
+            select(func.min(first_answer.id)).where(first_answer.question_id == Question.id).scalar_subquery()
+        )
+        return select(Question, Answer, images).join(Answer, Answer.id == first_answer_id)
+
+    @staticmethod
+    def _json_int(value: ColumnElement[Any], key: str) -> ColumnElement[int]:
+        text_value = value[key].astext
+        return cast(case((text_value.regexp_match(r"^\d{1,9}$"), text_value)), Integer)
+
     async def delete_question(self, question_id: int) -> bool:
         question = await self.get_question_by_id(question_id)
         if question:
@@ -57,19 +146,80 @@ class QARepository(Repository):
                 await self._session.delete(answer)
 
             await self._session.delete(question)
+            await self._increment_user_stats(
+                question.user_id,
+                question_count=-1,
+                answer_count=-len(answers),
+                confidence_total=-sum(answer.confidence_score for answer in answers),
+                prompt_tokens=-sum(answer.prompt_tokens or 0 for answer in answers),
+                cached_prompt_tokens=-sum(answer.cached_prompt_tokens or 0 for answer in answers),
+            )
             await self._session.commit()
             return True
         return False
 
     async def get_question_stats(self, user_id: int) -> QuestionStats:
-        questions_result = await self._session.exec(select(Question).where(Question.user_id == user_id))
-        questions = list(questions_result.all())
-
-        answers_result = await self._session.exec(select(Answer).join(Question).where(Question.user_id == user_id))
-        answers = list(answers_result.all())
+        result = await self._session.exec(select(UserQuestionStats).where(UserQuestionStats.user_id == user_id))
+        stats = result.first()
+        if not stats:
+            return QuestionStats(total_questions=0, total_answers=0, avg_confidence=0)
 
         return QuestionStats(
-            total_questions=len(questions),
-            total_answers=len(answers),
-            avg_confidence=(sum(a.confidence_score for a in answers) / len(answers) if answers else 0),
+            total_questions=stats.question_count,
+            total_answers=stats.answer_count,
+            avg_confidence=stats.confidence_total / stats.answer_count if stats.answer_count else 0,
+            prompt_cache_hit_rate=stats.cached_prompt_tokens / stats.prompt_tokens if stats.prompt_tokens else 0.0,
+        )
+
+    async def get_rag_stats(self) -> RAGStats:
+        file_estimate = self._row_estimate(str(File.__tablename__))
+        deleted_files = select(func.count()).select_from(File).where(File.deleted_at.is_not(None)).scalar_subquery()
+        result = await self._session.execute(
+            select(
+                case(
+                    (file_estimate >= 0, func.greatest(file_estimate - deleted_files, 0)),
+                    else_=select(func.count()).select_from(File).where(File.deleted_at.is_(None)).scalar_subquery(),
+                ),
+                self._estimate_or_count(DocumentChunk),
+                select(func.coalesce(func.sum(UserQuestionStats.question_count), 0)).scalar_subquery(),
+                self._estimate_or_count(Image),
+            ).add_columns(select(func.max(DocumentChunk.created_at)).scalar_subquery())
+        )
+        total_documents, total_chunks, total_questions, total_images, last_processed = result.one()
+        return RAGStats(
+            total_documents=total_documents,
+            total_chunks=total_chunks,
+            total_questions=total_questions,
+            total_images=total_images,
+            last_processed=last_processed,
+        )
+
+    @staticmethod
+    def _row_estimate(table_name: str) -> ScalarSelect[int]:
+        return (
+            select(cast(pg_class.c.reltuples, BigInteger))
+            .where(pg_class.c.oid == func.to_regclass(table_name))
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def _estimate_or_count(model: type[DocumentChunk | Image]) -> ColumnElement[int]:
+        estimate = QARepository._row_estimate(model.__tablename__)
+        return case((estimate >= 0, estimate), else_=select(func.count()).select_from(model).scalar_subquery())
+
+    async def _increment_user_stats(self, user_id: int | ScalarSelect[int], **deltas: float) -> None:
+        statement = insert(UserQuestionStats).values(
+            user_id=user_id,
+            question_count=deltas.get("question_count", 0),
+            answer_count=deltas.get("answer_count", 0),
+            confidence_total=deltas.get("confidence_total", 0.0),
+            prompt_tokens=deltas.get("prompt_tokens", 0),
+            cached_prompt_tokens=deltas.get("cached_prompt_tokens", 0),
+            updated_at=func.now(),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={name: getattr(UserQuestionStats, name) + statement.excluded[name] for name in deltas}
+            | {"updated_at": statement.excluded.updated_at},
         )
+        await self._session.execute(statement)
@@ -0,0 +1,24 @@
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+
+from app.core.repositories import Repository
+from app.modules.rag.models import TranscriptionCache
+
+
+class TranscriptionCacheRepository(Repository):
+    async def get(self, audio_hash: str, model: str, language: str) -> TranscriptionCache | None:
+        statement = select(TranscriptionCache).where(
+            TranscriptionCache.audio_hash == audio_hash,
+            TranscriptionCache.model == model,
+            TranscriptionCache.language == language,
+        )
+        result = await self._session.exec(statement)
+        return result.first()
+
+    async def create(self, entry: TranscriptionCache) -> None:
+        statement = (
+            insert(TranscriptionCache)
+            .values(entry.model_dump(exclude={"id"}))
+            .on_conflict_do_nothing(index_elements=["audio_hash", "model", "language"])
+        )
+        await self._session.execute(statement)
@@ -1,19 +1,91 @@
 from datetime import datetime
-from typing import TypedDict
+from enum import StrEnum
+from typing import NotRequired, TypedDict
 
+from openai.types.chat import ChatCompletion
 from pydantic import BaseModel
 
 
-class RAGResult(TypedDict):
+class LLMProviderType(StrEnum):
+    OPENAI = "openai"
+    LOCAL = "local"
+
+
+class PromptLayout(StrEnum):
+    CONTEXT_FIRST = "context_first"
+    CACHE_FRIENDLY = "cache_friendly"
+
+
+class TranscriptionBackend(StrEnum):
+    OPENAI = "openai"
+    LOCAL = "local"
+
+
+class IngestionJobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ImageRendition(StrEnum):
+    DISPLAY = "display"
+    THUMBNAIL = "thumbnail"
+
+
+class GeneratedAnswer(TypedDict):
     answer_text: str
-    sources: list[str]
-    images: list[str]
-    confidence_score: float
+    prompt_tokens: int | None
+    cached_tokens: int | None
+
+
+class LLMBatchResult(TypedDict):
+    batch_id: str | None
+    responses: list[ChatCompletion | None]
+
+
+class GeneratedAnswerBatch(TypedDict):
+    batch_id: str | None
+    answers: list[GeneratedAnswer | None]
+
+
+class TranscodedImage(TypedDict):
+    display: bytes
+    thumbnail: bytes
+    width: int
+    height: int
+
+
+class StoredImage(TypedDict):
+    content_hash: str
+    storage_key: str
+    mime_type: str
+    file_size: int
+    thumbnail_key: NotRequired[str | None]
+    width: NotRequired[int | None]
+    height: NotRequired[int | None]
+
+
+class RenderedImage(TypedDict):
+    stored_image: StoredImage
+    display: bytes
+    thumbnail: bytes
+
+
+class AnswerImage(TypedDict):
+    image_id: int
+    description: str | None
+    page_number: int | None
+    file_id: int
+    chunk_index: int
+    filename: str | None
+    source_page_number: int | None
 
 
 class QuestionRequest(BaseModel):
     question: str
     session_id: str | None = None
+    use_summaries: bool = False
 
 
 class VoiceQuestionRequest(BaseModel):
@@ -29,18 +101,31 @@ class SourceReference(BaseModel):
 
 
 class ImageReference(BaseModel):
+    image_id: int
     image_path: str
+    thumbnail_path: str | None = None
     description: str | None = None
     page_number: int | None = None
     file_id: int
 
 
+class RAGResult(TypedDict):
+    answer_text: str
+    sources: list[SourceReference]
+    images: list[ImageReference]
+    confidence_score: float
+    prompt_tokens: NotRequired[int | None]
+    cached_tokens: NotRequired[int | None]
+    is_partial: NotRequired[bool]
+
+
 class AnswerResponse(BaseModel):
     answer: str
     sources: list[SourceReference]
     images: list[ImageReference] = []
     confidence_score: float
     question_id: int
+    is_partial: bool = False
 
 
 class QuestionHistory(BaseModel):
@@ -59,6 +144,13 @@ class DocumentProcessingStatus(BaseModel):
     error_message: str | None = None
 
 
+class IngestionJob(BaseModel):
+    job_id: str
+    file_id: int
+    status: IngestionJobStatus = IngestionJobStatus.QUEUED
+    error: str | None = None
+
+
 class RAGStats(BaseModel):
     total_documents: int
     total_chunks: int
@@ -81,6 +173,8 @@ class AnswerCreate(BaseModel):
     sources_used: str | None = None
     images_used: str | None = None
     processing_time_ms: int | None = None
+    prompt_tokens: int | None = None
+    cached_prompt_tokens: int | None = None
 
 
 class QuestionResponse(BaseModel):
@@ -100,6 +194,8 @@ class QAResponse(BaseModel):
     confidence_score: float
     sources_used: str | None
     processing_time_ms: str | None
+    prompt_tokens: int | None = None
+    cached_prompt_tokens: int | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -114,3 +210,4 @@ class QuestionStats(BaseModel):
     total_questions: int
     total_answers: int
     avg_confidence: float
+    prompt_cache_hit_rate: float = 0.0
@@ -1,19 +1,31 @@
 from .audio_processing_service import AudioProcessingService
+from .chunk_summary_service import ChunkSummaryService
 from .content_manager import BaseContentManager
 from .document_service import DocumentService
 from .docx_content_manager import DOCXContentManager
 from .embeddings_service import EmbeddingsService
+from .image_service import ImageService
+from .image_storage_service import ImageStorageService
+from .llm_provider import LLMProvider, LocalLLMProvider, OpenAIProvider
 from .openai_service import OpenAIService
 from .pdf_content_manager import PDFContentManager
+from .transcription_cache_service import TranscriptionCacheService
 from .vector_store_manager import VectorStoreManager
 
 __all__ = [
     "AudioProcessingService",
     "BaseContentManager",
+    "ChunkSummaryService",
     "DOCXContentManager",
     "DocumentService",
     "EmbeddingsService",
+    "ImageService",
+    "ImageStorageService",
+    "LLMProvider",
+    "LocalLLMProvider",
+    "OpenAIProvider",
     "OpenAIService",
     "PDFContentManager",
+    "TranscriptionCacheService",
     "VectorStoreManager",
 ]
@@ -0,0 +1,85 @@
+import subprocess
+
+import librosa
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def decode_audio(audio_data: bytes, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    command = [
+        "ffmpeg",
+        "-threads",
+        "0",
+        "-i",
+        "pipe:0",
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-acodec",
+        "pcm_s16le",
+        "-ar",
+        str(sample_rate),
+        "-",
+    ]
+    result = subprocess.run(command, input=audio_data, capture_output=True, check=True)
+    return np.frombuffer(result.stdout, np.int16).flatten().astype(np.float32) / 32768.0
+
+
+def encode_audio(samples: np.ndarray, bitrate: str, sample_rate: int = SAMPLE_RATE) -> bytes:
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+    command = [
+        "ffmpeg",
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-i",
+        "pipe:0",
+        "-c:a",
+        "libopus",
+        "-b:a",
+        bitrate,
+        "-application",
+        "voip",
+        "-f",
+        "ogg",
+        "-",
+    ]
+    result = subprocess.run(command, input=pcm.tobytes(), capture_output=True, check=True)
+    encoded: bytes = result.stdout
+    return encoded
+
+
+def trim_silence(samples: np.ndarray, top_db: float) -> np.ndarray:
+    if not samples.size or not np.any(samples):
+        return samples[:0]
+    trimmed, _ = librosa.effects.trim(samples, top_db=top_db)
+    return trimmed
+
+
+def split_on_silence(
+    samples: np.ndarray, sample_rate: int, max_segment_seconds: float, top_db: float
+) -> list[np.ndarray]:
+    if not samples.size or not np.any(samples):
+        return []
+
+    max_segment_length = int(max_segment_seconds * sample_rate)
+    segments = []
+    start = end = None
+
+    for interval_start, interval_end in librosa.effects.split(samples, top_db=top_db):
+        if start is None:
+            start, end = interval_start, interval_end
+            continue
+        if interval_end - start > max_segment_length:
+            segments.append(samples[start:end])
+            start = interval_start
+        end = interval_end
+
+    if start is not None:
+        segments.append(samples[start:end])
+    return segments
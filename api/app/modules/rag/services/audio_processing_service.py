@@ -1,41 +1,72 @@
-import tempfile
+import asyncio
 from typing import Any
 
 import openai
+from fastapi import UploadFile
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.modules.rag.exceptions import AudioTooLargeError, AudioTooLongError
+from app.modules.rag.schema import TranscriptionBackend
+from app.modules.rag.services import audio_preprocessing, local_whisper
 
 logger = get_logger(__name__)
 
 
 class AudioProcessingService:
+    _READ_CHUNK_SIZE = 1024 * 1024
+
     def __init__(self) -> None:
         logger.info("Initializing AudioProcessingService with OpenAI client")
-        self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
-    async def transcribe_with_openai(self, audio_data: bytes, filename: str = None) -> tuple[str, dict[str, Any]]:
-        logger.info(f"Starting audio transcription for file: {filename}, size: {len(audio_data)} bytes")
+    async def read_upload(self, audio_file: UploadFile) -> bytes:
+        buffer = bytearray()
         try:
-            with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_file.flush()
-                temp_file_name = temp_file.name
-
-            logger.debug("Calling OpenAI Whisper API for transcription")
-            with open(temp_file_name, "rb") as f:  # noqa: PTH123 ASYNC230
-                transcript = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=f,
-                    response_format="text",
-                    language="en",
+            while chunk := await audio_file.read(self._READ_CHUNK_SIZE):
+                buffer.extend(chunk)
+                if len(buffer) > settings.AUDIO_MAX_UPLOAD_BYTES:
+                    raise AudioTooLargeError(
+                        f"Audio file exceeds the maximum size of {settings.AUDIO_MAX_UPLOAD_BYTES} bytes"
+                    )
+        finally:
+            await audio_file.close()
+
+        return bytes(buffer)
+
+    async def transcribe(self, audio_data: bytes, filename: str | None = None) -> tuple[str, dict[str, Any]]:
+        backend = TranscriptionBackend(settings.TRANSCRIPTION_BACKEND)
+        logger.info(
+            f"Starting audio transcription for file: {filename}, size: {len(audio_data)} bytes, backend: {backend}"
+        )
+        try:
+            if len(audio_data) > settings.AUDIO_MAX_UPLOAD_BYTES:
+                raise AudioTooLargeError(
+                    f"Audio file exceeds the maximum size of {settings.AUDIO_MAX_UPLOAD_BYTES} bytes"
                 )
 
-            transcribed_text = transcript.strip()
+            payloads, duration_seconds = await asyncio.to_thread(self._prepare_audio, audio_data, filename)
+            processed_bytes = sum(len(payload) for _, payload in payloads)
+            logger.debug(
+                f"Prepared {duration_seconds:.1f}s of audio as {len(payloads)} segments: "
+                f"{len(audio_data)} -> {processed_bytes} bytes"
+            )
+
+            transcribed_text = await self._transcribe_segments(payloads)
 
             logger.info(f"Transcription completed. Text length: {len(transcribed_text)} characters")
 
-            metadata = {"provider": "openai", "filename": filename}
+            metadata = {
+                "provider": backend.value,
+                "filename": filename,
+                "duration_seconds": round(duration_seconds, 2),
+                "segments": len(payloads),
+                "normalized": settings.AUDIO_NORMALIZATION_ENABLED,
+                "original_bytes": len(audio_data),
+                "processed_bytes": processed_bytes,
+            }
+            if backend == TranscriptionBackend.LOCAL:
+                metadata["model"] = settings.LOCAL_WHISPER_MODEL
 
             return transcribed_text, metadata
         except Exception as e:
@@ -44,3 +75,66 @@ class AudioProcessingService:
                 exc_info=True,
             )
             raise
+
+    async def transcribe_with_openai(self, audio_data: bytes, filename: str) -> str:
+        transcript = await self.client.audio.transcriptions.create(
+            model=settings.TRANSCRIPTION_MODEL,
+            file=(filename, audio_data),
+            response_format="text",
+            language=settings.TRANSCRIPTION_LANGUAGE,
+        )
+        return transcript.strip()
+
+    async def transcribe_locally(self, audio_data: bytes) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            local_whisper.get_whisper_pool(),
+            local_whisper.transcribe,
+            audio_data,
+            settings.TRANSCRIPTION_LANGUAGE,
+        )
+
+    async def _transcribe_segment(self, audio_data: bytes, filename: str) -> str:
+        if TranscriptionBackend(settings.TRANSCRIPTION_BACKEND) == TranscriptionBackend.LOCAL:
+            return await self.transcribe_locally(audio_data)
+        return await self.transcribe_with_openai(audio_data, filename)
+
+    async def _transcribe_segments(self, payloads: list[tuple[str, bytes]]) -> str:
+        semaphore = asyncio.Semaphore(settings.TRANSCRIPTION_CONCURRENCY)
+
+        async def transcribe_one(filename: str, payload: bytes) -> str:
+            async with semaphore:
+                return await self._transcribe_segment(payload, filename)
+
+        transcripts = await asyncio.gather(*(transcribe_one(filename, payload) for filename, payload in payloads))
+        return " ".join(transcript for transcript in transcripts if transcript)
+
+    def _prepare_audio(self, audio_data: bytes, filename: str | None) -> tuple[list[tuple[str, bytes]], float]:
+        samples = audio_preprocessing.decode_audio(audio_data)
+        duration_seconds = len(samples) / audio_preprocessing.SAMPLE_RATE
+        if duration_seconds > settings.AUDIO_MAX_DURATION_SECONDS:
+            raise AudioTooLongError(
+                f"Audio duration {duration_seconds:.1f}s exceeds the maximum of {settings.AUDIO_MAX_DURATION_SECONDS}s"
+            )
+
+        is_long = duration_seconds > settings.AUDIO_SEGMENTATION_MIN_SECONDS
+        if settings.AUDIO_NORMALIZATION_ENABLED:
+            samples = audio_preprocessing.trim_silence(samples, settings.AUDIO_SILENCE_TOP_DB)
+        elif not is_long:
+            return [(filename or "audio.webm", audio_data)], duration_seconds
+
+        if is_long:
+            segments = audio_preprocessing.split_on_silence(
+                samples,
+                audio_preprocessing.SAMPLE_RATE,
+                settings.AUDIO_SEGMENT_MAX_SECONDS,
+                settings.AUDIO_SILENCE_TOP_DB,
+            )
+        else:
+            segments = [samples] if samples.size else []
+
+        payloads = [
+            (f"segment_{index}.ogg", audio_preprocessing.encode_audio(segment, settings.AUDIO_ENCODE_BITRATE))
+            for index, segment in enumerate(segments)
+        ]
+        return payloads, duration_seconds
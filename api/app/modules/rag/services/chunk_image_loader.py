@@ -0,0 +1,26 @@
+from collections.abc import Iterable
+
+from app.modules.rag.models import Image
+from app.modules.rag.repositories.document_chunk import DocumentChunkRepository
+from app.modules.rag.repositories.image import ImageRepository
+
+ChunkPosition = tuple[int, int]
+
+
+class ChunkImageLoader:
+    def __init__(self, chunk_repository: DocumentChunkRepository, image_repository: ImageRepository) -> None:
+        self.chunk_repository = chunk_repository
+        self.image_repository = image_repository
+        self._images: dict[ChunkPosition, list[Image]] = {}
+
+    async def load(self, positions: Iterable[ChunkPosition]) -> dict[ChunkPosition, list[Image]]:
+        positions = list(dict.fromkeys(positions))
+        missing = [position for position in positions if position not in self._images]
+        if missing:
+            chunk_ids = await self.chunk_repository.get_ids_by_positions(missing)
+            images_by_chunk = await self.image_repository.get_by_chunk_ids(list(chunk_ids.values()))
+            for position in missing:
+                chunk_id = chunk_ids.get(position)
+                self._images[position] = images_by_chunk.get(chunk_id, []) if chunk_id is not None else []
+
+        return {position: self._images[position] for position in positions}
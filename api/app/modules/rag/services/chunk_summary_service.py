@@ -0,0 +1,77 @@
+import asyncio
+from typing import Annotated
+
+from fastapi import Depends
+from openai.types.chat import ChatCompletionMessageParam
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.logging import get_logger
+from app.modules.rag.models import DocumentChunk
+from app.modules.rag.repositories.document_chunk import DocumentChunkRepository
+from app.modules.rag.services.llm_provider import LLMProvider, get_llm_provider
+
+logger = get_logger(__name__)
+
+_background_tasks: set[asyncio.Task[None]] = set()
+
+
+class ChunkSummaryService:
+    _SYSTEM_PROMPT = (
+        "You summarize document excerpts for a retrieval system.\n"
+        "Write a compact summary that keeps names, numbers, dates and definitions a question might ask about.\n"
+        "Do not add information that is not in the excerpt."
+    )
+
+    def __init__(self, provider: Annotated[LLMProvider, Depends(get_llm_provider)]) -> None:
+        self.provider = provider
+
+    async def summarize(self, chunks: list[DocumentChunk]) -> dict[int, str]:
+        batch_size = settings.CHUNK_SUMMARY_BATCH_SIZE
+        batches = [chunks[start : start + batch_size] for start in range(0, len(chunks), batch_size)]
+        results = await asyncio.gather(
+            *(
+                self.provider.complete_batch(
+                    [self._build_messages(chunk.text) for chunk in batch],
+                    max_tokens=settings.CHUNK_SUMMARY_MAX_TOKENS,
+                    temperature=0.0,
+                )
+                for batch in batches
+            )
+        )
+
+        summaries: dict[int, str] = {}
+        for batch, result in zip(batches, results, strict=True):
+            for chunk, response in zip(batch, result["responses"], strict=True):
+                if response is not None and response.choices[0].message.content:
+                    summaries[chunk.id] = response.choices[0].message.content.strip()
+        return summaries
+
+    def _build_messages(self, text: str) -> list[ChatCompletionMessageParam]:
+        return [
+            {"role": "system", "content": self._SYSTEM_PROMPT},
+            {"role": "user", "content": f"Excerpt:\n{text}"},
+        ]
+
+
+async def _summarize_file_in_background(file_id: int) -> None:
+    try:
+        async with async_session() as session:
+            chunks = await DocumentChunkRepository(session).get_unsummarized_by_file_id(file_id)
+        if not chunks:
+            return
+
+        logger.info(f"Summarizing {len(chunks)} chunks for file {file_id}")
+        summaries = await ChunkSummaryService(get_llm_provider()).summarize(chunks)
+
+        async with async_session() as session:
+            await DocumentChunkRepository(session).update_summaries(summaries)
+        logger.info(f"Stored {len(summaries)} chunk summaries for file {file_id}")
+    except Exception as e:
+        logger.error(f"Error summarizing chunks for file {file_id}: {str(e)}", exc_info=True)
+
+
+def schedule_chunk_summaries(file_id: int) -> None:
+    task = asyncio.create_task(_summarize_file_in_background(file_id))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
@@ -1,8 +1,12 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Annotated
 
+from fastapi import Depends
 from unstructured.documents.elements import Element
 
 from app.core.logging import get_logger
+from app.core.storage import Storage, get_storage
 
 logger = get_logger(__name__)
 
@@ -19,7 +23,14 @@ class BaseContentManager(ABC):
         "new_after_n_chars": 6000,
     }
 
-    def process(self, file_path: str) -> tuple[list[Element], list[str]]:
+    def __init__(self, storage: Annotated[Storage, Depends(get_storage)]) -> None:
+        self.storage = storage
+
+    async def process(self, key: str) -> tuple[list[Element], list[list[str]]]:
+        file_path = await self.storage.fetch(key)
+        return await asyncio.to_thread(self._process_file, str(file_path))
+
+    def _process_file(self, file_path: str) -> tuple[list[Element], list[list[str]]]:
         logger.info(f"Processing document: {file_path}")
         try:
             texts = []
@@ -28,10 +39,11 @@ class BaseContentManager(ABC):
             for el in elements:
                 if el.category == "CompositeElement":
                     texts.append(el)
-            images = self._get_images_base64(file_path, elements)
+            chunk_images = [self._get_chunk_images(text) for text in texts]
 
-            logger.info(f"Processing completed. Extracted {len(texts)} text chunks and {len(images)} images")
-            return texts, images
+            image_count = len({image for images in chunk_images for image in images})
+            logger.info(f"Processing completed. Extracted {len(texts)} text chunks and {image_count} images")
+            return texts, chunk_images
         except Exception as e:
             logger.error(f"Error processing document {file_path}: {str(e)}", exc_info=True)
             raise
@@ -40,6 +52,11 @@ class BaseContentManager(ABC):
     def _partition_document(self, file_path: str) -> list[Element]:
         pass
 
-    @abstractmethod
-    def _get_images_base64(self, file_path: str, elements: list[Element]) -> list[str]:
-        pass
+    @staticmethod
+    def _get_chunk_images(chunk: Element) -> list[str]:
+        images = (
+            image
+            for element in chunk.metadata.orig_elements or []
+            if element.category == "Image" and (image := element.metadata.image_base64)
+        )
+        return list(dict.fromkeys(images))
@@ -1,20 +1,28 @@
+import asyncio
 import json
 import time
 from typing import Annotated, Any
 
 from fastapi import Depends, UploadFile
 
+from app.core.config import settings
+from app.core.deadline import Deadline
+from app.core.exceptions import DeadlineExceededError
 from app.core.logging import get_logger
+from app.modules.files.models import File
 from app.modules.files.repository import FileRepository
 from app.modules.files.schema import FileType
-from app.modules.rag.models import Answer, Image, Question
+from app.modules.rag.exceptions import AudioValidationError
+from app.modules.rag.models import Answer, ChunkImage, DocumentChunk, Image, Question
 from app.modules.rag.repositories.document_chunk import DocumentChunkRepository
 from app.modules.rag.repositories.image import ImageRepository
 from app.modules.rag.repositories.qa import QARepository
 from app.modules.rag.schema import (
     AnswerCreate,
+    AnswerImage,
     AnswerResponse,
     ImageReference,
+    ImageRendition,
     QAPairResponse,
     QAResponse,
     QuestionCreate,
@@ -22,18 +30,27 @@ from app.modules.rag.schema import (
     QuestionResponse,
     QuestionStats,
     RAGResult,
+    RAGStats,
     SourceReference,
+    StoredImage,
 )
 from app.modules.rag.services.audio_processing_service import AudioProcessingService
+from app.modules.rag.services.chunk_image_loader import ChunkImageLoader
+from app.modules.rag.services.chunk_summary_service import schedule_chunk_summaries
 from app.modules.rag.services.docx_content_manager import DOCXContentManager
+from app.modules.rag.services.image_storage_service import ImageStorageService
 from app.modules.rag.services.openai_service import OpenAIService
 from app.modules.rag.services.pdf_content_manager import PDFContentManager
+from app.modules.rag.services.search_results import build_context, build_sources, calculate_confidence
+from app.modules.rag.services.transcription_cache_service import TranscriptionCacheService
 from app.modules.rag.services.vector_store_manager import VectorStoreManager
 
 logger = get_logger(__name__)
 
 
 class DocumentService:
+    _DOCUMENT_TYPES = [FileType.PDF, FileType.DOCX]
+
     def __init__(
         self,
         pdf_manager: Annotated[PDFContentManager, Depends(PDFContentManager)],
@@ -45,6 +62,8 @@ class DocumentService:
         chunk_repository: Annotated[DocumentChunkRepository, Depends(DocumentChunkRepository)],
         image_repository: Annotated[ImageRepository, Depends(ImageRepository)],
         audio_service: Annotated[AudioProcessingService, Depends(AudioProcessingService)],
+        transcription_cache: Annotated[TranscriptionCacheService, Depends(TranscriptionCacheService)],
+        image_storage: Annotated[ImageStorageService, Depends(ImageStorageService)],
     ) -> None:
         self.pdf_manager = pdf_manager
         self.docx_manager = docx_manager
@@ -53,33 +72,31 @@ class DocumentService:
         self.files_repository = files_repository
         self.qa_repository = qa_repository
         self.audio_service = audio_service
+        self.transcription_cache = transcription_cache
         self.chunk_repository = chunk_repository
         self.image_repository = image_repository
+        self.image_storage = image_storage
         self.processed_files = {}
 
     async def process_question(self, question: QuestionRequest, user_id: int = 1) -> AnswerResponse:
         start_time = time.time()
+        deadline = Deadline.from_ms(settings.REQUEST_DEADLINE_MS)
         logger.info(f"Processing question for user {user_id}: {question.question[:100]}...")
 
-        question_record = await self._create_question_record(question, user_id)
-
         try:
-            rag_result = await self._process_rag_query(question.question)
-            processing_time = self._calculate_processing_time(start_time)
-
-            await self._create_answer_record(question_record.id, rag_result, processing_time)
-
-            logger.info(f"Successfully processed question {question_record.id} in {processing_time}ms")
-            return self._build_response(question_record.id, rag_result)
-
+            rag_result = await self._process_rag_query(question.question, deadline, question.use_summaries)
         except Exception as e:
-            processing_time = self._calculate_processing_time(start_time)
-            error_result = self._create_error_result(str(e))
+            logger.error(f"Error processing question for user {user_id}: {str(e)}")
+            await self.qa_repository.rollback()
+            rag_result = self._create_error_result(str(e))
 
-            logger.error(f"Error processing question {question_record.id}: {str(e)}")
-            await self._create_answer_record(question_record.id, error_result, processing_time)
+        processing_time = self._calculate_processing_time(start_time)
+        question_record = await self._create_question_record(question, user_id)
+        await self._create_answer_record(question_record.id, rag_result, processing_time)
+        await self.qa_repository.commit()
 
-            return self._build_response(question_record.id, error_result)
+        logger.info(f"Processed question {question_record.id} in {processing_time}ms")
+        return self._build_response(question_record.id, rag_result)
 
     async def _create_question_record(self, question: QuestionRequest, user_id: int) -> Question:
         return await self.qa_repository.create_question(
@@ -90,31 +107,38 @@ class DocumentService:
             )
         )
 
-    async def _process_rag_query(self, question_text: str) -> RAGResult:
+    async def _process_rag_query(
+        self, question_text: str, deadline: Deadline | None = None, use_summaries: bool = False
+    ) -> RAGResult:
         logger.debug(f"Processing RAG query: {question_text[:100]}...")
-        documents = await self._get_available_documents()
-        logger.debug(f"Found {len(documents)} available documents")
-
-        if not documents:
+        if not await self.files_repository.has_files(self._DOCUMENT_TYPES):
             logger.warning("No documents available for RAG query")
             return self._create_no_documents_result()
 
-        await self._process_documents(documents)
+        await self._schedule_pending_ingestion()
+        deadline = deadline or Deadline()
         logger.debug("Executing vector store search")
-        search_results = await self.vector_store.search(question_text, n_results=5)
+        try:
+            search_results = await self.vector_store.search(question_text, n_results=5, deadline=deadline)
+        except DeadlineExceededError as e:
+            logger.warning(f"{str(e)}, returning timeout result")
+            await self.qa_repository.rollback()
+            return self._create_timeout_result()
 
         if not search_results:
             logger.warning("No search results found in vector store")
             return self._create_no_results_result()
 
         logger.debug(f"Found {len(search_results)} search results, generating RAG response")
-        return await self._generate_rag_response(question_text, search_results)
+        return await self._generate_rag_response(question_text, search_results, deadline, use_summaries)
 
-    async def _get_available_documents(self) -> list:
-        files = await self.files_repository.get_all()
-        documents = [file for file in files if file.file_type in [FileType.PDF, FileType.DOCX]]
-        logger.debug(f"Retrieved {len(documents)} documents (PDF/DOCX) from {len(files)} total files")
-        return documents
+    async def _schedule_pending_ingestion(self) -> None:
+        from app.modules.rag.services.ingestion_service import schedule_ingestion
+
+        pending_file_ids = await self.chunk_repository.get_pending_file_ids(self._DOCUMENT_TYPES)
+        if pending_file_ids:
+            logger.info(f"Scheduling background ingestion of {len(pending_file_ids)} documents without chunks")
+            schedule_ingestion(pending_file_ids)
 
     def _create_no_documents_result(self) -> RAGResult:
         return {
@@ -132,18 +156,58 @@ class DocumentService:
             "confidence_score": 0.0,
         }
 
-    async def _generate_rag_response(self, question_text: str, search_results: list) -> RAGResult:
-        context = self._build_context(search_results)
-        answer_text = self.openai_service.generate_answer(question_text, context)
-        sources = self._build_sources(search_results)
-        images = await self._build_images(search_results)
-        confidence_score = self._calculate_confidence(search_results)
+    def _create_timeout_result(self) -> RAGResult:
+        return {
+            "answer_text": "The request timed out before relevant information could be found.",
+            "sources": [],
+            "images": [],
+            "confidence_score": 0.0,
+            "is_partial": True,
+        }
 
+    def _create_partial_result(
+        self, sources: list[SourceReference], images: list[ImageReference], confidence_score: float
+    ) -> RAGResult:
         return {
-            "answer_text": answer_text,
+            "answer_text": "The answer could not be generated in time. See the sources below for relevant information.",
             "sources": sources,
             "images": images,
             "confidence_score": confidence_score,
+            "is_partial": True,
+        }
+
+    async def _generate_rag_response(
+        self,
+        question_text: str,
+        search_results: list,
+        deadline: Deadline | None = None,
+        use_summaries: bool = False,
+    ) -> RAGResult:
+        deadline = deadline or Deadline()
+        context = build_context(search_results, use_summaries)
+        sources = build_sources(search_results)
+        confidence_score = calculate_confidence(search_results)
+        images: list[ImageReference] = []
+
+        answer_task = asyncio.create_task(self.openai_service.generate_answer(question_text, context, deadline))
+        try:
+            async with deadline.limit("image lookup"):
+                images = await self._build_images(search_results)
+            generated_answer = await answer_task
+        except DeadlineExceededError as e:
+            logger.warning(f"{str(e)}, returning sources-only result")
+            await self.qa_repository.rollback()
+            return self._create_partial_result(sources, images, confidence_score)
+        finally:
+            answer_task.cancel()
+
+        return {
+            "answer_text": generated_answer["answer_text"],
+            "sources": sources,
+            "images": images,
+            "confidence_score": confidence_score,
+            "prompt_tokens": generated_answer["prompt_tokens"],
+            "cached_tokens": generated_answer["cached_tokens"],
         }
 
     def _create_error_result(self, error_message: str) -> RAGResult:
@@ -165,6 +229,8 @@ class DocumentService:
                 confidence_score=rag_result["confidence_score"],
                 sources_used=self._serialize_sources(rag_result["sources"]),
                 processing_time_ms=processing_time,
+                prompt_tokens=rag_result.get("prompt_tokens"),
+                cached_prompt_tokens=rag_result.get("cached_tokens"),
             )
         )
 
@@ -178,93 +244,50 @@ class DocumentService:
             images=rag_result["images"],
             confidence_score=rag_result["confidence_score"],
             question_id=question_id,
+            is_partial=rag_result.get("is_partial", False),
         )
 
     async def get_question_history(self, limit: int = 50) -> list[QAPairResponse]:
-        qa_pairs = await self.qa_repository.get_qa_pairs(limit)
-        result = []
-        for qa_pair in qa_pairs:
-            question_dict = qa_pair[0].model_dump()
-            answer_dict = qa_pair[1].model_dump()
-            if answer_dict.get("processing_time_ms") is not None:
-                answer_dict["processing_time_ms"] = str(answer_dict["processing_time_ms"])
-
-            images = await self._get_images_from_answer(answer_dict.get("sources_used"))
-
-            result.append(
-                QAPairResponse(
-                    question=QuestionResponse.model_validate(question_dict),
-                    answer=QAResponse.model_validate(answer_dict),
-                    images=images,
-                )
-            )
-        return result
+        qa_pairs = await self.qa_repository.get_history(limit)
+        return [self._build_qa_pair(question, answer, images) for question, answer, images in qa_pairs]
 
     async def get_session_history(self, session_id: str) -> list[QAPairResponse]:
-        questions = await self.qa_repository.get_questions_by_session(session_id)
-        qa_pairs = []
-
-        for question in questions:
-            answers = await self.qa_repository.get_answers_by_question_id(question.id)
-            if answers:
-                answer_dict = answers[0].model_dump()
-                if answer_dict.get("processing_time_ms") is not None:
-                    answer_dict["processing_time_ms"] = str(answer_dict["processing_time_ms"])
-
-                images = await self._get_images_from_answer(answer_dict.get("sources_used"))
-
-                qa_pairs.append(
-                    QAPairResponse(
-                        question=QuestionResponse.model_validate(question.model_dump()),
-                        answer=QAResponse.model_validate(answer_dict),
-                        images=images,
-                    )
-                )
-
-        return qa_pairs
-
-    async def _get_images_from_answer(self, sources_used: str | None) -> list[ImageReference]:
-        if not sources_used:
-            return []
-
-        try:
-            sources = json.loads(sources_used)
-        except (json.JSONDecodeError, TypeError):
-            return []
+        qa_pairs = await self.qa_repository.get_session_history(session_id)
+        return [self._build_qa_pair(question, answer, images) for question, answer, images in qa_pairs]
+
+    def _build_qa_pair(self, question: Question, answer: Answer, images: list[AnswerImage]) -> QAPairResponse:
+        answer_dict = answer.model_dump()
+        if answer_dict.get("processing_time_ms") is not None:
+            answer_dict["processing_time_ms"] = str(answer_dict["processing_time_ms"])
+
+        return QAPairResponse(
+            question=QuestionResponse.model_validate(question.model_dump()),
+            answer=QAResponse.model_validate(answer_dict),
+            images=self._to_image_references(images),
+        )
 
-        images = []
+    def _to_image_references(self, images: list[AnswerImage]) -> list[ImageReference]:
+        references = []
         seen_image_ids = set()
 
-        for source in sources:
-            file_id = source.get("file_id")
-            chunk_index = source.get("chunk_index")
-
-            if not file_id or chunk_index is None:
+        for image in images:
+            if image["image_id"] in seen_image_ids:
                 continue
 
-            chunk = await self.chunk_repository.get_by_file_id_and_chunk_index(file_id, chunk_index)
-
-            if not chunk:
-                continue
-
-            chunk_images = await self.image_repository.get_by_chunk_id(chunk.id)
-
-            for img in chunk_images:
-                if img.id in seen_image_ids:
-                    continue
-
-                seen_image_ids.add(img.id)
-                images.append(
-                    ImageReference(
-                        image_path=f"data:image/png;base64,{img.image_data}",
-                        description=img.description
-                        or f"Image from {source.get('filename', 'Unknown')} (chunk {chunk_index})",
-                        page_number=img.page_number or source.get("page_number"),
-                        file_id=file_id,
-                    )
+            seen_image_ids.add(image["image_id"])
+            references.append(
+                ImageReference(
+                    image_id=image["image_id"],
+                    image_path=self.get_image_path(image["image_id"]),
+                    thumbnail_path=self.get_image_path(image["image_id"], ImageRendition.THUMBNAIL),
+                    description=image["description"]
+                    or f"Image from {image['filename'] or 'Unknown'} (chunk {image['chunk_index']})",
+                    page_number=image["page_number"] or image["source_page_number"],
+                    file_id=image["file_id"],
                 )
+            )
 
-        return images[:5]
+        return references[:5]
 
     async def delete_question(self, question_id: int) -> bool:
         return await self.qa_repository.delete_question(question_id)
@@ -272,54 +295,63 @@ class DocumentService:
     async def get_user_stats(self, user_id: int) -> QuestionStats:
         return await self.qa_repository.get_question_stats(user_id)
 
+    async def get_rag_stats(self) -> RAGStats:
+        return await self.qa_repository.get_rag_stats()
+
     async def process_audio_question(
-        self, audio_file: UploadFile, user_id: int = 1, session_id: str = None
+        self, audio_file: UploadFile, user_id: int = 1, session_id: str = None, use_summaries: bool = False
     ) -> AnswerResponse:
         start_time = time.time()
+        deadline = Deadline.from_ms(settings.REQUEST_DEADLINE_MS)
         logger.info(f"Processing audio question for user {user_id}")
 
+        new_transcription = None
         try:
-            audio_data = await audio_file.read()
-            transcribed_text, audio_metadata = await self.audio_service.transcribe_with_openai(
-                audio_data, audio_file.filename
-            )
+            audio_data = await self.audio_service.read_upload(audio_file)
+            cached_transcription = await self.transcription_cache.get(audio_data)
+            if cached_transcription:
+                transcribed_text, audio_metadata = cached_transcription
+            else:
+                transcribed_text, audio_metadata = await self.audio_service.transcribe(audio_data, audio_file.filename)
+                new_transcription = (audio_data, transcribed_text, audio_metadata)
 
             logger.info(f"Transcribed audio: '{transcribed_text[:100]}...'")
 
-            question_record = await self._create_audio_question_record(
-                transcribed_text, user_id, session_id, audio_metadata
-            )
-
-            rag_result = await self._process_rag_query(transcribed_text)
-            processing_time = self._calculate_processing_time(start_time)
-
+            rag_result = await self._process_rag_query(transcribed_text, deadline, use_summaries)
             rag_result["audio_metadata"] = audio_metadata
+            question_text = transcribed_text
 
-            await self._create_answer_record(question_record.id, rag_result, processing_time)
-
-            logger.info(f"Successfully processed audio question {question_record.id} in {processing_time}ms")
-            return self._build_response(question_record.id, rag_result)
-
+        except AudioValidationError:
+            raise
         except Exception as e:
-            processing_time = self._calculate_processing_time(start_time)
-            error_result = self._create_error_result(f"Audio processing failed: {str(e)}")
-
             logger.error(f"Error processing audio question: {str(e)}")
+            await self.qa_repository.rollback()
+            rag_result = self._create_error_result(f"Audio processing failed: {str(e)}")
+            question_text = f"[Audio processing failed: {str(e)}]"
+            audio_metadata = {}
 
-            try:
-                question_record = await self._create_audio_question_record(
-                    f"[Audio processing failed: {str(e)}]", user_id, session_id, {}
-                )
-                await self._create_answer_record(question_record.id, error_result, processing_time)
-                return self._build_response(question_record.id, error_result)
-            except Exception:
-                return AnswerResponse(
-                    answer=f"Failed to process audio question: {str(e)}",
-                    sources=[],
-                    images=[],
-                    confidence_score=0.0,
-                    question_id=0,
-                )
+        processing_time = self._calculate_processing_time(start_time)
+        try:
+            if new_transcription:
+                await self.transcription_cache.set(*new_transcription)
+            question_record = await self._create_audio_question_record(
+                question_text, user_id, session_id, audio_metadata
+            )
+            await self._create_answer_record(question_record.id, rag_result, processing_time)
+            await self.qa_repository.commit()
+        except Exception as e:
+            logger.error(f"Error storing audio question: {str(e)}")
+            await self.qa_repository.rollback()
+            return AnswerResponse(
+                answer=f"Failed to process audio question: {str(e)}",
+                sources=[],
+                images=[],
+                confidence_score=0.0,
+                question_id=0,
+            )
+
+        logger.info(f"Processed audio question {question_record.id} in {processing_time}ms")
+        return self._build_response(question_record.id, rag_result)
 
     async def _create_audio_question_record(
         self,
@@ -339,6 +371,10 @@ class DocumentService:
             )
         )
 
+    async def ingest_file(self, file: File) -> bool:
+        await self._process_documents([file])
+        return await self.chunk_repository.chunk_exists(file.id)
+
     async def _process_documents(self, files: list[Any]) -> None:
         logger.info(f"Processing {len(files)} documents")
         for file in files:
@@ -351,11 +387,20 @@ class DocumentService:
                 continue
 
             try:
+                source_file_id = (
+                    await self.chunk_repository.get_ingested_file_id(file.content_hash) if file.content_hash else None
+                )
+                if source_file_id is not None:
+                    await self._reuse_ingestion(source_file_id, file)
+                    await self.chunk_repository.commit()
+                    self._schedule_chunk_summaries(file.id)
+                    continue
+
                 logger.info(f"Processing file {file.id}: {file.original_filename} (type: {file.file_type})")
                 if file.file_type == FileType.PDF:
-                    texts, images = self.pdf_manager.process(file.file_path)
+                    texts, images = await self.pdf_manager.process(file.file_path)
                 elif file.file_type == FileType.DOCX:
-                    texts, images = self.docx_manager.process(file.file_path)
+                    texts, images = await self.docx_manager.process(file.file_path)
                 else:
                     logger.warning(f"Unsupported file type: {file.file_type} for file {file.original_filename}")
                     continue
@@ -379,8 +424,9 @@ class DocumentService:
                 if documents:
                     logger.debug(f"Adding {len(documents)} document chunks to vector store for file {file.id}")
                     await self.vector_store.add_documents(documents)
-
                     await self._store_images_for_chunks(file.id, texts, images)
+                    await self.chunk_repository.commit()
+                    self._schedule_chunk_summaries(file.id)
 
                 else:
                     logger.warning(f"No documents extracted from file {file.original_filename}")
@@ -390,9 +436,73 @@ class DocumentService:
                     f"Error processing file {file.original_filename} (id: {file.id}): {str(e)}",
                     exc_info=True,
                 )
+                await self.chunk_repository.rollback()
                 continue
 
-    async def _store_images_for_chunks(self, file_id: int, texts: list, images: list) -> None:
+    @staticmethod
+    def _schedule_chunk_summaries(file_id: int) -> None:
+        if settings.CHUNK_SUMMARIES_ENABLED:
+            schedule_chunk_summaries(file_id)
+
+    async def _reuse_ingestion(self, source_file_id: int, file: File) -> None:
+        logger.info(f"Reusing ingestion results of file {source_file_id} for file {file.id} with identical content")
+        source_chunks = await self.chunk_repository.get_by_file_id(source_file_id)
+        chunks = await self.chunk_repository.create_batch(
+            [
+                DocumentChunk(
+                    text=chunk.text,
+                    embedding=chunk.embedding,
+                    file_id=file.id,
+                    chunk_index=chunk.chunk_index,
+                    page_number=chunk.page_number,
+                    chunk_metadata={
+                        **(chunk.chunk_metadata or {}),
+                        "file_id": file.id,
+                        "filename": file.original_filename,
+                    },
+                    summary=chunk.summary,
+                )
+                for chunk in source_chunks
+            ]
+        )
+        source_chunk_indexes = {chunk.id: chunk.chunk_index for chunk in source_chunks}
+        chunk_ids = {chunk.chunk_index: chunk.id for chunk in chunks}
+        source_images = await self.image_repository.get_by_file_id(source_file_id)
+        if not source_images:
+            return
+
+        images = await self.image_repository.create_batch(
+            [
+                Image(
+                    image_data=image.image_data,
+                    content_hash=image.content_hash,
+                    storage_key=image.storage_key,
+                    mime_type=image.mime_type,
+                    file_size=image.file_size,
+                    thumbnail_key=image.thumbnail_key,
+                    width=image.width,
+                    height=image.height,
+                    file_id=file.id,
+                    page_number=image.page_number,
+                    description=image.description,
+                )
+                for image in source_images
+            ]
+        )
+        image_ids = {source.id: image.id for source, image in zip(source_images, images, strict=True)}
+        source_links = await self.image_repository.get_links_by_file_id(source_file_id)
+        links = [
+            ChunkImage(
+                chunk_id=chunk_ids[source_chunk_indexes[link.chunk_id]],
+                image_id=image_ids[link.image_id],
+                image_index=link.image_index,
+            )
+            for link in source_links
+        ]
+        if links:
+            await self.image_repository.create_links(links)
+
+    async def _store_images_for_chunks(self, file_id: int, texts: list, chunk_images: list[list[str]]) -> None:
         try:
             chunks = await self.chunk_repository.get_by_file_id(file_id)
 
@@ -402,131 +512,114 @@ class DocumentService:
 
             chunk_map = {chunk.chunk_index: chunk.id for chunk in chunks}
 
-            images_to_store = []
-            for i, text in enumerate(texts):
-                page_number = getattr(text.metadata, "page_number", None)
-                chunk_id = chunk_map.get(i)
-
-                if not chunk_id:
-                    continue
-
-                chunk_image_list = []
+            first_pages: dict[str, int | None] = {}
+            for text, images in zip(texts, chunk_images, strict=True):
                 for img_b64 in images:
-                    img_page = (
-                        getattr(img_b64, "metadata", {}).get("page_number", None)
-                        if hasattr(img_b64, "metadata")
-                        else None
-                    )
-                    if page_number is None or img_page is None or page_number == img_page:
-                        chunk_image_list.append(img_b64)
-
-                for img_index, img_b64 in enumerate(chunk_image_list):
-                    base64_data = str(img_b64)
-                    if base64_data.startswith("data:image"):
-                        base64_data = base64_data.split(",", 1)[1] if "," in base64_data else base64_data
-
-                    image = Image(
-                        chunk_id=chunk_id,
-                        image_data=base64_data,
+                    first_pages.setdefault(img_b64, getattr(text.metadata, "page_number", None))
+
+            distinct_images = list(first_pages)
+            renditions = await asyncio.gather(*(self.image_storage.render(img_b64) for img_b64 in distinct_images))
+            rendered_images = {
+                img_b64: rendered
+                for img_b64, rendered in zip(distinct_images, renditions, strict=True)
+                if rendered is not None
+            }
+            await self.image_repository.lock_storage_keys(
+                sorted(
+                    {
+                        key
+                        for rendered in rendered_images.values()
+                        for key in (rendered["stored_image"]["storage_key"], rendered["stored_image"]["thumbnail_key"])
+                        if key
+                    }
+                )
+            )
+            stored = await asyncio.gather(
+                *(self.image_storage.store_rendered(rendered) for rendered in rendered_images.values())
+            )
+            stored_images: dict[str, StoredImage] = dict(zip(rendered_images, stored, strict=True))
+            logger.debug(f"Kept {len(stored_images)} of {len(distinct_images)} distinct images for file {file_id}")
+
+            images_by_hash: dict[str, Image] = {}
+            for img_b64, stored_image in stored_images.items():
+                images_by_hash.setdefault(
+                    stored_image["content_hash"],
+                    Image(
+                        content_hash=stored_image["content_hash"],
+                        storage_key=stored_image["storage_key"],
+                        mime_type=stored_image["mime_type"],
+                        file_size=stored_image["file_size"],
+                        thumbnail_key=stored_image.get("thumbnail_key"),
+                        width=stored_image.get("width"),
+                        height=stored_image.get("height"),
+                        description=None,
                         file_id=file_id,
-                        page_number=page_number,
-                        image_index=img_index,
-                        description=f"Image from chunk {i}",
-                    )
-                    images_to_store.append(image)
+                        page_number=first_pages[img_b64],
+                    ),
+                )
 
-            if images_to_store:
-                logger.info(f"Storing {len(images_to_store)} images for file {file_id}")
-                await self.image_repository.create_batch(images_to_store)
-            else:
+            if not images_by_hash:
                 logger.debug(f"No images to store for file {file_id}")
+                return
 
-        except Exception as e:
-            logger.error(f"Error storing images for file {file_id}: {str(e)}", exc_info=True)
-
-    def _build_context(self, search_results: list[dict[str, Any]]) -> str:
-        context_parts = []
-        for result in search_results:
-            context_parts.append(f"Source: {result['metadata'].get('filename', 'Unknown')}\n{result['text']}\n")
-        return "\n".join(context_parts)
-
-    def _build_sources(self, search_results: list[dict[str, Any]]) -> list[SourceReference]:
-        sources = []
-        seen_sources = set()
-        top_results = search_results[:3]
-        relevance_threshold = 0.6
+            logger.info(f"Storing {len(images_by_hash)} images for file {file_id}")
+            await self.image_repository.create_batch(list(images_by_hash.values()))
 
-        for result in top_results:
-            distance = result.get("distance", 1.0)
-            if distance > relevance_threshold:
-                continue
+            links: list[ChunkImage] = []
+            for i, images in enumerate(chunk_images):
+                chunk_id = chunk_map.get(i)
+                if not chunk_id:
+                    continue
 
-            metadata = result["metadata"]
-            file_id = metadata.get("file_id", 0)
-            chunk_index = metadata.get("chunk_index", 0)
-            page_number = metadata.get("page_number")
+                image_ids = dict.fromkeys(
+                    images_by_hash[stored_images[img_b64]["content_hash"]].id
+                    for img_b64 in images
+                    if img_b64 in stored_images
+                )
+                links.extend(
+                    ChunkImage(chunk_id=chunk_id, image_id=image_id, image_index=img_index)
+                    for img_index, image_id in enumerate(image_ids)
+                )
 
-            source_key = (file_id, chunk_index, page_number)
-            if source_key in seen_sources:
-                continue
+            if links:
+                logger.debug(f"Linking {len(links)} chunk images for file {file_id}")
+                await self.image_repository.create_links(links)
 
-            seen_sources.add(source_key)
-            sources.append(
-                SourceReference(
-                    file_id=file_id,
-                    filename=metadata.get("filename", "Unknown"),
-                    page_number=page_number,
-                    chunk_index=chunk_index,
-                    relevance_score=1.0 - distance,
-                )
-            )
-        return sources
+        except Exception as e:
+            logger.error(f"Error storing images for file {file_id}: {str(e)}", exc_info=True)
 
     async def _build_images(self, search_results: list[dict[str, Any]]) -> list[ImageReference]:
-        images = []
-        seen_image_ids = set()
         top_results = search_results[:3]
         min_relevance_score = 0.4
 
-        for result in top_results:
-            distance = result.get("distance", 1.0)
-            relevance_score = 1.0 - distance
-
-            if relevance_score < min_relevance_score:
-                continue
-
-            metadata = result["metadata"]
-            file_id = metadata.get("file_id")
-            chunk_index = metadata.get("chunk_index")
-            filename = metadata.get("filename", "Unknown")
-
-            chunk = await self.chunk_repository.get_by_file_id_and_chunk_index(file_id, chunk_index)
-
-            if not chunk:
-                continue
-
-            chunk_images = await self.image_repository.get_by_chunk_id(chunk.id)
-
-            for img in chunk_images:
-                if img.id in seen_image_ids:
-                    continue
-
-                seen_image_ids.add(img.id)
-                images.append(
-                    ImageReference(
-                        image_path=f"data:image/png;base64,{img.image_data}",
-                        description=img.description or f"Image from {filename} (chunk {chunk_index})",
-                        page_number=img.page_number or metadata.get("page_number"),
-                        file_id=file_id,
-                    )
+        sources = [
+            result["metadata"]
+            for result in top_results
+            if 1.0 - result.get("distance", 1.0) >= min_relevance_score
+            and result["metadata"].get("file_id")
+            and result["metadata"].get("chunk_index") is not None
+        ]
+        loader = ChunkImageLoader(self.chunk_repository, self.image_repository)
+        images_by_position = await loader.load((source["file_id"], source["chunk_index"]) for source in sources)
+
+        return self._to_image_references(
+            [
+                AnswerImage(
+                    image_id=image.id,
+                    description=image.description,
+                    page_number=image.page_number,
+                    file_id=source["file_id"],
+                    chunk_index=source["chunk_index"],
+                    filename=source.get("filename"),
+                    source_page_number=source.get("page_number"),
                 )
+                for source in sources
+                for image in images_by_position[(source["file_id"], source["chunk_index"])]
+            ]
+        )
 
-        return images[:5]
-
-    def _calculate_confidence(self, search_results: list[dict[str, Any]]) -> float:
-        if not search_results:
-            return 0.0
-
-        distances = [result.get("distance", 1.0) for result in search_results]
-        avg_distance = sum(distances) / len(distances)
-        return max(0.0, min(1.0, 1.0 - avg_distance))
+    @staticmethod
+    def get_image_path(image_id: int, rendition: ImageRendition = ImageRendition.DISPLAY) -> str:
+        if rendition == ImageRendition.DISPLAY:
+            return f"/rag/images/{image_id}"
+        return f"/rag/images/{image_id}?rendition={rendition}"
@@ -1,8 +1,9 @@
 import base64
+from collections.abc import Iterator
 
-import docx
-from unstructured.documents.elements import Element
-from unstructured.partition.docx import partition_docx
+from docx.text.paragraph import Paragraph
+from unstructured.documents.elements import Element, ElementMetadata, Image
+from unstructured.partition.docx import DocxPartitionerOptions, partition_docx, register_picture_partitioner
 
 from app.core.logging import get_logger
 from app.modules.rag.services import BaseContentManager
@@ -10,6 +11,27 @@ from app.modules.rag.services import BaseContentManager
 logger = get_logger(__name__)
 
 
+class DOCXPicturePartitioner:
+    _BLIP_XPATH = ".//a:blip/@r:embed"
+
+    @classmethod
+    def iter_elements(cls, paragraph: Paragraph, opts: DocxPartitionerOptions) -> Iterator[Image]:
+        for rel_id in paragraph._p.xpath(cls._BLIP_XPATH):
+            image_part = paragraph.part.related_parts.get(rel_id)
+            if image_part is None:
+                continue
+            yield Image(
+                text="",
+                metadata=ElementMetadata(
+                    image_base64=base64.b64encode(image_part.blob).decode("utf-8"),
+                    image_mime_type=image_part.content_type,
+                ),
+            )
+
+
+register_picture_partitioner(DOCXPicturePartitioner)
+
+
 class DOCXContentManager(BaseContentManager):
     def _partition_document(self, file_path: str) -> list[Element]:
         logger.debug(f"Partitioning DOCX file: {file_path}")
@@ -24,25 +46,3 @@ class DOCXContentManager(BaseContentManager):
         except Exception as e:
             logger.error(f"Error partitioning DOCX file {file_path}: {str(e)}", exc_info=True)
             raise
-
-    def _get_images_base64(self, file_path: str, elements: list[Element]) -> list[str]:
-        logger.debug("Extracting images from DOCX file path")
-        images_b64 = []
-        try:
-            doc = docx.Document(file_path)
-
-            for rel in doc.part.rels.values():
-                if "image" in rel.target_ref:
-                    image_part = rel.target_part
-                    image_bytes = image_part.blob
-                    b64_string = base64.b64encode(image_bytes).decode("utf-8")
-                    images_b64.append(b64_string)
-
-        except Exception as e:
-            logger.error(
-                f"Error extracting images from DOCX {file_path}: {str(e)}",
-                exc_info=True,
-            )
-
-        logger.debug(f"Extracted {len(images_b64)} images from DOCX")
-        return images_b64
@@ -0,0 +1,58 @@
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from PIL import Image as PILImage
+from PIL import UnidentifiedImageError
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.modules.rag.schema import TranscodedImage
+
+logger = get_logger(__name__)
+
+
+def _encode_webp(image: PILImage.Image, max_dimension: int, quality: int) -> tuple[bytes, tuple[int, int]]:
+    rendition = image.copy()
+    rendition.thumbnail((max_dimension, max_dimension), PILImage.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    rendition.save(buffer, format="WEBP", quality=quality, method=4)
+    return buffer.getvalue(), rendition.size
+
+
+def transcode_image(
+    image_data: bytes,
+    min_dimension: int,
+    display_max_dimension: int,
+    thumbnail_max_dimension: int,
+    quality: int,
+) -> TranscodedImage | None:
+    try:
+        with PILImage.open(io.BytesIO(image_data)) as image:
+            image.load()
+            width, height = image.size
+            if min(width, height) < min_dimension:
+                return None
+
+            converted = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P", "PA") else "RGB")
+            display, (display_width, display_height) = _encode_webp(converted, display_max_dimension, quality)
+            thumbnail, _ = _encode_webp(converted, thumbnail_max_dimension, quality)
+            return {
+                "display": display,
+                "thumbnail": thumbnail,
+                "width": display_width,
+                "height": display_height,
+            }
+    except (UnidentifiedImageError, OSError) as e:
+        logger.warning(f"Could not decode extracted image: {str(e)}")
+        return None
+
+
+@lru_cache
+def get_image_pool() -> ProcessPoolExecutor:
+    logger.info(f"Starting image processing pool with {settings.IMAGE_PROCESSING_WORKERS} workers")
+    return ProcessPoolExecutor(
+        max_workers=settings.IMAGE_PROCESSING_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
@@ -0,0 +1,28 @@
+from pathlib import Path
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.modules.rag.models import Image
+from app.modules.rag.repositories.image import ImageRepository
+from app.modules.rag.schema import ImageRendition
+from app.modules.rag.services.image_storage_service import ImageStorageService
+
+
+class ImageService:
+    def __init__(
+        self,
+        image_repository: Annotated[ImageRepository, Depends(ImageRepository)],
+        image_storage: Annotated[ImageStorageService, Depends(ImageStorageService)],
+    ) -> None:
+        self.image_repository = image_repository
+        self.image_storage = image_storage
+
+    async def get_image(self, image_id: int) -> Image | None:
+        return await self.image_repository.get_by_id(image_id)
+
+    async def get_path(self, image: Image, rendition: ImageRendition = ImageRendition.DISPLAY) -> Path | None:
+        return await self.image_storage.get_path(image, rendition)
+
+    async def read(self, image: Image, rendition: ImageRendition = ImageRendition.DISPLAY) -> bytes:
+        return await self.image_storage.read(image, rendition)
@@ -0,0 +1,124 @@
+import asyncio
+import base64
+import hashlib
+import uuid
+from pathlib import Path
+from typing import Annotated
+
+import aiofiles
+from fastapi import Depends
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.storage import Storage, get_storage
+from app.modules.rag.models import Image
+from app.modules.rag.schema import ImageRendition, RenderedImage, StoredImage
+from app.modules.rag.services.image_processing import get_image_pool, transcode_image
+
+logger = get_logger(__name__)
+
+
+class ImageStorageService:
+    _MIME_SIGNATURES = (
+        (b"\x89PNG\r\n\x1a\n", "image/png"),
+        (b"\xff\xd8\xff", "image/jpeg"),
+        (b"GIF87a", "image/gif"),
+        (b"GIF89a", "image/gif"),
+        (b"BM", "image/bmp"),
+    )
+
+    def __init__(self, storage: Annotated[Storage, Depends(get_storage)]) -> None:
+        self.storage = storage
+        self.temp_dir = settings.STORAGE_DIR
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+
+    async def store(self, image_data: bytes) -> StoredImage:
+        content_hash, storage_key = await self._put(image_data)
+        return {
+            "content_hash": content_hash,
+            "storage_key": storage_key,
+            "mime_type": self._detect_mime_type(image_data),
+            "file_size": len(image_data),
+        }
+
+    async def store_base64(self, image_b64: str) -> StoredImage:
+        return await self.store(self._decode_base64(image_b64))
+
+    async def render(self, image_b64: str) -> RenderedImage | None:
+        image_data = self._decode_base64(image_b64)
+        transcoded = await asyncio.get_running_loop().run_in_executor(
+            get_image_pool(),
+            transcode_image,
+            image_data,
+            settings.IMAGE_MIN_DIMENSION,
+            settings.IMAGE_DISPLAY_MAX_DIMENSION,
+            settings.IMAGE_THUMBNAIL_MAX_DIMENSION,
+            settings.IMAGE_WEBP_QUALITY,
+        )
+        if transcoded is None:
+            logger.debug(f"Dropping extracted image of {len(image_data)} bytes")
+            return None
+
+        return {
+            "stored_image": {
+                "content_hash": hashlib.sha256(image_data).hexdigest(),
+                "storage_key": self._get_storage_key(hashlib.sha256(transcoded["display"]).hexdigest()),
+                "mime_type": "image/webp",
+                "file_size": len(transcoded["display"]),
+                "thumbnail_key": self._get_storage_key(hashlib.sha256(transcoded["thumbnail"]).hexdigest()),
+                "width": transcoded["width"],
+                "height": transcoded["height"],
+            },
+            "display": transcoded["display"],
+            "thumbnail": transcoded["thumbnail"],
+        }
+
+    async def store_rendered(self, rendered: RenderedImage) -> StoredImage:
+        await self._put(rendered["display"])
+        await self._put(rendered["thumbnail"])
+        return rendered["stored_image"]
+
+    async def get_path(self, image: Image, rendition: ImageRendition = ImageRendition.DISPLAY) -> Path | None:
+        storage_key = self._get_rendition_key(image, rendition)
+        if not storage_key:
+            return None
+        return await self.storage.fetch(storage_key)
+
+    async def read(self, image: Image, rendition: ImageRendition = ImageRendition.DISPLAY) -> bytes:
+        if path := await self.get_path(image, rendition):
+            return await asyncio.to_thread(path.read_bytes)
+        return base64.b64decode(image.image_data or "")
+
+    async def _put(self, image_data: bytes) -> tuple[str, str]:
+        content_hash = hashlib.sha256(image_data).hexdigest()
+        storage_key = self._get_storage_key(content_hash)
+
+        if not await self.storage.exists(storage_key):
+            temp_path = self.temp_dir / f".{uuid.uuid4()}.part"
+            async with aiofiles.open(temp_path, "wb") as f:
+                await f.write(image_data)
+            await self.storage.put(storage_key, temp_path)
+            logger.debug(f"Stored image {content_hash} ({len(image_data)} bytes)")
+
+        return content_hash, storage_key
+
+    def _get_rendition_key(self, image: Image, rendition: ImageRendition) -> str | None:
+        if rendition == ImageRendition.THUMBNAIL and image.thumbnail_key:
+            return image.thumbnail_key
+        return image.storage_key
+
+    def _decode_base64(self, image_b64: str) -> bytes:
+        if image_b64.startswith("data:image"):
+            image_b64 = image_b64.split(",", 1)[1] if "," in image_b64 else image_b64
+        return base64.b64decode(image_b64)
+
+    def _get_storage_key(self, content_hash: str) -> str:
+        return f"images/{content_hash[:2]}/{content_hash}"
+
+    def _detect_mime_type(self, image_data: bytes) -> str:
+        if image_data[:4] == b"RIFF" and image_data[8:12] == b"WEBP":
+            return "image/webp"
+        for signature, mime_type in self._MIME_SIGNATURES:
+            if image_data.startswith(signature):
+                return mime_type
+        return "application/octet-stream"
@@ -0,0 +1,104 @@
+import asyncio
+import uuid
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.logging import get_logger
+from app.core.storage import get_storage
+from app.modules.files.repository import FileRepository
+from app.modules.rag.repositories.document_chunk import DocumentChunkRepository
+from app.modules.rag.repositories.image import ImageRepository
+from app.modules.rag.repositories.qa import QARepository
+from app.modules.rag.repositories.transcription_cache import TranscriptionCacheRepository
+from app.modules.rag.schema import IngestionJob, IngestionJobStatus
+from app.modules.rag.services.audio_processing_service import AudioProcessingService
+from app.modules.rag.services.document_service import DocumentService
+from app.modules.rag.services.docx_content_manager import DOCXContentManager
+from app.modules.rag.services.image_storage_service import ImageStorageService
+from app.modules.rag.services.llm_provider import get_llm_provider
+from app.modules.rag.services.openai_service import OpenAIService
+from app.modules.rag.services.pdf_content_manager import PDFContentManager
+from app.modules.rag.services.transcription_cache_service import TranscriptionCacheService
+from app.modules.rag.services.vector_store_manager import VectorStoreManager
+
+logger = get_logger(__name__)
+
+ingestion_jobs: LRUCache[IngestionJob] = LRUCache(settings.INGESTION_JOB_HISTORY_SIZE)
+
+_background_tasks: set[asyncio.Task[None]] = set()
+_scheduled_file_ids: set[int] = set()
+
+
+def get_ingestion_job(job_id: str) -> IngestionJob | None:
+    return ingestion_jobs.get(job_id)
+
+
+def _build_document_service(session: AsyncSession) -> DocumentService:
+    storage = get_storage()
+    return DocumentService(
+        pdf_manager=PDFContentManager(storage),
+        docx_manager=DOCXContentManager(storage),
+        vector_store=VectorStoreManager(DocumentChunkRepository(session)),
+        openai_service=OpenAIService(get_llm_provider()),
+        files_repository=FileRepository(session),
+        qa_repository=QARepository(session),
+        chunk_repository=DocumentChunkRepository(session),
+        image_repository=ImageRepository(session),
+        audio_service=AudioProcessingService(),
+        transcription_cache=TranscriptionCacheService(TranscriptionCacheRepository(session)),
+        image_storage=ImageStorageService(storage),
+    )
+
+
+async def _ingest_files_in_background(jobs: list[IngestionJob]) -> None:
+    try:
+        async with async_session() as session:
+            files_repository = FileRepository(session)
+            document_service = _build_document_service(session)
+            files = {file.id: file for file in await files_repository.get_by_ids([job.file_id for job in jobs])}
+
+            for job in jobs:
+                file = files.get(job.file_id)
+                if file is None:
+                    job.status = IngestionJobStatus.FAILED
+                    job.error = "File not found"
+                    continue
+
+                job.status = IngestionJobStatus.RUNNING
+                if await document_service.ingest_file(file):
+                    job.status = IngestionJobStatus.COMPLETED
+                else:
+                    job.status = IngestionJobStatus.FAILED
+                    job.error = "No content could be extracted from the file"
+                logger.info(f"Ingestion job {job.job_id} for file {job.file_id} finished with status {job.status}")
+    except Exception as e:
+        logger.error(f"Error running ingestion jobs: {str(e)}", exc_info=True)
+        for job in jobs:
+            if job.status in (IngestionJobStatus.QUEUED, IngestionJobStatus.RUNNING):
+                job.status = IngestionJobStatus.FAILED
+                job.error = str(e)
+    finally:
+        _scheduled_file_ids.difference_update(job.file_id for job in jobs)
+
+
+def schedule_ingestion(file_ids: list[int]) -> dict[int, str]:
+    jobs = [
+        IngestionJob(job_id=str(uuid.uuid4()), file_id=file_id)
+        for file_id in dict.fromkeys(file_ids)
+        if file_id not in _scheduled_file_ids
+    ]
+    if not jobs:
+        return {}
+
+    for job in jobs:
+        ingestion_jobs.set(job.job_id, job)
+        _scheduled_file_ids.add(job.file_id)
+
+    task = asyncio.create_task(_ingest_files_in_background(jobs))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    logger.info(f"Scheduled ingestion of {len(jobs)} files")
+    return {job.file_id: job.job_id for job in jobs}
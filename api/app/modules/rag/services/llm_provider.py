@@ -0,0 +1,156 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+import openai
+from openai.types.chat import ChatCompletion, ChatCompletionMessageParam
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.modules.rag.schema import LLMBatchResult, LLMProviderType
+
+logger = get_logger(__name__)
+
+
+class LLMProvider(ABC):
+    model: str
+
+    @abstractmethod
+    async def complete(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        max_tokens: int,
+        temperature: float,
+    ) -> ChatCompletion:
+        pass
+
+    @abstractmethod
+    async def complete_batch(
+        self,
+        batch: list[list[ChatCompletionMessageParam]],
+        max_tokens: int,
+        temperature: float,
+    ) -> LLMBatchResult:
+        pass
+
+    async def _complete_concurrently(
+        self,
+        batch: list[list[ChatCompletionMessageParam]],
+        max_tokens: int,
+        temperature: float,
+    ) -> LLMBatchResult:
+        semaphore = asyncio.Semaphore(settings.LLM_BATCH_CONCURRENCY)
+
+        async def complete_one(messages: list[ChatCompletionMessageParam]) -> ChatCompletion | None:
+            async with semaphore:
+                try:
+                    return await self.complete(messages, max_tokens, temperature)
+                except Exception as e:
+                    logger.error(f"Batch completion request failed: {str(e)}")
+                    return None
+
+        responses = await asyncio.gather(*(complete_one(messages) for messages in batch))
+        return {"batch_id": None, "responses": list(responses)}
+
+
+class OpenAIProvider(LLMProvider):
+    _BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+    def __init__(self, api_key: str, model: str, base_url: str | None = None) -> None:
+        logger.info(f"Initializing OpenAIProvider with model: {model}, base_url: {base_url or 'default'}")
+        self.model = model
+        self.client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+    async def complete(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        max_tokens: int,
+        temperature: float,
+    ) -> ChatCompletion:
+        return await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+
+    async def complete_batch(
+        self,
+        batch: list[list[ChatCompletionMessageParam]],
+        max_tokens: int,
+        temperature: float,
+    ) -> LLMBatchResult:
+        if not batch:
+            return {"batch_id": None, "responses": []}
+
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": str(index),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model,
+                        "messages": messages,
+                        "max_tokens": max_tokens,
+                        "temperature": temperature,
+                    },
+                }
+            )
+            for index, messages in enumerate(batch)
+        ]
+        input_file = await self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode()),
+            purpose="batch",
+        )
+        batch_job = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted batch {batch_job.id} with {len(batch)} requests")
+
+        while batch_job.status not in self._BATCH_TERMINAL_STATUSES:
+            await asyncio.sleep(settings.LLM_BATCH_POLL_INTERVAL_SECONDS)
+            batch_job = await self.client.batches.retrieve(batch_job.id)
+            logger.debug(f"Batch {batch_job.id} status: {batch_job.status}")
+
+        responses: list[ChatCompletion | None] = [None] * len(batch)
+        if batch_job.status != "completed" or not batch_job.output_file_id:
+            logger.error(f"Batch {batch_job.id} finished with status: {batch_job.status}")
+            return {"batch_id": batch_job.id, "responses": responses}
+
+        output = await self.client.files.content(batch_job.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                logger.warning(f"Batch request {record.get('custom_id')} failed: {record.get('error')}")
+                continue
+            responses[int(record["custom_id"])] = ChatCompletion.model_validate(response["body"])
+
+        return {"batch_id": batch_job.id, "responses": responses}
+
+
+class LocalLLMProvider(OpenAIProvider):
+    def __init__(self, base_url: str, model: str) -> None:
+        super().__init__(api_key="local", model=model, base_url=base_url)
+
+    async def complete_batch(
+        self,
+        batch: list[list[ChatCompletionMessageParam]],
+        max_tokens: int,
+        temperature: float,
+    ) -> LLMBatchResult:
+        return await self._complete_concurrently(batch, max_tokens, temperature)
+
+
+@lru_cache
+def get_llm_provider() -> LLMProvider:
+    provider_type = LLMProviderType(settings.LLM_PROVIDER)
+    if provider_type == LLMProviderType.LOCAL:
+        return LocalLLMProvider(base_url=settings.LOCAL_LLM_BASE_URL, model=settings.CHAT_MODEL)
+    return OpenAIProvider(api_key=settings.OPENAI_API_KEY, model=settings.CHAT_MODEL)
@@ -0,0 +1,39 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.modules.rag.services.audio_preprocessing import decode_audio
+
+logger = get_logger(__name__)
+
+_model: Any = None
+
+
+def _load_model(model_size: str) -> None:
+    global _model
+    import whisper
+
+    _model = whisper.load_model(model_size, device="cpu")
+
+
+def transcribe(audio_data: bytes, language: str) -> str:
+    result = _model.transcribe(decode_audio(audio_data), language=language, fp16=False)
+    text: str = result["text"]
+    return text.strip()
+
+
+@lru_cache
+def get_whisper_pool() -> ProcessPoolExecutor:
+    logger.info(
+        f"Starting local Whisper pool with {settings.LOCAL_WHISPER_WORKERS} workers, "
+        f"model: {settings.LOCAL_WHISPER_MODEL}"
+    )
+    return ProcessPoolExecutor(
+        max_workers=settings.LOCAL_WHISPER_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_load_model,
+        initargs=(settings.LOCAL_WHISPER_MODEL,),
+    )
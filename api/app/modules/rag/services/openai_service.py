@@ -1,28 +1,147 @@
-import openai
+import asyncio
+import time
+from typing import Annotated
+
+from fastapi import Depends
+from openai.types.chat import ChatCompletion, ChatCompletionMessageParam
 
 from app.core.config import settings
+from app.core.deadline import Deadline
+from app.core.latency import LatencyTracker
 from app.core.logging import get_logger
+from app.modules.rag.schema import GeneratedAnswer, GeneratedAnswerBatch, PromptLayout
+from app.modules.rag.services.llm_provider import LLMProvider, get_llm_provider
 
 logger = get_logger(__name__)
 
+llm_latency = LatencyTracker()
+
 
 class OpenAIService:
-    def __init__(self) -> None:
-        logger.info(f"Initializing OpenAIService with model: {settings.CHAT_MODEL}")
-        self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+    _CACHE_FRIENDLY_SYSTEM_PROMPT = (
+        "You are a helpful assistant that answers questions using the provided context.\n"
+        "Use all available information to give the most accurate, complete, and helpful answer possible.\n"
+        "If the context gives indirect or partial clues, infer a reasonable answer.\n"
+        "Only say there is not enough information if the context contains absolutely no related details.\n"
+        "Be specific, factual, and confident in your reasoning.\n"
+        "\n"
+        "Instructions:\n"
+        "- Use relevant details from the context to form your answer.\n"
+        "- If the context partially addresses the question, summarize or infer what can be reasonably concluded.\n"
+        "- Only state that information is missing if the context truly contains none related to the question.\n"
+        "- Avoid generic disclaimers; provide the best possible, context-based response.\n"
+        "- Be concise but complete."
+    )
 
-    def generate_answer(self, question: str, context: str) -> str:
+    def __init__(self, provider: Annotated[LLMProvider, Depends(get_llm_provider)]) -> None:
+        logger.info(f"Initializing OpenAIService with model: {provider.model}")
+        self.provider = provider
+        self.prompt_layout = PromptLayout(settings.PROMPT_LAYOUT)
+
+    async def generate_answer(self, question: str, context: str, deadline: Deadline | None = None) -> GeneratedAnswer:
         logger.info(f"Generating answer for question: {question[:100]}...")
-        logger.debug(f"Context length: {len(context)} characters")
+        logger.debug(f"Context length: {len(context)} characters, prompt layout: {self.prompt_layout}")
+        deadline = deadline or Deadline()
         try:
-            system_prompt = """You are a helpful assistant that answers questions using the provided context.
+            async with deadline.limit("answer generation"):
+                response = await self._complete_hedged(self._build_messages(question, context))
+
+            answer = response.choices[0].message.content or ""
+            prompt_tokens, cached_tokens = self._extract_prompt_usage(response)
+            logger.info(f"Answer generated successfully. Length: {len(answer)} characters")
+            logger.debug(
+                f"Tokens used: {response.usage.total_tokens if response.usage else 'N/A'}, "
+                f"cached prompt tokens: {cached_tokens if cached_tokens is not None else 'N/A'}"
+            )
+            return {
+                "answer_text": answer,
+                "prompt_tokens": prompt_tokens,
+                "cached_tokens": cached_tokens,
+            }
+        except Exception as e:
+            logger.error(f"Error generating answer with OpenAI: {str(e)}", exc_info=True)
+            raise
+
+    async def generate_answers_batch(self, prompts: list[tuple[str, str]]) -> GeneratedAnswerBatch:
+        logger.info(f"Generating {len(prompts)} answers as a batch")
+        result = await self.provider.complete_batch(
+            [self._build_messages(question, context) for question, context in prompts],
+            max_tokens=settings.MAX_TOKENS,
+            temperature=0.7,
+        )
+
+        answers: list[GeneratedAnswer | None] = []
+        for response in result["responses"]:
+            if response is None:
+                answers.append(None)
+                continue
+            prompt_tokens, cached_tokens = self._extract_prompt_usage(response)
+            answers.append(
+                GeneratedAnswer(
+                    answer_text=response.choices[0].message.content or "",
+                    prompt_tokens=prompt_tokens,
+                    cached_tokens=cached_tokens,
+                )
+            )
+
+        logger.info(f"Batch {result['batch_id'] or 'local'} completed with {answers.count(None)} failed requests")
+        return {"batch_id": result["batch_id"], "answers": answers}
+
+    async def _complete_hedged(self, messages: list[ChatCompletionMessageParam]) -> ChatCompletion:
+        primary = asyncio.create_task(self._complete(messages))
+        tasks = {primary}
+        try:
+            if not settings.LLM_HEDGING_ENABLED:
+                return await primary
+
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay())
+            if not done:
+                logger.info("LLM request exceeded hedge delay, sending hedged request")
+                tasks.add(asyncio.create_task(self._complete(messages)))
+
+            while True:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not tasks:
+                    return done.pop().result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _complete(self, messages: list[ChatCompletionMessageParam]) -> ChatCompletion:
+        started_at = time.monotonic()
+        response = await self.provider.complete(
+            messages=messages,
+            max_tokens=settings.MAX_TOKENS,
+            temperature=0.7,
+        )
+        llm_latency.record(time.monotonic() - started_at)
+        return response
+
+    def _hedge_delay(self) -> float:
+        default_delay = settings.LLM_HEDGE_DELAY_MS / 1000
+        if len(llm_latency) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return default_delay
+        observed_delay = llm_latency.percentile(settings.LLM_HEDGE_PERCENTILE)
+        return observed_delay if observed_delay is not None else default_delay
+
+    def _build_messages(self, question: str, context: str) -> list[ChatCompletionMessageParam]:
+        if self.prompt_layout == PromptLayout.CACHE_FRIENDLY:
+            return [
+                {"role": "system", "content": self._CACHE_FRIENDLY_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Context:\n{context}\n\nQuestion:\n{question}"},
+            ]
+
+        system_prompt = """You are a helpful assistant that answers questions using the provided context.
             Use all available information to give the most accurate, complete, and helpful answer possible.
             If the context gives indirect or partial clues, infer a reasonable answer.
             Only say there is not enough information if the context contains absolutely no related details.
             Be specific, factual, and confident in your reasoning.
             """
 
-            user_prompt = f"""Context:
+        user_prompt = f"""Context:
             {context}
 
             Question:
@@ -36,20 +155,15 @@ class OpenAIService:
             - Be concise but complete.
             """
 
-            response = self.client.chat.completions.create(
-                model=settings.CHAT_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                max_tokens=settings.MAX_TOKENS,
-                temperature=0.7,
-            )
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
 
-            answer = response.choices[0].message.content
-            logger.info(f"Answer generated successfully. Length: {len(answer)} characters")
-            logger.debug(f"Tokens used: {response.usage.total_tokens if hasattr(response, 'usage') else 'N/A'}")
-            return answer
-        except Exception as e:
-            logger.error(f"Error generating answer with OpenAI: {str(e)}", exc_info=True)
-            raise
+    def _extract_prompt_usage(self, response: ChatCompletion) -> tuple[int | None, int | None]:
+        if not response.usage:
+            return None, None
+
+        details = getattr(response.usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None) if details else None
+        return response.usage.prompt_tokens, cached_tokens
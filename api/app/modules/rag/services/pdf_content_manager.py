@@ -17,24 +17,3 @@ class PDFContentManager(BaseContentManager):
         except Exception as e:
             logger.error(f"Error partitioning PDF file {file_path}: {str(e)}", exc_info=True)
             raise
-
-    def _get_images_base64(self, file_path: str, elements: list[Element]) -> list[str]:
-        logger.debug("Extracting images from PDF document elements")
-        images_b64 = []
-        for chunk in elements:
-            if chunk.category == "CompositeElement":
-                chunk_elements = chunk.metadata.orig_elements
-                for element in chunk_elements:
-                    if element.category == "Image" and getattr(element.metadata, "image_base64", None):
-                        images_b64.append(element.metadata.image_base64)
-
-        for element in elements:
-            if (
-                element.category == "Image"
-                and getattr(element.metadata, "image_base64", None)
-                and element.metadata.image_base64 not in images_b64
-            ):
-                images_b64.append(element.metadata.image_base64)
-
-        logger.debug(f"Extracted {len(images_b64)} images from PDF elements")
-        return list(set(images_b64))
@@ -0,0 +1,66 @@
+from typing import Any
+
+from app.core.config import settings
+from app.modules.rag.schema import PromptLayout, SourceReference
+
+
+def build_context(search_results: list[dict[str, Any]], use_summaries: bool = False) -> str:
+    best_result = min(search_results, key=lambda result: result.get("distance", 1.0)) if search_results else None
+    if PromptLayout(settings.PROMPT_LAYOUT) == PromptLayout.CACHE_FRIENDLY:
+        search_results = sorted(
+            search_results,
+            key=lambda result: (
+                result["metadata"].get("file_id") or 0,
+                result["metadata"].get("chunk_index") or 0,
+            ),
+        )
+
+    context_parts = []
+    for result in search_results:
+        text = result["text"]
+        if use_summaries and result is not best_result and result.get("summary"):
+            text = result["summary"]
+        context_parts.append(f"Source: {result['metadata'].get('filename', 'Unknown')}\n{text}\n")
+    return "\n".join(context_parts)
+
+
+def build_sources(search_results: list[dict[str, Any]]) -> list[SourceReference]:
+    sources = []
+    seen_sources = set()
+    top_results = search_results[:3]
+    relevance_threshold = 0.6
+
+    for result in top_results:
+        distance = result.get("distance", 1.0)
+        if distance > relevance_threshold:
+            continue
+
+        metadata = result["metadata"]
+        file_id = metadata.get("file_id", 0)
+        chunk_index = metadata.get("chunk_index", 0)
+        page_number = metadata.get("page_number")
+
+        source_key = (file_id, chunk_index, page_number)
+        if source_key in seen_sources:
+            continue
+
+        seen_sources.add(source_key)
+        sources.append(
+            SourceReference(
+                file_id=file_id,
+                filename=metadata.get("filename", "Unknown"),
+                page_number=page_number,
+                chunk_index=chunk_index,
+                relevance_score=1.0 - distance,
+            )
+        )
+    return sources
+
+
+def calculate_confidence(search_results: list[dict[str, Any]]) -> float:
+    if not search_results:
+        return 0.0
+
+    distances = [float(result.get("distance", 1.0)) for result in search_results]
+    avg_distance = sum(distances) / len(distances)
+    return max(0.0, min(1.0, 1.0 - avg_distance))
@@ -0,0 +1,66 @@
+import hashlib
+from typing import Annotated, Any
+
+from fastapi import Depends
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.modules.rag.models import TranscriptionCache
+from app.modules.rag.repositories.transcription_cache import TranscriptionCacheRepository
+from app.modules.rag.schema import TranscriptionBackend
+
+logger = get_logger(__name__)
+
+transcription_memory_cache: LRUCache[tuple[str, dict[str, Any]]] = LRUCache(settings.TRANSCRIPTION_CACHE_MEMORY_SIZE)
+
+
+class TranscriptionCacheService:
+    def __init__(
+        self,
+        repository: Annotated[TranscriptionCacheRepository, Depends(TranscriptionCacheRepository)],
+    ) -> None:
+        self.repository = repository
+
+    async def get(self, audio_data: bytes) -> tuple[str, dict[str, Any]] | None:
+        if not settings.TRANSCRIPTION_CACHE_ENABLED:
+            return None
+
+        key = self._build_key(audio_data)
+        cached = transcription_memory_cache.get(key)
+        if cached:
+            logger.info(f"Transcription cache hit (memory) for audio {key[0][:12]}")
+            return cached
+
+        entry = await self.repository.get(*key)
+        if not entry:
+            logger.debug(f"Transcription cache miss for audio {key[0][:12]}")
+            return None
+
+        logger.info(f"Transcription cache hit (database) for audio {key[0][:12]}")
+        cached = (entry.transcript_text, {**(entry.audio_metadata or {}), "cached": True})
+        transcription_memory_cache.set(key, cached)
+        return cached
+
+    async def set(self, audio_data: bytes, transcript_text: str, audio_metadata: dict[str, Any]) -> None:
+        if not settings.TRANSCRIPTION_CACHE_ENABLED:
+            return
+
+        audio_hash, model, language = key = self._build_key(audio_data)
+        await self.repository.create(
+            TranscriptionCache(
+                audio_hash=audio_hash,
+                model=model,
+                language=language,
+                transcript_text=transcript_text,
+                audio_metadata=audio_metadata,
+            )
+        )
+        transcription_memory_cache.set(key, (transcript_text, {**audio_metadata, "cached": True}))
+
+    def _build_key(self, audio_data: bytes) -> tuple[str, str, str]:
+        if TranscriptionBackend(settings.TRANSCRIPTION_BACKEND) == TranscriptionBackend.LOCAL:
+            model = f"local:{settings.LOCAL_WHISPER_MODEL}"
+        else:
+            model = settings.TRANSCRIPTION_MODEL
+        return hashlib.sha256(audio_data).hexdigest(), model, settings.TRANSCRIPTION_LANGUAGE
@@ -1,8 +1,10 @@
+import asyncio
 from typing import Annotated, Any
 
 import numpy as np
 from fastapi import Depends
 
+from app.core.deadline import Deadline
 from app.core.logging import get_logger
 from app.modules.rag.models import DocumentChunk
 from app.modules.rag.repositories.document_chunk import DocumentChunkRepository
@@ -69,42 +71,15 @@ class VectorStoreManager:
             logger.error(f"Error adding documents to vector store: {str(e)}", exc_info=True)
             raise
 
-    async def search(self, query: str, n_results: int = 5) -> list[dict[str, Any]]:
+    async def search(self, query: str, n_results: int = 5, deadline: Deadline | None = None) -> list[dict[str, Any]]:
         logger.info(f"Searching vector store for query: {query[:100]}..., n_results: {n_results}")
+        deadline = deadline or Deadline()
         try:
-            query_embedding = self.embedding_model.encode([query])[0].tolist()
+            async with deadline.limit("query embedding"):
+                query_embedding = await asyncio.to_thread(self._embed_query, query)
 
-            chunks = await self._repository.search_by_embedding(query_embedding, n_results)
-
-            search_results = []
-            for chunk in chunks:
-                embedding_array = np.array(chunk.embedding)
-                query_array = np.array(query_embedding)
-                cosine_sim = np.dot(embedding_array, query_array) / (
-                    np.linalg.norm(embedding_array) * np.linalg.norm(query_array)
-                )
-                distance = 1.0 - cosine_sim
-
-                if chunk.chunk_metadata:
-                    metadata = chunk.chunk_metadata.copy()
-                    metadata.setdefault("file_id", chunk.file_id)
-                    metadata.setdefault("chunk_index", chunk.chunk_index)
-                    metadata.setdefault("page_number", chunk.page_number)
-                else:
-                    metadata = {
-                        "file_id": chunk.file_id,
-                        "filename": None,
-                        "chunk_index": chunk.chunk_index,
-                        "page_number": chunk.page_number,
-                    }
-
-                search_results.append(
-                    {
-                        "text": chunk.text,
-                        "metadata": metadata,
-                        "distance": float(distance),
-                    }
-                )
+            async with deadline.limit("vector search"):
+                search_results = await self.search_by_embedding(query_embedding, n_results)
 
             result_count = len(search_results)
             logger.info(f"Vector search completed. Found {result_count} results")
@@ -115,3 +90,46 @@ class VectorStoreManager:
         except Exception as e:
             logger.error(f"Error searching vector store: {str(e)}", exc_info=True)
             raise
+
+    async def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        logger.info(f"Embedding {len(queries)} queries")
+        return await asyncio.to_thread(lambda: self.embedding_model.encode(queries).tolist())
+
+    async def search_by_embedding(self, query_embedding: list[float], n_results: int = 5) -> list[dict[str, Any]]:
+        chunks = await self._repository.search_by_embedding(query_embedding, n_results)
+
+        search_results = []
+        for chunk in chunks:
+            embedding_array = np.array(chunk.embedding)
+            query_array = np.array(query_embedding)
+            cosine_sim = np.dot(embedding_array, query_array) / (
+                np.linalg.norm(embedding_array) * np.linalg.norm(query_array)
+            )
+            distance = 1.0 - cosine_sim
+
+            if chunk.chunk_metadata:
+                metadata = chunk.chunk_metadata.copy()
+                metadata.setdefault("file_id", chunk.file_id)
+                metadata.setdefault("chunk_index", chunk.chunk_index)
+                metadata.setdefault("page_number", chunk.page_number)
+            else:
+                metadata = {
+                    "file_id": chunk.file_id,
+                    "filename": None,
+                    "chunk_index": chunk.chunk_index,
+                    "page_number": chunk.page_number,
+                }
+
+            search_results.append(
+                {
+                    "text": chunk.text,
+                    "summary": chunk.summary,
+                    "metadata": metadata,
+                    "distance": float(distance),
+                }
+            )
+        return search_results
+
+    def _embed_query(self, query: str) -> list[float]:
+        embedding: list[float] = self.embedding_model.encode([query])[0].tolist()
+        return embedding
@@ -1,28 +1,48 @@
+from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Form, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import FileResponse as FileStreamResponse
+from fastapi.responses import Response
 
 from app.core.schema import MessageResponse
 from app.modules.auth.middleware import get_current_admin_user, get_current_user
 from app.modules.auth.models import User
 from app.modules.rag.schema import (
     AnswerResponse,
+    ImageReference,
+    ImageRendition,
+    IngestionJob,
     QAPairResponse,
     QuestionRequest,
     QuestionStats,
+    RAGStats,
 )
-from app.modules.rag.services import DocumentService
+from app.modules.rag.services import DocumentService, ImageService
+from app.modules.rag.services.ingestion_service import get_ingestion_job
 
 router = APIRouter(prefix="/rag", tags=["RAG"])
 
+_IMAGE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+def _resolve_image_urls(http_request: Request, images: list[ImageReference]) -> None:
+    base_url = str(http_request.base_url).rstrip("/")
+    for image in images:
+        image.image_path = f"{base_url}{DocumentService.get_image_path(image.image_id)}"
+        image.thumbnail_path = f"{base_url}{DocumentService.get_image_path(image.image_id, ImageRendition.THUMBNAIL)}"
+
 
 @router.post("/ask")
 async def ask_question(
     request: QuestionRequest,
     current_user: Annotated[User, Depends(get_current_user)],
     document_service: Annotated[DocumentService, Depends(DocumentService)],
+    http_request: Request,
 ) -> AnswerResponse:
-    return await document_service.process_question(request, current_user.id)
+    response = await document_service.process_question(request, current_user.id)
+    _resolve_image_urls(http_request, response.images)
+    return response
 
 
 @router.post("/ask-voice")
@@ -30,18 +50,26 @@ async def ask_voice_question(
     audio_file: UploadFile,
     current_user: Annotated[User, Depends(get_current_user)],
     document_service: Annotated[DocumentService, Depends(DocumentService)],
+    http_request: Request,
     session_id: str | None = Form(None),
+    use_summaries: bool = Form(False),
 ) -> AnswerResponse:
-    return await document_service.process_audio_question(audio_file, current_user.id, session_id)
+    response = await document_service.process_audio_question(audio_file, current_user.id, session_id, use_summaries)
+    _resolve_image_urls(http_request, response.images)
+    return response
 
 
 @router.get("/history")
 async def get_question_history(
     current_user: Annotated[User, Depends(get_current_admin_user)],
     document_service: Annotated[DocumentService, Depends(DocumentService)],
+    http_request: Request,
     limit: int = Query(default=50, le=100),
 ) -> list[QAPairResponse]:
-    return await document_service.get_question_history(limit)
+    qa_pairs = await document_service.get_question_history(limit)
+    for qa_pair in qa_pairs:
+        _resolve_image_urls(http_request, qa_pair.images)
+    return qa_pairs
 
 
 @router.get("/session/{session_id}", response_model=list[QAPairResponse])
@@ -49,8 +77,37 @@ async def get_session_history(
     session_id: str,
     current_user: Annotated[User, Depends(get_current_admin_user)],
     document_service: Annotated[DocumentService, Depends(DocumentService)],
+    http_request: Request,
 ) -> list[QAPairResponse]:
-    return await document_service.get_session_history(session_id)
+    qa_pairs = await document_service.get_session_history(session_id)
+    for qa_pair in qa_pairs:
+        _resolve_image_urls(http_request, qa_pair.images)
+    return qa_pairs
+
+
+@router.get("/images/{image_id}")
+async def get_image(
+    image_id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    image_service: Annotated[ImageService, Depends(ImageService)],
+    http_request: Request,
+    rendition: ImageRendition = ImageRendition.DISPLAY,
+) -> Response:
+    image = await image_service.get_image(image_id)
+
+    if not image:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Image not found")
+
+    headers = {"Cache-Control": _IMAGE_CACHE_CONTROL}
+    if image.content_hash:
+        headers["ETag"] = f'"{image.content_hash}-{rendition}"'
+        if http_request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    if path := await image_service.get_path(image, rendition):
+        return FileStreamResponse(path, media_type=image.mime_type, headers=headers)
+
+    return Response(content=await image_service.read(image, rendition), media_type=image.mime_type, headers=headers)
 
 
 @router.delete("/question/{question_id}")
@@ -73,3 +130,24 @@ async def get_user_stats(
     document_service: Annotated[DocumentService, Depends(DocumentService)],
 ) -> QuestionStats:
     return await document_service.get_user_stats(current_user.id)
+
+
+@router.get("/stats/overview")
+async def get_rag_stats(
+    current_user: Annotated[User, Depends(get_current_admin_user)],
+    document_service: Annotated[DocumentService, Depends(DocumentService)],
+) -> RAGStats:
+    return await document_service.get_rag_stats()
+
+
+@router.get("/ingestion-jobs/{job_id}")
+async def get_ingestion_job_status(
+    job_id: str,
+    current_user: Annotated[User, Depends(get_current_admin_user)],
+) -> IngestionJob:
+    job = get_ingestion_job(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+
+    return job
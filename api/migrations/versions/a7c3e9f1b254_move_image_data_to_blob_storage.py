@@ -0,0 +1,44 @@
+"""move_image_data_to_blob_storage
+
+Revision ID: a7c3e9f1b254
+Revises: f2b6d8e4a190
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9f1b254"
+down_revision: Union[str, Sequence[str], None] = "f2b6d8e4a190"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("images", sa.Column("content_hash", sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column("images", sa.Column("storage_key", sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column(
+        "images",
+        sa.Column("mime_type", sqlmodel.sql.sqltypes.AutoString(), nullable=False, server_default="image/png"),
+    )
+    op.add_column("images", sa.Column("file_size", sa.Integer(), nullable=True))
+    op.create_index(op.f("ix_images_content_hash"), "images", ["content_hash"], unique=False)
+    op.alter_column("images", "image_data", existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM images WHERE image_data IS NULL")
+    op.alter_column("images", "image_data", existing_type=sa.Text(), nullable=False)
+    op.drop_index(op.f("ix_images_content_hash"), table_name="images")
+    op.drop_column("images", "file_size")
+    op.drop_column("images", "mime_type")
+    op.drop_column("images", "storage_key")
+    op.drop_column("images", "content_hash")
@@ -0,0 +1,58 @@
+"""add_user_question_stats
+
+Revision ID: a7d3f9b5c264
+Revises: f6c2e8a4b193
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d3f9b5c264"
+down_revision: Union[str, Sequence[str], None] = "f6c2e8a4b193"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_question_stats",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("question_count", sa.Integer(), nullable=False),
+        sa.Column("answer_count", sa.Integer(), nullable=False),
+        sa.Column("confidence_total", sa.Float(), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("cached_prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO user_question_stats (
+            user_id, question_count, answer_count, confidence_total, prompt_tokens, cached_prompt_tokens, updated_at
+        )
+        SELECT
+            questions.user_id,
+            COUNT(DISTINCT questions.id),
+            COUNT(answers.id),
+            COALESCE(SUM(answers.confidence_score), 0),
+            COALESCE(SUM(answers.prompt_tokens), 0),
+            COALESCE(SUM(answers.cached_prompt_tokens), 0),
+            now()
+        FROM questions
+        LEFT JOIN answers ON answers.question_id = questions.id
+        GROUP BY questions.user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_question_stats")
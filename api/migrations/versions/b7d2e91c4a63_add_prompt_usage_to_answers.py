@@ -0,0 +1,31 @@
+"""add_prompt_usage_to_answers
+
+Revision ID: b7d2e91c4a63
+Revises: e1e3bcdd3e52
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2e91c4a63"
+down_revision: Union[str, Sequence[str], None] = "e1e3bcdd3e52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("answers", sa.Column("prompt_tokens", sa.Integer(), nullable=True))
+    op.add_column("answers", sa.Column("cached_prompt_tokens", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("answers", "cached_prompt_tokens")
+    op.drop_column("answers", "prompt_tokens")
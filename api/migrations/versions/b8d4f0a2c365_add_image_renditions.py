@@ -0,0 +1,34 @@
+"""add_image_renditions
+
+Revision ID: b8d4f0a2c365
+Revises: a7c3e9f1b254
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d4f0a2c365"
+down_revision: Union[str, Sequence[str], None] = "a7c3e9f1b254"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("images", sa.Column("thumbnail_key", sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column("images", sa.Column("width", sa.Integer(), nullable=True))
+    op.add_column("images", sa.Column("height", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("images", "height")
+    op.drop_column("images", "width")
+    op.drop_column("images", "thumbnail_key")
@@ -0,0 +1,45 @@
+"""add_jsonb_array_or_empty_function
+
+Revision ID: b8e4c1d7f302
+Revises: a7d3f9b5c264
+Create Date: 2026-10-19 23:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e4c1d7f302"
+down_revision: Union[str, Sequence[str], None] = "a7d3f9b5c264"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE FUNCTION jsonb_array_or_empty(value text) RETURNS jsonb
+        LANGUAGE plpgsql IMMUTABLE AS $$
+        DECLARE
+            parsed jsonb;
+        BEGIN
+            parsed := value::jsonb;
+            IF jsonb_typeof(parsed) = 'array' THEN
+                RETURN parsed;
+            END IF;
+            RETURN '[]'::jsonb;
+        EXCEPTION WHEN others THEN
+            RETURN '[]'::jsonb;
+        END;
+        $$
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP FUNCTION jsonb_array_or_empty(text)")
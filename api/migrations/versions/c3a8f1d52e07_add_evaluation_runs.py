@@ -0,0 +1,70 @@
+"""add_evaluation_runs
+
+Revision ID: c3a8f1d52e07
+Revises: b7d2e91c4a63
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a8f1d52e07"
+down_revision: Union[str, Sequence[str], None] = "b7d2e91c4a63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "evaluation_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("status", sa.Enum("RUNNING", "COMPLETED", "FAILED", name="evaluationrunstatus"), nullable=False),
+        sa.Column("provider", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("model", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("batch_id", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("question_count", sa.Integer(), nullable=False),
+        sa.Column("failed_count", sa.Integer(), nullable=False),
+        sa.Column("embedding_ms", sa.Integer(), nullable=True),
+        sa.Column("search_ms", sa.Integer(), nullable=True),
+        sa.Column("generation_ms", sa.Integer(), nullable=True),
+        sa.Column("total_ms", sa.Integer(), nullable=True),
+        sa.Column("error_message", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "evaluation_results",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("run_id", sa.Integer(), nullable=False),
+        sa.Column("question_id", sa.Integer(), nullable=True),
+        sa.Column("question_text", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("answer_text", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("sources_used", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("confidence_score", sa.Float(), nullable=False),
+        sa.Column("search_ms", sa.Integer(), nullable=True),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=True),
+        sa.Column("cached_prompt_tokens", sa.Integer(), nullable=True),
+        sa.Column("error_message", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.ForeignKeyConstraint(["run_id"], ["evaluation_runs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_evaluation_results_run_id"), "evaluation_results", ["run_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_evaluation_results_run_id"), table_name="evaluation_results")
+    op.drop_table("evaluation_results")
+    op.drop_table("evaluation_runs")
+    sa.Enum(name="evaluationrunstatus").drop(op.get_bind(), checkfirst=True)
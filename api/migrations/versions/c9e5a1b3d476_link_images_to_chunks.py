@@ -0,0 +1,106 @@
+"""link_images_to_chunks
+
+Revision ID: c9e5a1b3d476
+Revises: b8d4f0a2c365
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c9e5a1b3d476"
+down_revision: Union[str, Sequence[str], None] = "b8d4f0a2c365"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows holding the same image within one file collapse onto the oldest of them.
+_KEEPERS = """
+    SELECT id, min(id) OVER (PARTITION BY file_id, coalesce(content_hash, md5(image_data))) AS keeper_id
+    FROM images
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "chunk_images",
+        sa.Column("chunk_id", sa.Integer(), nullable=False),
+        sa.Column("image_id", sa.Integer(), nullable=False),
+        sa.Column("image_index", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["chunk_id"], ["document_chunks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["image_id"], ["images.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("chunk_id", "image_id"),
+    )
+    op.create_index(op.f("ix_chunk_images_image_id"), "chunk_images", ["image_id"], unique=False)
+
+    op.execute(
+        f"""
+        INSERT INTO chunk_images (chunk_id, image_id, image_index)
+        SELECT images.chunk_id, keepers.keeper_id, min(images.image_index)
+        FROM images JOIN ({_KEEPERS}) AS keepers ON keepers.id = images.id
+        GROUP BY images.chunk_id, keepers.keeper_id
+        """
+    )
+    op.execute(
+        f"""
+        DELETE FROM images USING ({_KEEPERS}) AS keepers
+        WHERE images.id = keepers.id AND keepers.id <> keepers.keeper_id
+        """
+    )
+
+    op.drop_index(op.f("ix_images_chunk_id"), table_name="images")
+    op.drop_column("images", "chunk_id")
+    op.drop_column("images", "image_index")
+    op.create_unique_constraint("images_file_id_content_hash_key", "images", ["file_id", "content_hash"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("images_file_id_content_hash_key", "images", type_="unique")
+    op.add_column("images", sa.Column("chunk_id", sa.Integer(), nullable=True))
+    op.add_column("images", sa.Column("image_index", sa.Integer(), nullable=False, server_default="0"))
+
+    # Every link beyond the first one of an image gets its own copy of the row again.
+    op.execute(
+        """
+        INSERT INTO images (
+            created_at, updated_at, chunk_id, image_index, image_data, content_hash, storage_key, mime_type,
+            file_size, thumbnail_key, width, height, file_id, page_number, description
+        )
+        SELECT
+            images.created_at, images.updated_at, chunk_images.chunk_id, chunk_images.image_index,
+            images.image_data, images.content_hash, images.storage_key, images.mime_type, images.file_size,
+            images.thumbnail_key, images.width, images.height, images.file_id, images.page_number,
+            images.description
+        FROM chunk_images JOIN images ON images.id = chunk_images.image_id
+        WHERE chunk_images.chunk_id > (
+            SELECT min(first_link.chunk_id) FROM chunk_images AS first_link
+            WHERE first_link.image_id = chunk_images.image_id
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE images SET chunk_id = first_link.chunk_id, image_index = first_link.image_index
+        FROM (
+            SELECT DISTINCT ON (image_id) image_id, chunk_id, image_index
+            FROM chunk_images ORDER BY image_id, chunk_id
+        ) AS first_link
+        WHERE images.id = first_link.image_id AND images.chunk_id IS NULL
+        """
+    )
+    op.execute("DELETE FROM images WHERE chunk_id IS NULL")
+
+    op.alter_column("images", "chunk_id", nullable=False)
+    op.alter_column("images", "image_index", server_default=None)
+    op.create_foreign_key(
+        "images_chunk_id_fkey", "images", "document_chunks", ["chunk_id"], ["id"], ondelete="CASCADE"
+    )
+    op.create_index(op.f("ix_images_chunk_id"), "images", ["chunk_id"], unique=False)
+    op.drop_index(op.f("ix_chunk_images_image_id"), table_name="chunk_images")
+    op.drop_table("chunk_images")
@@ -0,0 +1,30 @@
+"""add_file_listing_indexes
+
+Revision ID: d1f7b3c5e812
+Revises: c9e5a1b3d476
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d1f7b3c5e812"
+down_revision: Union[str, Sequence[str], None] = "c9e5a1b3d476"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_file_created_at_id", "file", ["created_at", "id"], unique=False)
+    op.create_index("ix_file_user_id_created_at_id", "file", ["user_id", "created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_file_user_id_created_at_id", table_name="file")
+    op.drop_index("ix_file_created_at_id", table_name="file")
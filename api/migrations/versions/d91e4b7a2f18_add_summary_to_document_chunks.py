@@ -0,0 +1,29 @@
+"""add_summary_to_document_chunks
+
+Revision ID: d91e4b7a2f18
+Revises: c3a8f1d52e07
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d91e4b7a2f18"
+down_revision: Union[str, Sequence[str], None] = "c3a8f1d52e07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("document_chunks", sa.Column("summary", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("document_chunks", "summary")
@@ -0,0 +1,37 @@
+"""add_file_soft_delete
+
+Revision ID: e3a9c5d7f024
+Revises: d1f7b3c5e812
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a9c5d7f024"
+down_revision: Union[str, Sequence[str], None] = "d1f7b3c5e812"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("file", sa.Column("deleted_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_file_deleted_at",
+        "file",
+        ["deleted_at"],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_file_deleted_at", table_name="file", postgresql_where=sa.text("deleted_at IS NOT NULL"))
+    op.drop_column("file", "deleted_at")
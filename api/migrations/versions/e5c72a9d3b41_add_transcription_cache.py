@@ -0,0 +1,44 @@
+"""add_transcription_cache
+
+Revision ID: e5c72a9d3b41
+Revises: d91e4b7a2f18
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5c72a9d3b41"
+down_revision: Union[str, Sequence[str], None] = "d91e4b7a2f18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "transcription_cache",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("audio_hash", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("model", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("language", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("transcript_text", sa.Text(), nullable=False),
+        sa.Column("audio_metadata", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("audio_hash", "model", "language"),
+    )
+    op.create_index(op.f("ix_transcription_cache_audio_hash"), "transcription_cache", ["audio_hash"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_transcription_cache_audio_hash"), table_name="transcription_cache")
+    op.drop_table("transcription_cache")
@@ -0,0 +1,63 @@
+"""add_content_addressed_blobs
+
+Revision ID: f2b6d8e4a190
+Revises: e5c72a9d3b41
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b6d8e4a190"
+down_revision: Union[str, Sequence[str], None] = "e5c72a9d3b41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "blobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("content_hash", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("file_path", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("file_size", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_blobs_content_hash"), "blobs", ["content_hash"], unique=True)
+
+    op.add_column("file", sa.Column("blob_id", sa.Integer(), nullable=True))
+    op.create_index(op.f("ix_file_blob_id"), "file", ["blob_id"], unique=False)
+    op.create_foreign_key("file_blob_id_fkey", "file", "blobs", ["blob_id"], ["id"])
+
+    # Existing uploads become blobs pointing at the oldest stored copy of each hash.
+    op.execute(
+        """
+        INSERT INTO blobs (created_at, updated_at, content_hash, file_path, file_size, ref_count)
+        SELECT DISTINCT ON (content_hash)
+            now(), now(), content_hash, file_path, file_size,
+            count(*) OVER (PARTITION BY content_hash)
+        FROM file
+        WHERE content_hash IS NOT NULL
+        ORDER BY content_hash, id
+        """
+    )
+    op.execute("UPDATE file SET blob_id = blobs.id FROM blobs WHERE file.content_hash = blobs.content_hash")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("file_blob_id_fkey", "file", type_="foreignkey")
+    op.drop_index(op.f("ix_file_blob_id"), table_name="file")
+    op.drop_column("file", "blob_id")
+    op.drop_index(op.f("ix_blobs_content_hash"), table_name="blobs")
+    op.drop_table("blobs")
@@ -0,0 +1,32 @@
+"""add_history_lookup_indexes
+
+Revision ID: f6c2e8a4b193
+Revises: e3a9c5d7f024
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6c2e8a4b193"
+down_revision: Union[str, Sequence[str], None] = "e3a9c5d7f024"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_answers_question_id", "answers", ["question_id"], unique=False)
+    op.create_index(
+        "ix_document_chunks_file_id_chunk_index", "document_chunks", ["file_id", "chunk_index"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_document_chunks_file_id_chunk_index", table_name="document_chunks")
+    op.drop_index("ix_answers_question_id", table_name="answers")
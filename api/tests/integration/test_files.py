@@ -1,10 +1,14 @@
+from collections.abc import AsyncIterator
 from io import BytesIO
-from unittest.mock import AsyncMock, MagicMock, patch
+from pathlib import Path
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 from httpx import AsyncClient
 
-from app.modules.files.schema import FileType
+from app.core.storage import Storage, get_storage
+from app.main import app
+from app.modules.files.schema import FileDownload, FileType
 
 
 @pytest.mark.asyncio
@@ -45,12 +49,12 @@ async def test_upload_file_no_file(admin_client: AsyncClient) -> None:
 
 @pytest.mark.asyncio
 async def test_get_files(admin_client: AsyncClient) -> None:
-    with patch("app.modules.files.service.FileService.get_files") as mock_get_files:
-        mock_get_files.return_value = []
+    with patch("app.modules.files.service.FileService.get_files_page") as mock_get_files_page:
+        mock_get_files_page.return_value = ([], None)
         
         response = await admin_client.get("/files/")
         assert response.status_code == 200
-        assert isinstance(response.json(), list)
+        assert response.json()["files"] == []
 
 
 @pytest.mark.asyncio
@@ -87,24 +91,114 @@ async def test_get_file_not_found(admin_client: AsyncClient) -> None:
 
 
 @pytest.mark.asyncio
-async def test_download_file(admin_client: AsyncClient) -> None:
-    with patch("app.modules.files.service.FileService.get_file_content") as mock_get_content:
-        mock_content = MagicMock()
-        mock_content.content = b"file content"
-        mock_content.original_filename = "test.pdf"
-        mock_content.content_type = "application/pdf"
-        mock_get_content.return_value = mock_content
-        
+async def test_download_file(admin_client: AsyncClient, tmp_path: Path) -> None:
+    file_path = tmp_path / "test.pdf"
+    file_path.write_bytes(b"file content")
+    download = FileDownload(
+        file_path=str(file_path),
+        file_size=12,
+        original_filename="test.pdf",
+        content_type="application/pdf",
+        etag='"abc123"',
+    )
+    with patch("app.modules.files.service.FileService.get_file_download") as mock_get_download:
+        mock_get_download.return_value = download
+
         response = await admin_client.get("/files/1/download")
         assert response.status_code == 200
-        assert response.headers["content-type"] is not None
+        assert response.content == b"file content"
+        assert response.headers["etag"] == '"abc123"'
+        assert response.headers["accept-ranges"] == "bytes"
+
+        response = await admin_client.get("/files/1/download", headers={"Range": "bytes=5-"})
+        assert response.status_code == 206
+        assert response.content == b"content"
+
+
+@pytest.mark.asyncio
+async def test_download_file_streams_ranges_from_object_storage(admin_client: AsyncClient) -> None:
+    async def iter_range(key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        yield b"file content"[start:end]
+
+    storage = MagicMock(spec=Storage)
+    storage.get_local_path.return_value = None
+    storage.iter_range = iter_range
+    app.dependency_overrides[get_storage] = lambda: storage
+    download = FileDownload(
+        file_path="blobs/ab/abc123",
+        file_size=12,
+        original_filename="test.pdf",
+        content_type="application/pdf",
+        etag='"abc123"',
+    )
+    try:
+        with patch("app.modules.files.service.FileService.get_file_download") as mock_get_download:
+            mock_get_download.return_value = download
+
+            response = await admin_client.get("/files/1/download", headers={"Range": "bytes=5-"})
+            assert response.status_code == 206
+            assert response.headers["content-range"] == "bytes 5-11/12"
+            assert response.content == b"content"
+
+            response = await admin_client.get("/files/1/download", headers={"Range": "bytes=20-"})
+            assert response.status_code == 416
+    finally:
+        app.dependency_overrides.pop(get_storage, None)
+
+
+@pytest.mark.asyncio
+async def test_download_file_encodes_non_ascii_filename(admin_client: AsyncClient) -> None:
+    async def iter_range(key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        yield b"file content"[start:end]
+
+    storage = MagicMock(spec=Storage)
+    storage.get_local_path.return_value = None
+    storage.iter_range = iter_range
+    app.dependency_overrides[get_storage] = lambda: storage
+    download = FileDownload(
+        file_path="blobs/ab/abc123",
+        file_size=12,
+        original_filename='Résumé "final".pdf',
+        content_type="application/pdf",
+        etag='"abc123"',
+    )
+    try:
+        with patch("app.modules.files.service.FileService.get_file_download") as mock_get_download:
+            mock_get_download.return_value = download
+
+            response = await admin_client.get("/files/1/download")
+            assert response.status_code == 200
+            assert response.headers["content-disposition"] == (
+                "attachment; filename=\"R_sum_ _final_.pdf\"; filename*=UTF-8''R%C3%A9sum%C3%A9%20%22final%22.pdf"
+            )
+    finally:
+        app.dependency_overrides.pop(get_storage, None)
+
+
+@pytest.mark.asyncio
+async def test_download_file_not_modified(admin_client: AsyncClient) -> None:
+    download = FileDownload(
+        file_path="/nonexistent/test.pdf",
+        file_size=12,
+        original_filename="test.pdf",
+        content_type="application/pdf",
+        etag='"abc123"',
+        not_modified=True,
+    )
+    with patch("app.modules.files.service.FileService.get_file_download") as mock_get_download:
+        mock_get_download.return_value = download
+
+        response = await admin_client.get("/files/1/download", headers={"If-None-Match": '"abc123"'})
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"abc123"'
+        mock_get_download.assert_called_once_with(1, ANY, '"abc123"')
 
 
 @pytest.mark.asyncio
 async def test_download_file_not_found(admin_client: AsyncClient) -> None:
-    with patch("app.modules.files.service.FileService.get_file_content") as mock_get_content:
-        mock_get_content.return_value = None
-        
+    with patch("app.modules.files.service.FileService.get_file_download") as mock_get_download:
+        mock_get_download.return_value = None
+
         response = await admin_client.get("/files/99999/download")
         assert response.status_code == 404
 
@@ -0,0 +1,15 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_get_metrics(admin_client: AsyncClient) -> None:
+    response = await admin_client.get("/metrics")
+    assert response.status_code == 200
+    assert "checked_out" in response.json()["database"]
+
+
+@pytest.mark.asyncio
+async def test_get_metrics_unauthorized(authenticated_client: AsyncClient) -> None:
+    response = await authenticated_client.get("/metrics")
+    assert response.status_code == 403
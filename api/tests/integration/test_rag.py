@@ -4,7 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from httpx import AsyncClient
 
-from app.modules.rag.schema import AnswerResponse, QuestionRequest, QuestionStats, QAPairResponse
+from app.modules.rag.schema import AnswerResponse, QuestionRequest, QuestionStats, QAPairResponse, RAGStats
 
 
 @pytest.mark.asyncio
@@ -146,3 +146,21 @@ async def test_get_user_stats(admin_client: AsyncClient) -> None:
 async def test_get_user_stats_unauthorized(authenticated_client: AsyncClient) -> None:
     response = await authenticated_client.get("/rag/stats")
     assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_get_rag_stats(admin_client: AsyncClient) -> None:
+    with patch("app.modules.rag.services.document_service.DocumentService.get_rag_stats") as mock_get_stats:
+        mock_get_stats.return_value = RAGStats(total_documents=2, total_chunks=40, total_questions=7, total_images=5)
+
+        response = await admin_client.get("/rag/stats/overview")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_documents"] == 2
+        assert data["total_questions"] == 7
+
+
+@pytest.mark.asyncio
+async def test_get_rag_stats_unauthorized(authenticated_client: AsyncClient) -> None:
+    response = await authenticated_client.get("/rag/stats/overview")
+    assert response.status_code == 403
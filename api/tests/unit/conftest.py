@@ -127,12 +127,10 @@ def mock_document_chunk() -> DocumentChunk:
 def mock_image() -> Image:
     return Image(
         id=1,
-        chunk_id=1,
         image_data="base64encodedimage",
         file_id=1,
         page_number=1,
         description="Test image",
-        image_index=0,
         created_at=datetime.now(),
         updated_at=datetime.now(),
     )
@@ -1,8 +1,10 @@
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
 
-from app.core.database import get_db_session
+from app.core.database import MonitoredQueuePool, get_db_session
 
 
 @pytest.mark.asyncio
@@ -46,3 +48,21 @@ async def test_get_db_session_rollback_on_exception() -> None:
 
     session_mock.rollback.assert_called_once()
     session_mock.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_monitored_pool_records_waits_and_timeouts() -> None:
+    pool = MonitoredQueuePool(creator=MagicMock, pool_size=1, max_overflow=0, timeout=0.05)
+
+    connection = await greenlet_spawn(pool.connect)
+    with pytest.raises(PoolTimeoutError):
+        await greenlet_spawn(pool.connect)
+    metrics = pool.get_metrics()
+    await greenlet_spawn(connection.close)
+
+    assert metrics.checked_out == 1
+    assert metrics.pool_size == 1
+    assert metrics.timeouts == 1
+    assert metrics.wait_max_ms >= 50
+    assert pool.get_metrics().checked_out == 0
+
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from app.core.deadline import Deadline
+from app.core.exceptions import DeadlineExceededError
+
+
+def test_unbounded_deadline() -> None:
+    deadline = Deadline()
+
+    assert deadline.remaining() is None
+    assert deadline.expired is False
+
+
+def test_from_ms_non_positive_is_unbounded() -> None:
+    assert Deadline.from_ms(0).remaining() is None
+
+
+def test_expired_deadline() -> None:
+    deadline = Deadline(0)
+
+    assert deadline.remaining() == 0
+    assert deadline.expired is True
+
+
+@pytest.mark.asyncio
+async def test_limit_passes_within_budget() -> None:
+    deadline = Deadline(1)
+
+    async with deadline.limit("stage"):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_limit_raises_when_budget_runs_out() -> None:
+    deadline = Deadline(0.01)
+
+    with pytest.raises(DeadlineExceededError, match="during stage"):
+        async with deadline.limit("stage"):
+            await asyncio.sleep(1)
+
+
+@pytest.mark.asyncio
+async def test_limit_raises_when_already_expired() -> None:
+    deadline = Deadline(0)
+
+    with pytest.raises(DeadlineExceededError, match="before stage"):
+        async with deadline.limit("stage"):
+            pass
@@ -0,0 +1,24 @@
+from app.core.latency import LatencyTracker
+
+
+def test_percentile_empty() -> None:
+    assert LatencyTracker().percentile(95) is None
+
+
+def test_percentile() -> None:
+    tracker = LatencyTracker()
+    for value in range(1, 101):
+        tracker.record(float(value))
+
+    assert len(tracker) == 100
+    assert tracker.percentile(95) == 95.0
+    assert tracker.percentile(50) == 50.0
+
+
+def test_window_size() -> None:
+    tracker = LatencyTracker(window_size=2)
+    for value in (1.0, 2.0, 3.0):
+        tracker.record(value)
+
+    assert len(tracker) == 2
+    assert tracker.percentile(0) == 2.0
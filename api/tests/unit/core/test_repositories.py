@@ -17,3 +17,10 @@ def test_repository_initialization(mock_session: MagicMock) -> None:
 def test_repository_has_session(mock_session: MagicMock) -> None:
     repo = ConcreteRepository(session=mock_session)
     assert hasattr(repo, "_session")
+
+
+@pytest.mark.asyncio
+async def test_repository_rollback(mock_session: MagicMock) -> None:
+    repo = ConcreteRepository(session=mock_session)
+    await repo.rollback()
+    mock_session.rollback.assert_called_once()
@@ -0,0 +1,196 @@
+import os
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.storage import LocalStorage, S3Storage, get_storage
+
+
+class _ClientError(Exception):
+    def __init__(self, code: str) -> None:
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class _Body:
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+
+    async def __aenter__(self) -> "_Body":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        pass
+
+    async def iter_chunks(self, chunk_size: int) -> None:
+        for offset in range(0, len(self._data), chunk_size):
+            yield self._data[offset : offset + chunk_size]
+
+
+def _s3_storage(tmp_path: Path, objects: dict[str, bytes] | None = None) -> tuple[S3Storage, MagicMock]:
+    objects = objects if objects is not None else {}
+    client = MagicMock()
+    client.exceptions.ClientError = _ClientError
+
+    async def head_object(Bucket: str, Key: str) -> dict[str, int]:  # noqa: N803
+        if Key not in objects:
+            raise _ClientError("404")
+        return {"ContentLength": len(objects[Key])}
+
+    async def get_object(Bucket: str, Key: str, Range: str) -> dict[str, _Body]:  # noqa: N803
+        start, end = (int(value) for value in Range.removeprefix("bytes=").split("-"))
+        return {"Body": _Body(objects[Key][start : end + 1])}
+
+    client.head_object = AsyncMock(side_effect=head_object)
+    client.get_object = AsyncMock(side_effect=get_object)
+    client.put_object = AsyncMock()
+    client.delete_object = AsyncMock()
+    client.create_multipart_upload = AsyncMock(return_value={"UploadId": "upload-1"})
+    client.upload_part = AsyncMock(side_effect=lambda **kwargs: {"ETag": f"etag-{kwargs['PartNumber']}"})
+    client.complete_multipart_upload = AsyncMock()
+    client.abort_multipart_upload = AsyncMock()
+
+    storage = S3Storage(
+        bucket="files",
+        endpoint_url="http://localhost:9000",
+        region="us-east-1",
+        access_key_id="minio",
+        secret_access_key="minio123",
+        cache_dir=tmp_path / "cache",
+    )
+    storage._client = client
+    return storage, client
+
+
+@pytest.mark.asyncio
+async def test_local_storage_put_and_read_range(tmp_path: Path) -> None:
+    storage = LocalStorage(tmp_path / "storage")
+    source = tmp_path / "upload.part"
+    source.write_bytes(b"0123456789")
+
+    await storage.put("blobs/ab/abc", source)
+
+    assert await storage.exists("blobs/ab/abc")
+    assert not source.exists()
+    assert b"".join([chunk async for chunk in storage.iter_range("blobs/ab/abc", 2, 5)]) == b"234"
+    assert await storage.fetch("blobs/ab/abc") == tmp_path / "storage" / "blobs" / "ab" / "abc"
+
+
+@pytest.mark.asyncio
+async def test_local_storage_delete_missing_key(tmp_path: Path) -> None:
+    storage = LocalStorage(tmp_path)
+
+    await storage.delete("missing")
+
+    assert not await storage.exists("missing")
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_multipart_upload(tmp_path: Path) -> None:
+    storage, client = _s3_storage(tmp_path)
+    source = tmp_path / "upload.part"
+    source.write_bytes(b"x" * 25)
+
+    with patch("app.core.storage.settings") as mock_settings:
+        mock_settings.S3_MULTIPART_PART_BYTES = 10
+        mock_settings.S3_TRANSFER_CONCURRENCY = 2
+        await storage.put("blobs/ab/abc", source)
+
+    assert client.upload_part.call_count == 3
+    parts = client.complete_multipart_upload.call_args.kwargs["MultipartUpload"]["Parts"]
+    assert [part["PartNumber"] for part in parts] == [1, 2, 3]
+    client.put_object.assert_not_called()
+    assert not source.exists()
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_aborts_failed_multipart_upload(tmp_path: Path) -> None:
+    storage, client = _s3_storage(tmp_path)
+    client.upload_part = AsyncMock(side_effect=RuntimeError("connection reset"))
+    source = tmp_path / "upload.part"
+    source.write_bytes(b"x" * 25)
+
+    with patch("app.core.storage.settings") as mock_settings:
+        mock_settings.S3_MULTIPART_PART_BYTES = 10
+        mock_settings.S3_TRANSFER_CONCURRENCY = 2
+        with pytest.raises(RuntimeError):
+            await storage.put("blobs/ab/abc", source)
+
+    client.abort_multipart_upload.assert_called_once_with(Bucket="files", Key="blobs/ab/abc", UploadId="upload-1")
+    client.complete_multipart_upload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_exists(tmp_path: Path) -> None:
+    storage, _ = _s3_storage(tmp_path, {"present": b"data"})
+
+    assert await storage.exists("present")
+    assert not await storage.exists("missing")
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_fetch_uses_read_through_cache(tmp_path: Path) -> None:
+    content = bytes(range(256)) * 4
+    storage, client = _s3_storage(tmp_path, {"blobs/ab/abc": content})
+
+    with patch("app.core.storage.settings") as mock_settings:
+        mock_settings.S3_MULTIPART_PART_BYTES = 100
+        mock_settings.S3_TRANSFER_CONCURRENCY = 4
+        mock_settings.STORAGE_CACHE_MAX_BYTES = 1024 * 1024
+        mock_settings.STORAGE_CACHE_MIN_AGE_SECONDS = 0
+        path = await storage.fetch("blobs/ab/abc")
+        ranged_reads = client.get_object.call_count
+        cached_path = await storage.fetch("blobs/ab/abc")
+
+    assert path.read_bytes() == content
+    assert cached_path == path
+    assert ranged_reads == 11
+    assert client.get_object.call_count == ranged_reads
+    assert len(storage._fetch_locks) == 0
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_evicts_least_recently_used(tmp_path: Path) -> None:
+    storage, _ = _s3_storage(tmp_path, {"old": b"a" * 60, "new": b"b" * 60})
+
+    with patch("app.core.storage.settings") as mock_settings:
+        mock_settings.S3_MULTIPART_PART_BYTES = 100
+        mock_settings.S3_TRANSFER_CONCURRENCY = 1
+        mock_settings.STORAGE_CACHE_MAX_BYTES = 100
+        mock_settings.STORAGE_CACHE_MIN_AGE_SECONDS = 60
+        old_path = await storage.fetch("old")
+        os.utime(old_path, (time.time() - 120, time.time() - 120))
+        await storage.fetch("new")
+
+    assert not (tmp_path / "cache" / "old").exists()
+    assert (tmp_path / "cache" / "new").exists()
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_keeps_recently_accessed_files(tmp_path: Path) -> None:
+    storage, _ = _s3_storage(tmp_path, {"old": b"a" * 60, "new": b"b" * 60})
+
+    with patch("app.core.storage.settings") as mock_settings:
+        mock_settings.S3_MULTIPART_PART_BYTES = 100
+        mock_settings.S3_TRANSFER_CONCURRENCY = 1
+        mock_settings.STORAGE_CACHE_MAX_BYTES = 100
+        mock_settings.STORAGE_CACHE_MIN_AGE_SECONDS = 60
+        await storage.fetch("old")
+        await storage.fetch("new")
+
+    assert (tmp_path / "cache" / "old").exists()
+    assert (tmp_path / "cache" / "new").exists()
+
+
+def test_get_storage_local(tmp_path: Path) -> None:
+    get_storage.cache_clear()
+    with patch("app.core.storage.settings") as mock_settings:
+        mock_settings.STORAGE_BACKEND = "local"
+        mock_settings.STORAGE_DIR = tmp_path
+
+        storage = get_storage()
+
+    assert isinstance(storage, LocalStorage)
+    get_storage.cache_clear()
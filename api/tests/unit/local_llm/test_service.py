@@ -0,0 +1,75 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.local_llm.schema import ChatCompletionRequest, ChatMessage
+from app.local_llm.service import LocalLLMService
+
+
+def _build_service(mode: str = "echo", latency_ms: int = 0, tokens_per_second: float = 0.0) -> LocalLLMService:
+    with patch("app.local_llm.service.settings") as mock_settings:
+        mock_settings.LOCAL_LLM_MODE = mode
+        mock_settings.LOCAL_LLM_CANNED_ANSWER = "Canned answer"
+        mock_settings.LOCAL_LLM_LATENCY_MS = latency_ms
+        mock_settings.LOCAL_LLM_TOKENS_PER_SECOND = tokens_per_second
+        return LocalLLMService()
+
+
+@pytest.mark.asyncio
+async def test_echo_mode_returns_last_user_message() -> None:
+    service = _build_service()
+    request = ChatCompletionRequest(
+        model="gpt-4o-mini",
+        messages=[
+            ChatMessage(role="system", content="You are helpful"),
+            ChatMessage(role="user", content="What is the answer?"),
+        ],
+    )
+
+    result = await service.create_chat_completion(request)
+
+    assert result.choices[0].message.content == "What is the answer?"
+    assert result.choices[0].finish_reason == "stop"
+    assert result.usage.prompt_tokens == 7
+    assert result.usage.completion_tokens == 4
+
+
+@pytest.mark.asyncio
+async def test_canned_mode_is_deterministic() -> None:
+    service = _build_service(mode="canned")
+    request = ChatCompletionRequest(model="gpt-4o-mini", messages=[ChatMessage(role="user", content="Hi")])
+
+    first = await service.create_chat_completion(request)
+    second = await service.create_chat_completion(request)
+
+    assert first.choices[0].message.content == "Canned answer"
+    assert first.id == second.id
+
+
+@pytest.mark.asyncio
+async def test_max_tokens_truncates_answer() -> None:
+    service = _build_service()
+    request = ChatCompletionRequest(
+        model="gpt-4o-mini",
+        messages=[ChatMessage(role="user", content="one two three four")],
+        max_tokens=2,
+    )
+
+    result = await service.create_chat_completion(request)
+
+    assert result.choices[0].message.content == "one two"
+    assert result.choices[0].finish_reason == "length"
+
+
+@pytest.mark.asyncio
+async def test_simulated_latency_and_token_rate() -> None:
+    service = _build_service(latency_ms=100, tokens_per_second=4.0)
+    request = ChatCompletionRequest(
+        model="gpt-4o-mini",
+        messages=[ChatMessage(role="user", content="one two")],
+    )
+
+    with patch("app.local_llm.service.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        await service.create_chat_completion(request)
+
+        mock_sleep.assert_called_once_with(pytest.approx(0.6))
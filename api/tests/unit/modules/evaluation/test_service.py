@@ -0,0 +1,82 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.evaluation.models import EvaluationRun
+from app.modules.evaluation.repository import EvaluationRepository
+from app.modules.evaluation.schema import EvaluationQuestion, EvaluationRunStatus
+from app.modules.evaluation.service import EvaluationService
+from app.modules.rag.repositories.qa import QARepository
+from app.modules.rag.services.openai_service import OpenAIService
+from app.modules.rag.services.vector_store_manager import VectorStoreManager
+
+
+@pytest.fixture
+def evaluation_service() -> EvaluationService:
+    repository = MagicMock(spec=EvaluationRepository)
+    repository.create_run = AsyncMock(side_effect=lambda run: run.model_copy(update={"id": 1}))
+    repository.update_run = AsyncMock(side_effect=lambda run: run)
+
+    return EvaluationService(
+        vector_store=MagicMock(spec=VectorStoreManager),
+        openai_service=MagicMock(spec=OpenAIService),
+        qa_repository=MagicMock(spec=QARepository),
+        repository=repository,
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_batches_answerable_questions(evaluation_service: EvaluationService) -> None:
+    evaluation_service.vector_store.embed_queries.return_value = [[0.1], [0.2]]
+    evaluation_service.vector_store.search_by_embedding.side_effect = [
+        [{"text": "chunk", "metadata": {"file_id": 1}, "distance": 0.2}],
+        [],
+    ]
+    evaluation_service.openai_service.generate_answers_batch.return_value = {
+        "batch_id": "batch-1",
+        "answers": [{"answer_text": "Answer", "prompt_tokens": 10, "cached_tokens": 0}],
+    }
+
+    with patch("app.modules.evaluation.service.settings") as mock_settings:
+        mock_settings.LLM_PROVIDER = "local"
+        mock_settings.CHAT_MODEL = "gpt-4o-mini"
+        run = await evaluation_service.run(
+            [EvaluationQuestion(question_text="Q1?", question_id=5), EvaluationQuestion(question_text="Q2?")]
+        )
+
+    evaluation_service.openai_service.generate_answers_batch.assert_called_once_with(
+        [("Q1?", "Source: Unknown\nchunk\n")]
+    )
+    results = evaluation_service.repository.create_results.call_args.args[0]
+    assert [r.answer_text for r in results] == ["Answer", None]
+    assert results[0].question_id == 5
+    assert results[1].error_message is not None
+    assert run.status == EvaluationRunStatus.COMPLETED
+    assert run.batch_id == "batch-1"
+    assert run.failed_count == 1
+    assert run.total_ms is not None
+
+
+@pytest.mark.asyncio
+async def test_run_marks_failed_on_error(evaluation_service: EvaluationService) -> None:
+    evaluation_service.vector_store.embed_queries.side_effect = Exception("Embedding failed")
+
+    with patch("app.modules.evaluation.service.settings") as mock_settings:
+        mock_settings.LLM_PROVIDER = "openai"
+        mock_settings.CHAT_MODEL = "gpt-4o-mini"
+        run = await evaluation_service.run([EvaluationQuestion(question_text="Q1?")])
+
+    assert isinstance(run, EvaluationRun)
+    assert run.status == EvaluationRunStatus.FAILED
+    assert run.error_message == "Embedding failed"
+    evaluation_service.repository.rollback.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_load_history_questions(evaluation_service: EvaluationService) -> None:
+    evaluation_service.qa_repository.get_distinct_recent_questions.return_value = [(3, "What is RAG?")]
+
+    questions = await evaluation_service.load_history_questions(limit=10)
+
+    assert questions == [EvaluationQuestion(question_id=3, question_text="What is RAG?")]
+    evaluation_service.qa_repository.get_distinct_recent_questions.assert_called_once_with(10)
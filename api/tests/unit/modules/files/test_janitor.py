@@ -0,0 +1,95 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.storage import Storage
+from app.modules.files.janitor import purge_deleted_files
+from app.modules.files.models import File
+from app.modules.files.schema import FileType
+
+
+def _deleted_file(file_id: int, blob_id: int | None) -> File:
+    return File(
+        id=file_id,
+        filename=f"file{file_id}.pdf",
+        original_filename=f"file{file_id}.pdf",
+        file_path=f"blobs/{file_id}",
+        file_size=1024,
+        file_type=FileType.PDF,
+        user_id=1,
+        blob_id=blob_id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_purge_deleted_files() -> None:
+    files = [_deleted_file(1, 7), _deleted_file(2, None)]
+    mock_file_repo = MagicMock()
+    mock_file_repo.get_deleted = AsyncMock(side_effect=[files, []])
+    mock_file_repo.delete_by_ids = AsyncMock()
+    mock_file_repo.commit = AsyncMock()
+    mock_blob_repo = MagicMock()
+    mock_blob_repo.release = AsyncMock(return_value=["blobs/ab/abc123"])
+    mock_chunk_repo = MagicMock()
+    mock_chunk_repo.delete_by_file_ids = AsyncMock(side_effect=[2, 1, 0])
+    mock_image_repo = MagicMock()
+    mock_image_repo.delete_by_file_ids = AsyncMock(
+        side_effect=[[("images/aa/shared", "images/bb/thumb"), ("images/dd/locked", None), (None, None)], []]
+    )
+    mock_image_repo.try_lock_storage_keys = AsyncMock(return_value={"images/aa/shared", "images/bb/thumb"})
+    mock_image_repo.get_referenced_keys = AsyncMock(return_value={"images/aa/shared"})
+    mock_storage = MagicMock(spec=Storage)
+    mock_storage.delete = AsyncMock()
+
+    with (
+        patch("app.modules.files.janitor.async_session", MagicMock()),
+        patch("app.modules.files.janitor.get_storage", return_value=mock_storage),
+        patch("app.modules.files.janitor.FileRepository", return_value=mock_file_repo),
+        patch("app.modules.files.janitor.BlobRepository", return_value=mock_blob_repo),
+        patch("app.modules.files.janitor.DocumentChunkRepository", return_value=mock_chunk_repo),
+        patch("app.modules.files.janitor.ImageRepository", return_value=mock_image_repo),
+    ):
+        purged = await purge_deleted_files(2)
+
+    assert purged == 2
+    assert mock_chunk_repo.delete_by_file_ids.call_count == 3
+    mock_chunk_repo.delete_by_file_ids.assert_called_with([1, 2], 2)
+    mock_blob_repo.release.assert_called_once_with([7])
+    mock_file_repo.delete_by_ids.assert_called_once_with([1, 2])
+    deleted_paths = {call.args[0] for call in mock_storage.delete.call_args_list}
+    assert deleted_paths == {"blobs/ab/abc123", "blobs/2", "images/bb/thumb"}
+    mock_image_repo.try_lock_storage_keys.assert_called_once_with(
+        ["images/aa/shared", "images/bb/thumb", "images/dd/locked"]
+    )
+    mock_file_repo.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_purge_deleted_files_keeps_blobs_when_file_delete_fails() -> None:
+    mock_file_repo = MagicMock()
+    mock_file_repo.get_deleted = AsyncMock(return_value=[_deleted_file(1, 7)])
+    mock_file_repo.delete_by_ids = AsyncMock(side_effect=RuntimeError("connection lost"))
+    mock_file_repo.commit = AsyncMock()
+    mock_blob_repo = MagicMock()
+    mock_blob_repo.release = AsyncMock(return_value=["blobs/ab/abc123"])
+    mock_chunk_repo = MagicMock()
+    mock_chunk_repo.delete_by_file_ids = AsyncMock(return_value=0)
+    mock_image_repo = MagicMock()
+    mock_image_repo.delete_by_file_ids = AsyncMock(return_value=[])
+    mock_storage = MagicMock(spec=Storage)
+    mock_storage.delete = AsyncMock()
+
+    with (
+        patch("app.modules.files.janitor.async_session", MagicMock()),
+        patch("app.modules.files.janitor.get_storage", return_value=mock_storage),
+        patch("app.modules.files.janitor.FileRepository", return_value=mock_file_repo),
+        patch("app.modules.files.janitor.BlobRepository", return_value=mock_blob_repo),
+        patch("app.modules.files.janitor.DocumentChunkRepository", return_value=mock_chunk_repo),
+        patch("app.modules.files.janitor.ImageRepository", return_value=mock_image_repo),
+        pytest.raises(RuntimeError),
+    ):
+        await purge_deleted_files(2)
+
+    mock_blob_repo.release.assert_called_once_with([7])
+    mock_file_repo.commit.assert_not_called()
+    mock_storage.delete.assert_not_called()
@@ -1,10 +1,12 @@
 from collections.abc import Sequence
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
-from app.modules.files.models import File
-from app.modules.files.repository import FileRepository
+from app.modules.files.models import Blob, File
+from app.modules.files.repository import BlobRepository, FileRepository
 from app.modules.files.schema import FileType
 
 
@@ -20,6 +22,20 @@ async def test_create(mock_session: MagicMock, mock_file: File) -> None:
     assert result == mock_file
 
 
+@pytest.mark.asyncio
+async def test_create_batch(mock_session: MagicMock, mock_file: File) -> None:
+    mock_session.refresh = AsyncMock()
+    other_file = File(**{**mock_file.model_dump(), "id": 2, "content_hash": "def456"})
+
+    repo = FileRepository(session=mock_session)
+    result = await repo.create_batch([mock_file, other_file])
+
+    assert mock_session.add.call_count == 2
+    mock_session.commit.assert_called_once()
+    mock_session.refresh.assert_not_called()
+    assert result == [mock_file, other_file]
+
+
 @pytest.mark.asyncio
 async def test_get_by_id(mock_session: MagicMock, mock_file: File) -> None:
     mock_result = MagicMock()
@@ -68,31 +84,60 @@ async def test_update(mock_session: MagicMock, mock_file: File) -> None:
 
 
 @pytest.mark.asyncio
-async def test_delete_success(mock_session: MagicMock, mock_file: File) -> None:
+async def test_mark_deleted(mock_session: MagicMock) -> None:
     mock_result = MagicMock()
-    mock_result.first.return_value = mock_file
-    mock_session.exec.return_value = mock_result
-    mock_session.delete = AsyncMock()
+    mock_result.scalar_one_or_none.return_value = 1
+    mock_session.execute = AsyncMock(return_value=mock_result)
 
     repo = FileRepository(session=mock_session)
-    result = await repo.delete(1, 1)
+    result = await repo.mark_deleted(1, 1)
 
     assert result is True
+    statement = str(mock_session.execute.call_args.args[0])
+    assert statement.startswith("UPDATE file SET")
+    assert "file.deleted_at IS NULL" in statement
     mock_session.commit.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_delete_not_found(mock_session: MagicMock) -> None:
+async def test_mark_deleted_not_found(mock_session: MagicMock) -> None:
     mock_result = MagicMock()
-    mock_result.first.return_value = None
-    mock_session.exec.return_value = mock_result
+    mock_result.scalar_one_or_none.return_value = None
+    mock_session.execute = AsyncMock(return_value=mock_result)
 
     repo = FileRepository(session=mock_session)
-    result = await repo.delete(999, 1)
+    result = await repo.mark_deleted(999, 1)
 
     assert result is False
 
 
+@pytest.mark.asyncio
+async def test_get_deleted(mock_session: MagicMock, mock_file: File) -> None:
+    mock_result = MagicMock()
+    mock_result.all.return_value = [mock_file]
+    mock_session.exec.return_value = mock_result
+
+    repo = FileRepository(session=mock_session)
+    result = await repo.get_deleted(100)
+
+    assert result == [mock_file]
+    assert "file.deleted_at IS NOT NULL" in str(mock_session.exec.call_args.args[0])
+
+
+@pytest.mark.asyncio
+async def test_has_files(mock_session: MagicMock) -> None:
+    mock_result = MagicMock()
+    mock_result.first.return_value = 1
+    mock_session.exec.return_value = mock_result
+
+    repo = FileRepository(session=mock_session)
+
+    assert await repo.has_files([FileType.PDF, FileType.DOCX]) is True
+    statement = str(mock_session.exec.call_args.args[0])
+    assert "file.file_type IN" in statement
+    assert "file.deleted_at IS NULL" in statement
+
+
 @pytest.mark.asyncio
 async def test_get_all(mock_session: MagicMock) -> None:
     files = [File(id=i, filename=f"file{i}.pdf", original_filename=f"file{i}.pdf", file_path=f"/path/file{i}.pdf", file_size=1024, file_type=FileType.PDF, user_id=1) for i in range(3)]
@@ -105,3 +150,103 @@ async def test_get_all(mock_session: MagicMock) -> None:
 
     assert isinstance(result, Sequence)
     assert len(result) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_page(mock_session: MagicMock, mock_file: File) -> None:
+    mock_result = MagicMock()
+    mock_result.all.return_value = [mock_file]
+    mock_session.exec.return_value = mock_result
+
+    repo = FileRepository(session=mock_session)
+    result = await repo.get_page(10, (datetime(2026, 1, 1), 5), user_id=1, file_type=FileType.PDF)
+
+    assert result == [mock_file]
+    statement = str(mock_session.exec.call_args.args[0])
+    assert "ORDER BY file.created_at DESC, file.id DESC" in statement
+    assert "(file.created_at, file.id) < (" in statement
+
+
+@pytest.mark.asyncio
+async def test_estimate_count(mock_session: MagicMock) -> None:
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = 120000
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    repo = FileRepository(session=mock_session)
+
+    assert await repo.estimate_count() == 120000
+
+
+@pytest.mark.asyncio
+async def test_estimate_count_without_statistics(mock_session: MagicMock) -> None:
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = -1
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    repo = FileRepository(session=mock_session)
+
+    assert await repo.estimate_count() is None
+
+
+@pytest.mark.asyncio
+async def test_blob_acquire(mock_session: MagicMock) -> None:
+    blob = Blob(id=1, content_hash="abc123", file_path="/blobs/ab/abc123", file_size=1024, ref_count=2)
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.one.return_value = blob
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    repo = BlobRepository(session=mock_session)
+    result = await repo.acquire("abc123", "/blobs/ab/abc123", 1024)
+
+    assert result == blob
+    statement = str(mock_session.execute.call_args.args[0])
+    assert "ON CONFLICT (content_hash) DO UPDATE" in statement
+    mock_session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_blob_acquire_many_locks_in_hash_order(mock_session: MagicMock) -> None:
+    blobs = [
+        Blob(id=1, content_hash="bbb", file_path="/blobs/bb/bbb", file_size=10, ref_count=1),
+        Blob(id=2, content_hash="aaa", file_path="/blobs/aa/aaa", file_size=20, ref_count=3),
+    ]
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = blobs
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    repo = BlobRepository(session=mock_session)
+    result = await repo.acquire_many([("bbb", "/blobs/bb/bbb", 10), ("aaa", "/blobs/aa/aaa", 20)])
+
+    assert result == {"bbb": blobs[0], "aaa": blobs[1]}
+    params = mock_session.execute.call_args.args[0].compile(dialect=postgresql.dialect()).params
+    assert [params["content_hash_m0"], params["content_hash_m1"]] == ["aaa", "bbb"]
+    assert await repo.acquire_many([]) == {}
+    mock_session.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_blob_release(mock_session: MagicMock) -> None:
+    mock_delete_result = MagicMock()
+    mock_delete_result.scalars.return_value.all.return_value = ["/blobs/ab/abc123"]
+    mock_session.execute = AsyncMock(side_effect=[MagicMock(), MagicMock(), mock_delete_result])
+
+    repo = BlobRepository(session=mock_session)
+    result = await repo.release([1, 2, 2])
+
+    assert result == ["/blobs/ab/abc123"]
+    decrements = [call.args[0].compile().params for call in mock_session.execute.call_args_list[:2]]
+    assert sorted(params["ref_count_1"] for params in decrements) == [1, 2]
+    mock_session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_blob_release_shared(mock_session: MagicMock) -> None:
+    mock_delete_result = MagicMock()
+    mock_delete_result.scalars.return_value.all.return_value = []
+    mock_session.execute = AsyncMock(side_effect=[MagicMock(), mock_delete_result])
+
+    repo = BlobRepository(session=mock_session)
+    result = await repo.release([1])
+
+    assert result == []
@@ -1,169 +1,619 @@
+import hashlib
+from collections.abc import Callable
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from app.modules.files.exceptions import UnsupportedFileTypeError
-from app.modules.files.models import File
-from app.modules.files.repository import FileRepository
-from app.modules.files.schema import FileContentResponse, FileType
+from app.core.storage import LocalStorage, Storage
+from app.modules.files.exceptions import FileTooLargeError, InvalidCursorError, UnsupportedFileTypeError
+from app.modules.files.models import Blob, File
+from app.modules.files.repository import BlobRepository, FileRepository
+from app.modules.files.schema import FileDownload, FileType, UploadStatus
 from app.modules.files.service import FileService
 from app.modules.rag.services import VectorStoreManager
 
 
+def _upload(filename: str, content: bytes, chunk_size: int = 4) -> MagicMock:
+    upload = MagicMock()
+    upload.filename = filename
+    chunks = [content[i : i + chunk_size] for i in range(0, len(content), chunk_size)] + [b""]
+    upload.read = AsyncMock(side_effect=chunks)
+    return upload
+
+
+def _stored_files(storage_dir: Path) -> dict[str, bytes]:
+    return {path.name: path.read_bytes() for path in storage_dir.rglob("*") if path.is_file()}
+
+
+def _acquire_blob(ref_count: int) -> Callable[[str, str, int], Blob]:
+    def acquire(content_hash: str, file_path: str, file_size: int) -> Blob:
+        return Blob(id=7, content_hash=content_hash, file_path=file_path, file_size=file_size, ref_count=ref_count)
+
+    return acquire
+
+
+def _acquire_blobs(acquire: Callable[[str, str, int], Blob]) -> Callable[[list[tuple[str, str, int]]], dict[str, Blob]]:
+    def acquire_many(blobs: list[tuple[str, str, int]]) -> dict[str, Blob]:
+        return {
+            content_hash: acquire(content_hash, file_path, file_size) for content_hash, file_path, file_size in blobs
+        }
+
+    return acquire_many
+
+
 @pytest.mark.asyncio
-async def test_save_file_new_file(mock_session: MagicMock, mock_file: File, sample_file_content: bytes) -> None:
+async def test_save_file_new_file(tmp_path: Path, mock_file: File, sample_file_content: bytes) -> None:
     mock_file_repo = MagicMock(spec=FileRepository)
     mock_file_repo.get_by_hash = AsyncMock(return_value=None)
     mock_file_repo.create = AsyncMock(return_value=mock_file)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
+    mock_blob_repo.acquire = AsyncMock(side_effect=_acquire_blob(ref_count=1))
     mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = LocalStorage(tmp_path)
+    content_hash = hashlib.sha256(sample_file_content).hexdigest()
+
+    with patch("app.modules.files.service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = tmp_path
+        mock_settings.MAX_UPLOAD_BYTES = 1024
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
+        result = await service.save_file(_upload("test.pdf", sample_file_content), 1)
+
+    assert result == mock_file
+    blob_key = f"blobs/{content_hash[:2]}/{content_hash}"
+    mock_blob_repo.acquire.assert_called_once_with(content_hash, blob_key, len(sample_file_content))
+    file_record = mock_file_repo.create.call_args.args[0]
+    assert file_record.content_hash == content_hash
+    assert file_record.file_size == len(sample_file_content)
+    assert file_record.file_path == blob_key
+    assert file_record.blob_id == 7
+    assert _stored_files(tmp_path) == {content_hash: sample_file_content}
 
-    with patch("aiofiles.open", create=True) as mock_open:
-        mock_file_obj = MagicMock()
-        mock_file_obj.__aenter__ = AsyncMock(return_value=mock_file_obj)
-        mock_file_obj.__aexit__ = AsyncMock()
-        mock_file_obj.write = AsyncMock()
-        mock_open.return_value = mock_file_obj
 
-        with patch("app.modules.files.service.settings") as mock_settings:
-            mock_settings.STORAGE_DIR = Path("/tmp")
-            service = FileService(file_repository=mock_file_repo, vector_store=mock_vector_store)
-            result = await service.save_file(sample_file_content, "test.pdf", 1)
+@pytest.mark.asyncio
+async def test_save_file_shared_blob(tmp_path: Path, mock_file: File, sample_file_content: bytes) -> None:
+    content_hash = hashlib.sha256(sample_file_content).hexdigest()
+    blob_path = tmp_path / "blobs" / content_hash[:2] / content_hash
+    blob_path.parent.mkdir(parents=True)
+    blob_path.write_bytes(sample_file_content)
+    mock_file_repo = MagicMock(spec=FileRepository)
+    mock_file_repo.get_by_hash = AsyncMock(return_value=None)
+    mock_file_repo.create = AsyncMock(return_value=mock_file)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
+    mock_blob_repo.acquire = AsyncMock(side_effect=_acquire_blob(ref_count=2))
+    mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = LocalStorage(tmp_path)
 
-            assert result == mock_file
+    with patch("app.modules.files.service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = tmp_path
+        mock_settings.MAX_UPLOAD_BYTES = 1024
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
+        await service.save_file(_upload("test.pdf", sample_file_content), 2)
+
+    file_record = mock_file_repo.create.call_args.args[0]
+    assert file_record.file_path == f"blobs/{content_hash[:2]}/{content_hash}"
+    assert file_record.user_id == 2
+    assert _stored_files(tmp_path) == {content_hash: sample_file_content}
 
 
 @pytest.mark.asyncio
-async def test_save_file_existing_file(mock_session: MagicMock, mock_file: File, sample_file_content: bytes) -> None:
+async def test_save_file_existing_file(tmp_path: Path, mock_file: File, sample_file_content: bytes) -> None:
     mock_file_repo = MagicMock(spec=FileRepository)
     mock_file_repo.get_by_hash = AsyncMock(return_value=mock_file)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
     mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
 
     with patch("app.modules.files.service.settings") as mock_settings:
-        mock_settings.STORAGE_DIR = Path("/tmp")
-        service = FileService(file_repository=mock_file_repo, vector_store=mock_vector_store)
-        result = await service.save_file(sample_file_content, "test.pdf", 1)
+        mock_settings.STORAGE_DIR = tmp_path
+        mock_settings.MAX_UPLOAD_BYTES = 1024
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
+        result = await service.save_file(_upload("test.pdf", sample_file_content), 1)
 
-        assert result == mock_file
+    assert result == mock_file
+    assert _stored_files(tmp_path) == {}
+    mock_file_repo.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_save_file_too_large(tmp_path: Path) -> None:
+    mock_file_repo = MagicMock(spec=FileRepository)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
+    mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
+    upload = _upload("test.pdf", b"x" * 40)
+
+    with patch("app.modules.files.service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = tmp_path
+        mock_settings.MAX_UPLOAD_BYTES = 10
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
+        with pytest.raises(FileTooLargeError):
+            await service.save_file(upload, 1)
+
+    assert upload.read.call_count == 3
+    assert _stored_files(tmp_path) == {}
+    mock_file_repo.get_by_hash.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_save_file_unsupported_type(mock_session: MagicMock, sample_file_content: bytes) -> None:
     mock_file_repo = MagicMock(spec=FileRepository)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
     mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
 
     with patch("app.modules.files.service.settings") as mock_settings:
         mock_settings.STORAGE_DIR = Path("/tmp")
-        service = FileService(file_repository=mock_file_repo, vector_store=mock_vector_store)
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
         with pytest.raises(UnsupportedFileTypeError):
-            await service.save_file(sample_file_content, "test.txt", 1)
+            await service.save_file(_upload("test.txt", sample_file_content), 1)
+
+
+def _assign_ids(file_records: list[File]) -> list[File]:
+    for file_id, file_record in enumerate(file_records, start=10):
+        file_record.id = file_id
+    return file_records
+
+
+@pytest.mark.asyncio
+async def test_save_files_batch(tmp_path: Path, sample_file_content: bytes) -> None:
+    mock_file_repo = MagicMock(spec=FileRepository)
+    mock_file_repo.get_by_hashes = AsyncMock(return_value={})
+    mock_file_repo.create_batch = AsyncMock(side_effect=_assign_ids)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
+    mock_blob_repo.acquire_many = AsyncMock(side_effect=_acquire_blobs(_acquire_blob(ref_count=1)))
+    mock_vector_store = MagicMock(spec=VectorStoreManager)
+    other_content = b"other document"
+    uploads = [
+        _upload("first.pdf", sample_file_content),
+        _upload("copy.pdf", sample_file_content),
+        _upload("second.docx", other_content),
+        _upload("notes.txt", b"text"),
+        _upload("huge.pdf", b"x" * 2048),
+    ]
+
+    with patch("app.modules.files.service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = tmp_path
+        mock_settings.MAX_UPLOAD_BYTES = 1024
+        mock_settings.UPLOAD_BATCH_CONCURRENCY = 2
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=LocalStorage(tmp_path),
+        )
+        results = await service.save_files(uploads, 1)
+
+    assert [result.status for result in results] == [
+        UploadStatus.CREATED,
+        UploadStatus.DUPLICATE,
+        UploadStatus.CREATED,
+        UploadStatus.FAILED,
+        UploadStatus.FAILED,
+    ]
+    assert results[0].file.id == results[1].file.id == 10
+    assert results[2].file.id == 11
+    assert results[3].error == "Unsupported file type"
+    assert "maximum size" in results[4].error
+    mock_file_repo.create_batch.assert_called_once()
+    assert [file.original_filename for file in mock_file_repo.create_batch.call_args.args[0]] == [
+        "first.pdf",
+        "second.docx",
+    ]
+    assert sorted(_stored_files(tmp_path).values()) == sorted([sample_file_content, other_content])
+
+
+@pytest.mark.asyncio
+async def test_save_files_looks_up_and_acquires_blobs_in_one_call_each(tmp_path: Path) -> None:
+    contents = [b"zeta document", b"alpha document", b"mid document"]
+    mock_file_repo = MagicMock(spec=FileRepository)
+    mock_file_repo.get_by_hashes = AsyncMock(return_value={})
+    mock_file_repo.create_batch = AsyncMock(side_effect=_assign_ids)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
+    mock_blob_repo.acquire_many = AsyncMock(side_effect=_acquire_blobs(_acquire_blob(ref_count=1)))
+
+    with patch("app.modules.files.service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = tmp_path
+        mock_settings.MAX_UPLOAD_BYTES = 1024
+        mock_settings.UPLOAD_BATCH_CONCURRENCY = 2
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=MagicMock(spec=VectorStoreManager),
+            storage=LocalStorage(tmp_path),
+        )
+        results = await service.save_files([_upload(f"{i}.pdf", content) for i, content in enumerate(contents)], 1)
+
+    hashes = [hashlib.sha256(content).hexdigest() for content in contents]
+    assert [result.status for result in results] == [UploadStatus.CREATED] * 3
+    mock_file_repo.get_by_hashes.assert_awaited_once_with(hashes, 1)
+    mock_blob_repo.acquire_many.assert_awaited_once()
+    assert [blob[0] for blob in mock_blob_repo.acquire_many.call_args.args[0]] == hashes
+
+
+class _FailingStorage(LocalStorage):
+    def __init__(self, root: Path, failing_key: str) -> None:
+        super().__init__(root)
+        self.failing_key = failing_key
+
+    async def put(self, key: str, source: Path) -> None:
+        if key == self.failing_key:
+            raise OSError("storage unavailable")
+        await super().put(key, source)
+
+
+@pytest.mark.asyncio
+async def test_save_files_marks_failed_writes(tmp_path: Path, sample_file_content: bytes) -> None:
+    blob_ids = iter(range(20, 30))
+
+    def acquire(content_hash: str, file_path: str, file_size: int) -> Blob:
+        return Blob(id=next(blob_ids), content_hash=content_hash, file_path=file_path, file_size=file_size, ref_count=1)
+
+    other_content = b"other document"
+    failing_hash = hashlib.sha256(other_content).hexdigest()
+    mock_file_repo = MagicMock(spec=FileRepository)
+    mock_file_repo.get_by_hashes = AsyncMock(return_value={})
+    mock_file_repo.create_batch = AsyncMock(side_effect=_assign_ids)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
+    mock_blob_repo.acquire_many = AsyncMock(side_effect=_acquire_blobs(acquire))
+    mock_blob_repo.release = AsyncMock(return_value=[f"blobs/{failing_hash[:2]}/{failing_hash}"])
+    uploads = [
+        _upload("first.pdf", sample_file_content),
+        _upload("second.pdf", other_content),
+        _upload("second-copy.pdf", other_content),
+    ]
+
+    with patch("app.modules.files.service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = tmp_path
+        mock_settings.MAX_UPLOAD_BYTES = 1024
+        mock_settings.UPLOAD_BATCH_CONCURRENCY = 2
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=MagicMock(spec=VectorStoreManager),
+            storage=_FailingStorage(tmp_path, f"blobs/{failing_hash[:2]}/{failing_hash}"),
+        )
+        results = await service.save_files(uploads, 1)
+
+    assert [result.status for result in results] == [UploadStatus.CREATED, UploadStatus.FAILED, UploadStatus.FAILED]
+    assert results[1].error == results[2].error == "storage unavailable"
+    mock_blob_repo.release.assert_called_once_with([21])
+    assert [file.original_filename for file in mock_file_repo.create_batch.call_args.args[0]] == ["first.pdf"]
+    assert _stored_files(tmp_path) == {hashlib.sha256(sample_file_content).hexdigest(): sample_file_content}
+
+
+@pytest.mark.asyncio
+async def test_save_files_removes_written_blobs_when_records_fail(tmp_path: Path, sample_file_content: bytes) -> None:
+    mock_file_repo = MagicMock(spec=FileRepository)
+    mock_file_repo.get_by_hashes = AsyncMock(return_value={})
+    mock_file_repo.create_batch = AsyncMock(side_effect=RuntimeError("connection lost"))
+    mock_blob_repo = MagicMock(spec=BlobRepository)
+    mock_blob_repo.acquire_many = AsyncMock(side_effect=_acquire_blobs(_acquire_blob(ref_count=1)))
+
+    with patch("app.modules.files.service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = tmp_path
+        mock_settings.MAX_UPLOAD_BYTES = 1024
+        mock_settings.UPLOAD_BATCH_CONCURRENCY = 2
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=MagicMock(spec=VectorStoreManager),
+            storage=LocalStorage(tmp_path),
+        )
+        with pytest.raises(RuntimeError):
+            await service.save_files([_upload("first.pdf", sample_file_content)], 1)
+
+    mock_file_repo.rollback.assert_awaited_once()
+    assert _stored_files(tmp_path) == {}
+
+
+@pytest.mark.asyncio
+async def test_save_files_existing_file(tmp_path: Path, mock_file: File, sample_file_content: bytes) -> None:
+    mock_file_repo = MagicMock(spec=FileRepository)
+    mock_file_repo.get_by_hashes = AsyncMock(return_value={hashlib.sha256(sample_file_content).hexdigest(): mock_file})
+    mock_file_repo.create_batch = AsyncMock(side_effect=_assign_ids)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
+    mock_vector_store = MagicMock(spec=VectorStoreManager)
+
+    with patch("app.modules.files.service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = tmp_path
+        mock_settings.MAX_UPLOAD_BYTES = 1024
+        mock_settings.UPLOAD_BATCH_CONCURRENCY = 4
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=LocalStorage(tmp_path),
+        )
+        results = await service.save_files([_upload("test.pdf", sample_file_content)], 1)
+
+    assert results[0].status == UploadStatus.DUPLICATE
+    assert results[0].file.id == mock_file.id
+    mock_blob_repo.acquire_many.assert_called_once_with([])
+    assert _stored_files(tmp_path) == {}
 
 
 @pytest.mark.asyncio
 async def test_get_file(mock_session: MagicMock, mock_file: File) -> None:
     mock_file_repo = MagicMock(spec=FileRepository)
     mock_file_repo.get_by_id = AsyncMock(return_value=mock_file)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
     mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
 
     with patch("app.modules.files.service.settings") as mock_settings:
         mock_settings.STORAGE_DIR = Path("/tmp")
-        service = FileService(file_repository=mock_file_repo, vector_store=mock_vector_store)
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
         result = await service.get_file(1, 1)
 
         assert result == mock_file
 
 
 @pytest.mark.asyncio
-async def test_get_files(mock_session: MagicMock) -> None:
+async def test_get_files_page(mock_session: MagicMock) -> None:
     mock_file_repo = MagicMock(spec=FileRepository)
-    files = [File(id=i, filename=f"file{i}.pdf", original_filename=f"file{i}.pdf", file_path=f"/path/file{i}.pdf", file_size=1024, file_type=FileType.PDF, user_id=1) for i in range(3)]
-    mock_file_repo.get_all = AsyncMock(return_value=files)
+    files = [
+        File(
+            id=i,
+            filename=f"file{i}.pdf",
+            original_filename=f"file{i}.pdf",
+            file_path=f"/path/file{i}.pdf",
+            file_size=1024,
+            file_type=FileType.PDF,
+            user_id=1,
+            created_at=datetime(2026, 1, 1, 12, 0, i),
+        )
+        for i in range(3, 0, -1)
+    ]
+    mock_file_repo.get_page = AsyncMock(side_effect=[files, files[2:]])
+    mock_blob_repo = MagicMock(spec=BlobRepository)
     mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
 
     with patch("app.modules.files.service.settings") as mock_settings:
         mock_settings.STORAGE_DIR = Path("/tmp")
-        service = FileService(file_repository=mock_file_repo, vector_store=mock_vector_store)
-        result = await service.get_files()
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
+        first_page, cursor = await service.get_files_page(2, user_id=1, file_type=FileType.PDF)
+        second_page, last_cursor = await service.get_files_page(2, cursor)
+
+    assert [file.id for file in first_page] == [3, 2]
+    assert [file.id for file in second_page] == [1]
+    assert last_cursor is None
+    mock_file_repo.get_page.assert_any_call(3, None, 1, FileType.PDF)
+    mock_file_repo.get_page.assert_called_with(3, (datetime(2026, 1, 1, 12, 0, 2), 2), None, None)
 
-        assert len(result) == 3
+
+@pytest.mark.asyncio
+async def test_get_files_page_invalid_cursor(mock_session: MagicMock) -> None:
+    mock_file_repo = MagicMock(spec=FileRepository)
+
+    with patch("app.modules.files.service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = Path("/tmp")
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=MagicMock(spec=BlobRepository),
+            vector_store=MagicMock(spec=VectorStoreManager),
+            storage=MagicMock(spec=Storage),
+        )
+        with pytest.raises(InvalidCursorError):
+            await service.get_files_page(10, "not-a-cursor")
 
 
 @pytest.mark.asyncio
-async def test_delete_file_success(mock_session: MagicMock, mock_file: File) -> None:
+async def test_delete_file_marks_file_deleted(mock_session: MagicMock) -> None:
     mock_file_repo = MagicMock(spec=FileRepository)
-    mock_file_repo.get_by_id = AsyncMock(return_value=mock_file)
-    mock_file_repo.delete = AsyncMock(return_value=True)
+    mock_file_repo.mark_deleted = AsyncMock(return_value=True)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
     mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
 
     with patch("app.modules.files.service.settings") as mock_settings:
         mock_settings.STORAGE_DIR = Path("/tmp")
-        with patch("pathlib.Path.exists", return_value=True):
-            with patch("pathlib.Path.unlink") as mock_unlink:
-                service = FileService(file_repository=mock_file_repo, vector_store=mock_vector_store)
-                result = await service.delete_file(1, 1)
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
+        result = await service.delete_file(1, 1)
 
-                assert result is True
-                mock_unlink.assert_called_once()
+    assert result is True
+    mock_file_repo.mark_deleted.assert_called_once_with(1, 1)
+    mock_storage.delete.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_delete_file_not_found(mock_session: MagicMock) -> None:
     mock_file_repo = MagicMock(spec=FileRepository)
-    mock_file_repo.get_by_id = AsyncMock(return_value=None)
+    mock_file_repo.mark_deleted = AsyncMock(return_value=False)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
     mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
 
     with patch("app.modules.files.service.settings") as mock_settings:
         mock_settings.STORAGE_DIR = Path("/tmp")
-        service = FileService(file_repository=mock_file_repo, vector_store=mock_vector_store)
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
         result = await service.delete_file(999, 1)
 
         assert result is False
 
 
 @pytest.mark.asyncio
-async def test_get_file_content_success(mock_session: MagicMock, mock_file: File) -> None:
+async def test_get_file_download_success(mock_session: MagicMock, mock_file: File) -> None:
+    mock_file_repo = MagicMock(spec=FileRepository)
+    mock_file_repo.get_by_id = AsyncMock(return_value=mock_file)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
+    mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
+
+    mock_storage.exists = AsyncMock(return_value=True)
+
+    with patch("app.modules.files.service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = Path("/tmp")
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
+        result = await service.get_file_download(1, 1)
+
+    assert isinstance(result, FileDownload)
+    assert result.file_path == mock_file.file_path
+    assert result.file_size == mock_file.file_size
+    assert result.content_type == "application/pdf"
+    assert result.etag == '"abc123"'
+    assert result.not_modified is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("if_none_match", ['"abc123"', 'W/"abc123"', '"other", "abc123"', "*"])
+async def test_get_file_download_not_modified_skips_disk(
+    mock_session: MagicMock, mock_file: File, if_none_match: str
+) -> None:
     mock_file_repo = MagicMock(spec=FileRepository)
     mock_file_repo.get_by_id = AsyncMock(return_value=mock_file)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
     mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
+    with patch("app.modules.files.service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = Path("/tmp")
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
+        result = await service.get_file_download(1, 1, if_none_match)
+
+    assert result is not None
+    assert result.not_modified is True
+    mock_storage.exists.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_file_download_stale_etag(mock_session: MagicMock, mock_file: File) -> None:
+    mock_file_repo = MagicMock(spec=FileRepository)
+    mock_file_repo.get_by_id = AsyncMock(return_value=mock_file)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
+    mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
+
+    mock_storage.exists = AsyncMock(return_value=True)
 
     with patch("app.modules.files.service.settings") as mock_settings:
         mock_settings.STORAGE_DIR = Path("/tmp")
-        with patch("pathlib.Path.exists", return_value=True):
-            with patch("aiofiles.open", create=True) as mock_open:
-                mock_file_obj = MagicMock()
-                mock_file_obj.__aenter__ = AsyncMock(return_value=mock_file_obj)
-                mock_file_obj.__aexit__ = AsyncMock()
-                mock_file_obj.read = AsyncMock(return_value=b"file content")
-                mock_open.return_value = mock_file_obj
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
+        result = await service.get_file_download(1, 1, '"stale"')
+
+    assert result is not None
+    assert result.not_modified is False
+
+
+@pytest.mark.asyncio
+async def test_get_file_download_missing_on_disk(mock_session: MagicMock, mock_file: File) -> None:
+    mock_file_repo = MagicMock(spec=FileRepository)
+    mock_file_repo.get_by_id = AsyncMock(return_value=mock_file)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
+    mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
 
-                service = FileService(file_repository=mock_file_repo, vector_store=mock_vector_store)
-                result = await service.get_file_content(1, 1)
+    mock_storage.exists = AsyncMock(return_value=False)
+
+    with patch("app.modules.files.service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = Path("/tmp")
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
+        result = await service.get_file_download(1, 1)
 
-                assert isinstance(result, FileContentResponse)
-                assert result.content == b"file content"
+    assert result is None
 
 
 @pytest.mark.asyncio
-async def test_get_file_content_not_found(mock_session: MagicMock) -> None:
+async def test_get_file_download_not_found(mock_session: MagicMock) -> None:
     mock_file_repo = MagicMock(spec=FileRepository)
     mock_file_repo.get_by_id = AsyncMock(return_value=None)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
     mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
 
     with patch("app.modules.files.service.settings") as mock_settings:
         mock_settings.STORAGE_DIR = Path("/tmp")
-        service = FileService(file_repository=mock_file_repo, vector_store=mock_vector_store)
-        result = await service.get_file_content(999, 1)
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
+        result = await service.get_file_download(999, 1)
 
         assert result is None
 
 
 def test_get_file_type_pdf(mock_session: MagicMock) -> None:
     mock_file_repo = MagicMock(spec=FileRepository)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
     mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
 
     with patch("app.modules.files.service.settings") as mock_settings:
         mock_settings.STORAGE_DIR = Path("/tmp")
-        service = FileService(file_repository=mock_file_repo, vector_store=mock_vector_store)
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
         file_type = service._get_file_type("test.pdf")
 
         assert file_type == FileType.PDF
@@ -171,11 +621,18 @@ def test_get_file_type_pdf(mock_session: MagicMock) -> None:
 
 def test_get_file_type_docx(mock_session: MagicMock) -> None:
     mock_file_repo = MagicMock(spec=FileRepository)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
     mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
 
     with patch("app.modules.files.service.settings") as mock_settings:
         mock_settings.STORAGE_DIR = Path("/tmp")
-        service = FileService(file_repository=mock_file_repo, vector_store=mock_vector_store)
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
         file_type = service._get_file_type("test.docx")
 
         assert file_type == FileType.DOCX
@@ -183,10 +640,17 @@ def test_get_file_type_docx(mock_session: MagicMock) -> None:
 
 def test_get_file_type_unsupported(mock_session: MagicMock) -> None:
     mock_file_repo = MagicMock(spec=FileRepository)
+    mock_blob_repo = MagicMock(spec=BlobRepository)
     mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_storage = MagicMock(spec=Storage)
 
     with patch("app.modules.files.service.settings") as mock_settings:
         mock_settings.STORAGE_DIR = Path("/tmp")
-        service = FileService(file_repository=mock_file_repo, vector_store=mock_vector_store)
+        service = FileService(
+            file_repository=mock_file_repo,
+            blob_repository=mock_blob_repo,
+            vector_store=mock_vector_store,
+            storage=mock_storage,
+        )
         with pytest.raises(UnsupportedFileTypeError):
             service._get_file_type("test.txt")
@@ -2,6 +2,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from app.modules.files.schema import FileType
 from app.modules.rag.models import DocumentChunk
 from app.modules.rag.repositories.document_chunk import DocumentChunkRepository
 
@@ -9,14 +10,15 @@ from app.modules.rag.repositories.document_chunk import DocumentChunkRepository
 @pytest.mark.asyncio
 async def test_create_batch(mock_session: MagicMock) -> None:
     chunks = [DocumentChunk(id=i, text=f"text{i}", embedding=[0.1] * 384, file_id=1, chunk_index=i) for i in range(3)]
-    mock_session.refresh = AsyncMock()
 
     repo = DocumentChunkRepository(session=mock_session)
     result = await repo.create_batch(chunks)
 
     assert len(result) == 3
     mock_session.add.assert_called()
-    mock_session.commit.assert_called_once()
+    mock_session.flush.assert_called_once()
+    mock_session.commit.assert_not_called()
+    mock_session.refresh.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -32,6 +34,7 @@ async def test_search_by_embedding(mock_session: MagicMock, mock_document_chunk:
 
     assert len(result) == 1
     assert result[0] == mock_document_chunk
+    assert "file.deleted_at IS NULL" in str(mock_session.exec.call_args.args[0])
 
 
 @pytest.mark.asyncio
@@ -59,6 +62,19 @@ async def test_get_by_file_id_and_chunk_index(mock_session: MagicMock, mock_docu
     assert result == mock_document_chunk
 
 
+@pytest.mark.asyncio
+async def test_get_ids_by_positions(mock_session: MagicMock) -> None:
+    mock_result = MagicMock()
+    mock_result.all.return_value = [(1, 0, 10), (2, 3, 20)]
+    mock_session.exec.return_value = mock_result
+
+    repo = DocumentChunkRepository(session=mock_session)
+    result = await repo.get_ids_by_positions([(1, 0), (2, 3), (4, 5)])
+
+    assert result == {(1, 0): 10, (2, 3): 20}
+    assert "(document_chunks.file_id, document_chunks.chunk_index) IN" in str(mock_session.exec.call_args.args[0])
+
+
 @pytest.mark.asyncio
 async def test_chunk_exists_true(mock_session: MagicMock, mock_document_chunk: DocumentChunk) -> None:
     mock_result = MagicMock()
@@ -81,3 +97,51 @@ async def test_chunk_exists_false(mock_session: MagicMock) -> None:
     result = await repo.chunk_exists(999)
 
     assert result is False
+
+
+@pytest.mark.asyncio
+async def test_get_pending_file_ids(mock_session: MagicMock) -> None:
+    mock_result = MagicMock()
+    mock_result.all.return_value = [2, 3]
+    mock_session.exec.return_value = mock_result
+
+    repo = DocumentChunkRepository(session=mock_session)
+    result = await repo.get_pending_file_ids([FileType.PDF, FileType.DOCX])
+
+    assert result == [2, 3]
+    statement = str(mock_session.exec.call_args.args[0])
+    assert "NOT (EXISTS (SELECT document_chunks.id" in statement
+    assert "file.deleted_at IS NULL" in statement
+
+
+@pytest.mark.asyncio
+async def test_update_summaries(mock_session: MagicMock) -> None:
+    repo = DocumentChunkRepository(session=mock_session)
+    await repo.update_summaries({1: "summary one", 2: "summary two"})
+
+    params = mock_session.execute.call_args.args[1]
+    assert params == [{"id": 1, "summary": "summary one"}, {"id": 2, "summary": "summary two"}]
+    mock_session.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_update_summaries_empty(mock_session: MagicMock) -> None:
+    repo = DocumentChunkRepository(session=mock_session)
+    await repo.update_summaries({})
+
+    mock_session.execute.assert_not_called()
+    mock_session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_by_file_ids(mock_session: MagicMock) -> None:
+    mock_session.execute = AsyncMock(return_value=MagicMock(rowcount=500))
+
+    repo = DocumentChunkRepository(session=mock_session)
+    result = await repo.delete_by_file_ids([1, 2], 500)
+
+    assert result == 500
+    statement = str(mock_session.execute.call_args.args[0])
+    assert statement.startswith("DELETE FROM document_chunks")
+    assert "LIMIT" in statement
+    mock_session.commit.assert_called_once()
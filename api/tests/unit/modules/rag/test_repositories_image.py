@@ -2,21 +2,46 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from app.modules.rag.models import Image
+from app.modules.rag.models import ChunkImage, Image
 from app.modules.rag.repositories.image import ImageRepository
 
 
 @pytest.mark.asyncio
 async def test_create_batch(mock_session: MagicMock) -> None:
-    images = [Image(id=i, chunk_id=1, image_data=f"image{i}", file_id=1, image_index=i) for i in range(3)]
-    mock_session.refresh = AsyncMock()
+    images = [Image(id=i, image_data=f"image{i}", file_id=1) for i in range(3)]
 
     repo = ImageRepository(session=mock_session)
     result = await repo.create_batch(images)
 
     assert len(result) == 3
     mock_session.add.assert_called()
-    mock_session.commit.assert_called_once()
+    mock_session.flush.assert_called_once()
+    mock_session.commit.assert_not_called()
+    mock_session.refresh.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_by_id(mock_session: MagicMock, mock_image: Image) -> None:
+    mock_result = MagicMock()
+    mock_result.first.return_value = mock_image
+    mock_session.exec.return_value = mock_result
+
+    repo = ImageRepository(session=mock_session)
+    result = await repo.get_by_id(1)
+
+    assert result == mock_image
+
+
+@pytest.mark.asyncio
+async def test_get_inline(mock_session: MagicMock, mock_image: Image) -> None:
+    mock_result = MagicMock()
+    mock_result.all.return_value = [mock_image]
+    mock_session.exec.return_value = mock_result
+
+    repo = ImageRepository(session=mock_session)
+    result = await repo.get_inline(100)
+
+    assert result == [mock_image]
 
 
 @pytest.mark.asyncio
@@ -35,20 +60,29 @@ async def test_get_by_chunk_id(mock_session: MagicMock, mock_image: Image) -> No
 
 @pytest.mark.asyncio
 async def test_get_by_chunk_ids(mock_session: MagicMock) -> None:
-    images = [Image(id=i, chunk_id=1, image_data=f"image{i}", file_id=1, image_index=i) for i in range(3)]
+    images = [Image(id=i, image_data=f"image{i}", file_id=1) for i in range(3)]
     mock_result = MagicMock()
-    mock_result.all.return_value = images
+    mock_result.all.return_value = [(1, images[0]), (1, images[1]), (2, images[2])]
     mock_session.exec.return_value = mock_result
 
     repo = ImageRepository(session=mock_session)
     result = await repo.get_by_chunk_ids([1, 2])
 
-    assert len(result) == 3
+    assert result == {1: images[:2], 2: images[2:]}
+
+
+@pytest.mark.asyncio
+async def test_get_by_chunk_ids_empty(mock_session: MagicMock) -> None:
+    repo = ImageRepository(session=mock_session)
+    result = await repo.get_by_chunk_ids([])
+
+    assert result == {}
+    mock_session.exec.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_get_by_file_id(mock_session: MagicMock) -> None:
-    images = [Image(id=i, chunk_id=1, image_data=f"image{i}", file_id=1, image_index=i) for i in range(3)]
+    images = [Image(id=i, image_data=f"image{i}", file_id=1) for i in range(3)]
     mock_result = MagicMock()
     mock_result.all.return_value = images
     mock_session.exec.return_value = mock_result
@@ -60,15 +94,93 @@ async def test_get_by_file_id(mock_session: MagicMock) -> None:
 
 
 @pytest.mark.asyncio
-async def test_delete_by_file_id(mock_session: MagicMock) -> None:
-    images = [Image(id=i, chunk_id=1, image_data=f"image{i}", file_id=1, image_index=i) for i in range(3)]
+async def test_get_links_by_file_id(mock_session: MagicMock) -> None:
+    links = [ChunkImage(chunk_id=1, image_id=i, image_index=i) for i in range(3)]
     mock_result = MagicMock()
-    mock_result.all.return_value = images
+    mock_result.all.return_value = links
     mock_session.exec.return_value = mock_result
-    mock_session.delete = AsyncMock()
+
+    repo = ImageRepository(session=mock_session)
+    result = await repo.get_links_by_file_id(1)
+
+    assert result == links
+
+
+@pytest.mark.asyncio
+async def test_create_links(mock_session: MagicMock) -> None:
+    links = [ChunkImage(chunk_id=i, image_id=1, image_index=0) for i in range(3)]
+
+    repo = ImageRepository(session=mock_session)
+    result = await repo.create_links(links)
+
+    assert result == links
+    mock_session.add_all.assert_called_once_with(links)
+    mock_session.flush.assert_called_once()
+    mock_session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_by_file_id(mock_session: MagicMock) -> None:
+    mock_session.execute = AsyncMock(return_value=MagicMock(rowcount=3))
 
     repo = ImageRepository(session=mock_session)
     result = await repo.delete_by_file_id(1)
 
     assert result == 3
+    assert str(mock_session.execute.call_args.args[0]).startswith("DELETE FROM images")
     mock_session.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_by_file_ids(mock_session: MagicMock) -> None:
+    mock_result = MagicMock()
+    mock_result.all.return_value = [("images/ab/abc", "images/cd/cde"), (None, None)]
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    repo = ImageRepository(session=mock_session)
+    result = await repo.delete_by_file_ids([1, 2], 500)
+
+    assert result == [("images/ab/abc", "images/cd/cde"), (None, None)]
+    statement = str(mock_session.execute.call_args.args[0])
+    assert "LIMIT" in statement
+    assert "RETURNING images.storage_key, images.thumbnail_key" in statement
+    mock_session.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_referenced_keys(mock_session: MagicMock) -> None:
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = ["images/ab/abc"]
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    repo = ImageRepository(session=mock_session)
+    result = await repo.get_referenced_keys(["images/ab/abc", "images/cd/cde"])
+
+    assert result == {"images/ab/abc"}
+
+
+@pytest.mark.asyncio
+async def test_lock_storage_keys(mock_session: MagicMock) -> None:
+    repo = ImageRepository(session=mock_session)
+    await repo.lock_storage_keys([])
+    mock_session.execute.assert_not_called()
+
+    await repo.lock_storage_keys(["images/ab/abc"])
+
+    statement, params = mock_session.execute.call_args.args
+    assert "pg_advisory_xact_lock_shared" in str(statement)
+    assert params == {"keys": ["images/ab/abc"]}
+
+
+@pytest.mark.asyncio
+async def test_try_lock_storage_keys(mock_session: MagicMock) -> None:
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = ["images/ab/abc"]
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    repo = ImageRepository(session=mock_session)
+    result = await repo.try_lock_storage_keys(["images/ab/abc", "images/cd/cde"])
+
+    assert result == {"images/ab/abc"}
+    assert "pg_try_advisory_xact_lock" in str(mock_session.execute.call_args.args[0])
+    assert await repo.try_lock_storage_keys([]) == set()
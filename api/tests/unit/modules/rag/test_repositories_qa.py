@@ -1,15 +1,16 @@
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
-from app.modules.rag.models import Answer, Question
+from app.modules.rag.models import Answer, Question, UserQuestionStats
 from app.modules.rag.repositories.qa import QARepository
-from app.modules.rag.schema import AnswerCreate, QuestionCreate, QuestionStats
+from app.modules.rag.schema import AnswerCreate, QuestionCreate, QuestionStats, RAGStats
 
 
 @pytest.mark.asyncio
 async def test_create_question(mock_session: MagicMock) -> None:
-    mock_session.refresh = AsyncMock()
     question_data = QuestionCreate(question_text="Test?", user_id=1)
 
     repo = QARepository(session=mock_session)
@@ -17,12 +18,13 @@ async def test_create_question(mock_session: MagicMock) -> None:
 
     assert isinstance(result, Question)
     mock_session.add.assert_called_once()
-    mock_session.commit.assert_called_once()
+    mock_session.flush.assert_called_once()
+    mock_session.commit.assert_not_called()
+    mock_session.refresh.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_create_answer(mock_session: MagicMock) -> None:
-    mock_session.refresh = AsyncMock()
     answer_data = AnswerCreate(answer_text="Answer", question_id=1, confidence_score=0.9)
 
     repo = QARepository(session=mock_session)
@@ -30,7 +32,13 @@ async def test_create_answer(mock_session: MagicMock) -> None:
 
     assert isinstance(result, Answer)
     mock_session.add.assert_called_once()
-    mock_session.commit.assert_called_once()
+    mock_session.flush.assert_called_once()
+    mock_session.commit.assert_not_called()
+    mock_session.refresh.assert_not_called()
+    statement = str(mock_session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "INSERT INTO user_question_stats" in statement
+    assert "answer_count = (user_question_stats.answer_count + excluded.answer_count)" in statement
+    assert "question_count = " not in statement
 
 
 @pytest.mark.asyncio
@@ -100,6 +108,40 @@ async def test_get_qa_pairs(mock_session: MagicMock, mock_question: Question, mo
     assert result[0][1] == mock_answer
 
 
+@pytest.mark.asyncio
+async def test_get_history(mock_session: MagicMock, mock_question: Question, mock_answer: Answer) -> None:
+    mock_result = MagicMock()
+    mock_result.all.return_value = [(mock_question, mock_answer, [])]
+    mock_session.exec.return_value = mock_result
+
+    repo = QARepository(session=mock_session)
+    result = await repo.get_history(limit=50)
+
+    assert result == [(mock_question, mock_answer, [])]
+    mock_session.exec.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_session_history_uses_single_statement(
+    mock_session: MagicMock, mock_question: Question, mock_answer: Answer
+) -> None:
+    mock_result = MagicMock()
+    mock_result.all.return_value = [(mock_question, mock_answer, [])]
+    mock_session.exec.return_value = mock_result
+
+    repo = QARepository(session=mock_session)
+    result = await repo.get_session_history("session_123")
+
+    assert result == [(mock_question, mock_answer, [])]
+    mock_session.exec.assert_called_once()
+    statement = str(mock_session.exec.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "json_agg" in statement
+    assert "jsonb_array_elements(jsonb_array_or_empty(answers.sources_used))" in statement
+    assert "JOIN chunk_images" in statement
+    assert "answers.id = (SELECT min(answers_1.id)" in statement
+    assert "questions.session_id" in statement
+
+
 @pytest.mark.asyncio
 async def test_delete_question_success(mock_session: MagicMock, mock_question: Question, mock_answer: Answer) -> None:
     mock_result_question = MagicMock()
@@ -130,13 +172,11 @@ async def test_delete_question_not_found(mock_session: MagicMock) -> None:
 
 @pytest.mark.asyncio
 async def test_get_question_stats(mock_session: MagicMock) -> None:
-    questions = [Question(id=i, question_text=f"Q{i}?", user_id=1) for i in range(3)]
-    answers = [Answer(id=i, answer_text=f"A{i}", question_id=i, confidence_score=0.9) for i in range(3)]
-    mock_result_questions = MagicMock()
-    mock_result_questions.all.return_value = questions
-    mock_result_answers = MagicMock()
-    mock_result_answers.all.return_value = answers
-    mock_session.exec.side_effect = [mock_result_questions, mock_result_answers]
+    mock_result = MagicMock()
+    mock_result.first.return_value = UserQuestionStats(
+        user_id=1, question_count=3, answer_count=3, confidence_total=2.7
+    )
+    mock_session.exec.return_value = mock_result
 
     repo = QARepository(session=mock_session)
     result = await repo.get_question_stats(1)
@@ -144,19 +184,68 @@ async def test_get_question_stats(mock_session: MagicMock) -> None:
     assert isinstance(result, QuestionStats)
     assert result.total_questions == 3
     assert result.total_answers == 3
-    assert result.avg_confidence == 0.9
+    assert result.avg_confidence == pytest.approx(0.9)
+    mock_session.exec.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_question_stats_prompt_cache_hit_rate(mock_session: MagicMock) -> None:
+    mock_result = MagicMock()
+    mock_result.first.return_value = UserQuestionStats(
+        user_id=1,
+        question_count=2,
+        answer_count=2,
+        confidence_total=1.8,
+        prompt_tokens=2000,
+        cached_prompt_tokens=500,
+    )
+    mock_session.exec.return_value = mock_result
+
+    repo = QARepository(session=mock_session)
+    result = await repo.get_question_stats(1)
+
+    assert result.prompt_cache_hit_rate == 0.25
 
 
 @pytest.mark.asyncio
 async def test_get_question_stats_no_answers(mock_session: MagicMock) -> None:
-    questions = [Question(id=i, question_text=f"Q{i}?", user_id=1) for i in range(3)]
-    mock_result_questions = MagicMock()
-    mock_result_questions.all.return_value = questions
-    mock_result_answers = MagicMock()
-    mock_result_answers.all.return_value = []
-    mock_session.exec.side_effect = [mock_result_questions, mock_result_answers]
+    mock_result = MagicMock()
+    mock_result.first.return_value = UserQuestionStats(user_id=1, question_count=3)
+    mock_session.exec.return_value = mock_result
 
     repo = QARepository(session=mock_session)
     result = await repo.get_question_stats(1)
 
+    assert result.total_questions == 3
     assert result.avg_confidence == 0
+
+
+@pytest.mark.asyncio
+async def test_get_question_stats_without_counters(mock_session: MagicMock) -> None:
+    mock_result = MagicMock()
+    mock_result.first.return_value = None
+    mock_session.exec.return_value = mock_result
+
+    repo = QARepository(session=mock_session)
+    result = await repo.get_question_stats(1)
+
+    assert result == QuestionStats(total_questions=0, total_answers=0, avg_confidence=0)
+
+
+@pytest.mark.asyncio
+async def test_get_rag_stats(mock_session: MagicMock) -> None:
+    last_processed = datetime(2026, 1, 1)
+    mock_result = MagicMock()
+    mock_result.one.return_value = (2, 40, 7, 5, last_processed)
+    mock_session.execute.return_value = mock_result
+
+    repo = QARepository(session=mock_session)
+    result = await repo.get_rag_stats()
+
+    assert result == RAGStats(
+        total_documents=2, total_chunks=40, total_questions=7, total_images=5, last_processed=last_processed
+    )
+    mock_session.execute.assert_called_once()
+    statement = str(mock_session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert statement.count("FROM pg_class") == 6
+    assert "file.deleted_at IS NOT NULL" in statement
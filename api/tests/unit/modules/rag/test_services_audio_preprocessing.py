@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from app.modules.rag.services import audio_preprocessing
+
+SAMPLE_RATE = audio_preprocessing.SAMPLE_RATE
+
+
+def _tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def test_decode_audio_pipes_bytes_to_ffmpeg() -> None:
+    pcm = np.array([0, 16384, -32768], dtype=np.int16).tobytes()
+
+    with patch("app.modules.rag.services.audio_preprocessing.subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(stdout=pcm)
+        audio = audio_preprocessing.decode_audio(b"webm bytes")
+
+    assert mock_run.call_args.kwargs["input"] == b"webm bytes"
+    assert "pipe:0" in mock_run.call_args.args[0]
+    np.testing.assert_allclose(audio, [0.0, 0.5, -1.0])
+
+
+def test_split_on_silence_groups_speech_up_to_max_length() -> None:
+    samples = np.concatenate([_tone(2), _silence(1), _tone(2), _silence(1), _tone(2)])
+
+    segments = audio_preprocessing.split_on_silence(samples, SAMPLE_RATE, max_segment_seconds=6, top_db=30)
+
+    assert len(segments) == 2
+    assert 4.5 < len(segments[0]) / SAMPLE_RATE < 6
+    assert 1.5 < len(segments[1]) / SAMPLE_RATE < 2.5
+
+
+def test_split_on_silence_returns_nothing_for_silence() -> None:
+    assert audio_preprocessing.split_on_silence(_silence(2), SAMPLE_RATE, max_segment_seconds=5, top_db=30) == []
+
+
+def test_encode_audio_pipes_pcm_to_ffmpeg() -> None:
+    with patch("app.modules.rag.services.audio_preprocessing.subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(stdout=b"opus")
+        data = audio_preprocessing.encode_audio(np.array([0.0, 0.5, 2.0], dtype=np.float32), "24k")
+
+    command = mock_run.call_args.args[0]
+    assert data == b"opus"
+    assert command[command.index("-b:a") + 1] == "24k"
+    assert np.frombuffer(mock_run.call_args.kwargs["input"], np.int16).tolist() == [0, 16383, 32767]
+
+
+def test_trim_silence_removes_leading_and_trailing_silence() -> None:
+    samples = np.concatenate([_silence(1), _tone(2), _silence(1)])
+
+    trimmed = audio_preprocessing.trim_silence(samples, top_db=30)
+
+    assert 1.9 < len(trimmed) / SAMPLE_RATE < 2.3
+
+
+def test_trim_silence_of_silence_is_empty() -> None:
+    assert audio_preprocessing.trim_silence(_silence(1), top_db=30).size == 0
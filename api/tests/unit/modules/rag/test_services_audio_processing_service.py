@@ -1,35 +1,199 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 
+from app.modules.rag.exceptions import AudioTooLargeError, AudioTooLongError
 from app.modules.rag.services.audio_processing_service import AudioProcessingService
 
+SAMPLE_RATE = 16000
+
+
+@pytest.fixture
+def audio_settings() -> MagicMock:
+    with patch("app.modules.rag.services.audio_processing_service.settings") as mock_settings:
+        mock_settings.OPENAI_API_KEY = "test_key"
+        mock_settings.TRANSCRIPTION_BACKEND = "openai"
+        mock_settings.TRANSCRIPTION_MODEL = "whisper-1"
+        mock_settings.TRANSCRIPTION_LANGUAGE = "en"
+        mock_settings.AUDIO_MAX_UPLOAD_BYTES = 1024
+        mock_settings.AUDIO_MAX_DURATION_SECONDS = 300
+        mock_settings.AUDIO_NORMALIZATION_ENABLED = False
+        mock_settings.AUDIO_ENCODE_BITRATE = "24k"
+        mock_settings.AUDIO_SEGMENTATION_MIN_SECONDS = 30
+        mock_settings.AUDIO_SEGMENT_MAX_SECONDS = 20
+        mock_settings.AUDIO_SILENCE_TOP_DB = 35
+        mock_settings.TRANSCRIPTION_CONCURRENCY = 2
+        mock_settings.LOCAL_WHISPER_MODEL = "base"
+        yield mock_settings
+
+
+def _decoded(seconds: float) -> MagicMock:
+    return patch(
+        "app.modules.rag.services.audio_preprocessing.decode_audio",
+        return_value=np.ones(int(seconds * SAMPLE_RATE), dtype=np.float32),
+    )
+
 
 @pytest.mark.asyncio
-async def test_transcribe_with_openai() -> None:
+async def test_transcribe_with_openai(audio_settings: MagicMock) -> None:
     mock_client = MagicMock()
-    mock_transcription = MagicMock()
-    mock_transcription.strip.return_value = "Transcribed text"
-    mock_client.audio.transcriptions.create.return_value = mock_transcription
-
-    with patch("app.modules.rag.services.audio_processing_service.openai.OpenAI", return_value=mock_client):
-        with patch("app.modules.rag.services.audio_processing_service.settings") as mock_settings:
-            mock_settings.OPENAI_API_KEY = "test_key"
-            with patch("tempfile.NamedTemporaryFile") as mock_tempfile:
-                mock_file = MagicMock()
-                mock_file.name = "/tmp/test.webm"
-                mock_file.__enter__.return_value = mock_file
-                mock_file.__exit__.return_value = None
-                mock_tempfile.return_value = mock_file
-
-                with patch("builtins.open", create=True) as mock_open:
-                    mock_file_obj = MagicMock()
-                    mock_open.return_value.__enter__.return_value = mock_file_obj
-                    mock_open.return_value.__exit__.return_value = None
-
-                    service = AudioProcessingService()
-                    text, metadata = await service.transcribe_with_openai(b"audio_data", "test.webm")
-
-                    assert text == "Transcribed text"
-                    assert "provider" in metadata
-                    assert metadata["filename"] == "test.webm"
+    mock_client.audio.transcriptions.create = AsyncMock(return_value=" Transcribed text \n")
+
+    with (
+        patch("app.modules.rag.services.audio_processing_service.openai.AsyncOpenAI", return_value=mock_client),
+        _decoded(12.5),
+    ):
+        service = AudioProcessingService()
+        text, metadata = await service.transcribe(b"audio_data", "test.webm")
+
+    assert text == "Transcribed text"
+    assert metadata["provider"] == "openai"
+    assert metadata["duration_seconds"] == 12.5
+    assert metadata["segments"] == 1
+    assert metadata["original_bytes"] == metadata["processed_bytes"] == len(b"audio_data")
+    mock_client.audio.transcriptions.create.assert_called_once_with(
+        model="whisper-1",
+        file=("test.webm", b"audio_data"),
+        response_format="text",
+        language="en",
+    )
+
+
+@pytest.mark.asyncio
+async def test_transcribe_rejects_large_audio(audio_settings: MagicMock) -> None:
+    with patch("app.modules.rag.services.audio_processing_service.openai.AsyncOpenAI"):
+        service = AudioProcessingService()
+        with pytest.raises(AudioTooLargeError):
+            await service.transcribe(b"a" * 2048, "test.webm")
+
+
+@pytest.mark.asyncio
+async def test_transcribe_rejects_long_audio(audio_settings: MagicMock) -> None:
+    mock_client = MagicMock()
+    mock_client.audio.transcriptions.create = AsyncMock()
+
+    with (
+        patch("app.modules.rag.services.audio_processing_service.openai.AsyncOpenAI", return_value=mock_client),
+        _decoded(301),
+    ):
+        service = AudioProcessingService()
+        with pytest.raises(AudioTooLongError):
+            await service.transcribe(b"audio_data", "test.webm")
+
+    mock_client.audio.transcriptions.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_transcribe_normalizes_audio(audio_settings: MagicMock) -> None:
+    audio_settings.AUDIO_NORMALIZATION_ENABLED = True
+    mock_client = MagicMock()
+    mock_client.audio.transcriptions.create = AsyncMock(return_value="text")
+    trimmed = np.ones(SAMPLE_RATE * 5, dtype=np.float32)
+
+    with (
+        patch("app.modules.rag.services.audio_processing_service.openai.AsyncOpenAI", return_value=mock_client),
+        _decoded(8),
+        patch("app.modules.rag.services.audio_preprocessing.trim_silence", return_value=trimmed) as mock_trim,
+        patch("app.modules.rag.services.audio_preprocessing.encode_audio", return_value=b"opus") as mock_encode,
+    ):
+        service = AudioProcessingService()
+        _, metadata = await service.transcribe(b"a" * 1000, "test.webm")
+
+    assert mock_trim.call_args.args[1] == 35
+    assert mock_encode.call_args.args[0] is trimmed
+    assert mock_encode.call_args.args[1] == "24k"
+    assert mock_client.audio.transcriptions.create.call_args.kwargs["file"] == ("segment_0.ogg", b"opus")
+    assert metadata["normalized"] is True
+    assert metadata["original_bytes"] == 1000
+    assert metadata["processed_bytes"] == 4
+
+
+@pytest.mark.asyncio
+async def test_transcribe_long_audio_in_ordered_segments(audio_settings: MagicMock) -> None:
+    delays = {"segment_0.ogg": 0.03, "segment_1.ogg": 0.0, "segment_2.ogg": 0.01}
+    in_flight = 0
+    max_in_flight = 0
+
+    async def transcribe_segment(model: str, file: tuple, response_format: str, language: str) -> str:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(delays[file[0]])
+        in_flight -= 1
+        return f"text of {file[1].decode()}"
+
+    mock_client = MagicMock()
+    mock_client.audio.transcriptions.create = AsyncMock(side_effect=transcribe_segment)
+    segments = [np.full(10, value, dtype=np.float32) for value in (0.1, 0.2, 0.3)]
+    encoded = {0.1: b"one", 0.2: b"two", 0.3: b"three"}
+
+    with (
+        patch("app.modules.rag.services.audio_processing_service.openai.AsyncOpenAI", return_value=mock_client),
+        _decoded(75),
+        patch("app.modules.rag.services.audio_preprocessing.split_on_silence", return_value=segments) as mock_split,
+        patch(
+            "app.modules.rag.services.audio_preprocessing.encode_audio",
+            side_effect=lambda samples, bitrate: encoded[round(float(samples[0]), 1)],
+        ),
+    ):
+        service = AudioProcessingService()
+        text, metadata = await service.transcribe(b"audio_data", "test.webm")
+
+    assert text == "text of one text of two text of three"
+    assert metadata["segments"] == 3
+    assert max_in_flight == 2
+    assert mock_split.call_args.args[1:] == (SAMPLE_RATE, 20, 35)
+
+
+@pytest.mark.asyncio
+async def test_transcribe_locally_runs_in_pool(audio_settings: MagicMock) -> None:
+    audio_settings.TRANSCRIPTION_BACKEND = "local"
+    mock_loop = MagicMock()
+    mock_loop.run_in_executor = AsyncMock(return_value="Local text")
+    mock_pool = MagicMock()
+
+    with (
+        patch("app.modules.rag.services.audio_processing_service.openai.AsyncOpenAI"),
+        patch("app.modules.rag.services.audio_processing_service.asyncio.get_running_loop", return_value=mock_loop),
+        patch("app.modules.rag.services.local_whisper.get_whisper_pool", return_value=mock_pool),
+        _decoded(5),
+    ):
+        service = AudioProcessingService()
+        text, metadata = await service.transcribe(b"audio_data", "test.webm")
+
+    assert text == "Local text"
+    assert metadata["provider"] == "local"
+    assert metadata["model"] == "base"
+    assert mock_loop.run_in_executor.call_args.args[:1] == (mock_pool,)
+    assert mock_loop.run_in_executor.call_args.args[2:] == (b"audio_data", "en")
+
+
+@pytest.mark.asyncio
+async def test_read_upload(audio_settings: MagicMock) -> None:
+    upload = MagicMock()
+    upload.read = AsyncMock(side_effect=[b"abc", b"def", b""])
+    upload.close = AsyncMock()
+
+    with patch("app.modules.rag.services.audio_processing_service.openai.AsyncOpenAI"):
+        service = AudioProcessingService()
+        data = await service.read_upload(upload)
+
+    assert data == b"abcdef"
+    upload.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_read_upload_rejects_large_audio(audio_settings: MagicMock) -> None:
+    upload = MagicMock()
+    upload.read = AsyncMock(side_effect=[b"a" * 1000, b"a" * 1000, b"a" * 1000])
+    upload.close = AsyncMock()
+
+    with patch("app.modules.rag.services.audio_processing_service.openai.AsyncOpenAI"):
+        service = AudioProcessingService()
+        with pytest.raises(AudioTooLargeError):
+            await service.read_upload(upload)
+
+    assert upload.read.call_count == 2
+    upload.close.assert_called_once()
@@ -0,0 +1,26 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.modules.rag.models import Image
+from app.modules.rag.repositories.document_chunk import DocumentChunkRepository
+from app.modules.rag.repositories.image import ImageRepository
+from app.modules.rag.services.chunk_image_loader import ChunkImageLoader
+
+
+@pytest.mark.asyncio
+async def test_load_batches_and_memoizes_positions() -> None:
+    image = Image(id=5, storage_key="images/ha/hash", file_id=1)
+    mock_chunk_repo = MagicMock(spec=DocumentChunkRepository)
+    mock_chunk_repo.get_ids_by_positions = AsyncMock(return_value={(1, 0): 10, (1, 1): 11})
+    mock_image_repo = MagicMock(spec=ImageRepository)
+    mock_image_repo.get_by_chunk_ids = AsyncMock(return_value={10: [image]})
+
+    loader = ChunkImageLoader(mock_chunk_repo, mock_image_repo)
+    first = await loader.load([(1, 0), (1, 1), (2, 0), (1, 0)])
+    second = await loader.load([(1, 0), (2, 0)])
+
+    assert first == {(1, 0): [image], (1, 1): [], (2, 0): []}
+    assert second == {(1, 0): [image], (2, 0): []}
+    mock_chunk_repo.get_ids_by_positions.assert_awaited_once_with([(1, 0), (1, 1), (2, 0)])
+    mock_image_repo.get_by_chunk_ids.assert_awaited_once_with([10, 11])
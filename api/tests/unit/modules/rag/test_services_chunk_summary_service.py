@@ -0,0 +1,71 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.rag.models import DocumentChunk
+from app.modules.rag.services.chunk_summary_service import ChunkSummaryService, _summarize_file_in_background
+from app.modules.rag.services.llm_provider import LLMProvider
+
+
+def _response(content: str) -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    return response
+
+
+def _chunks(count: int) -> list[DocumentChunk]:
+    return [DocumentChunk(id=i, text=f"text{i}", embedding=[0.1] * 384, file_id=1, chunk_index=i) for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_summarize_submits_batches_concurrently() -> None:
+    mock_provider = MagicMock(spec=LLMProvider)
+    mock_provider.complete_batch = AsyncMock(
+        side_effect=[
+            {"batch_id": "a", "responses": [_response(" summary0 "), None]},
+            {"batch_id": "b", "responses": [_response("summary2")]},
+        ]
+    )
+
+    with patch("app.modules.rag.services.chunk_summary_service.settings") as mock_settings:
+        mock_settings.CHUNK_SUMMARY_BATCH_SIZE = 2
+        mock_settings.CHUNK_SUMMARY_MAX_TOKENS = 150
+
+        summaries = await ChunkSummaryService(provider=mock_provider).summarize(_chunks(3))
+
+    assert summaries == {0: "summary0", 2: "summary2"}
+    assert mock_provider.complete_batch.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_summarize_file_in_background_releases_session_while_waiting() -> None:
+    sessions_open = 0
+
+    class SessionContext:
+        async def __aenter__(self) -> MagicMock:
+            nonlocal sessions_open
+            sessions_open += 1
+            return MagicMock()
+
+        async def __aexit__(self, *exc_info: object) -> None:
+            nonlocal sessions_open
+            sessions_open -= 1
+
+    async def summarize(chunks: list[DocumentChunk]) -> dict[int, str]:
+        assert sessions_open == 0
+        return {chunk.id: "summary" for chunk in chunks}
+
+    mock_repo = MagicMock()
+    mock_repo.get_unsummarized_by_file_id = AsyncMock(return_value=_chunks(2))
+    mock_repo.update_summaries = AsyncMock()
+    module = "app.modules.rag.services.chunk_summary_service"
+    with (
+        patch(f"{module}.async_session", side_effect=SessionContext),
+        patch(f"{module}.DocumentChunkRepository", return_value=mock_repo),
+        patch(f"{module}.get_llm_provider"),
+        patch.object(ChunkSummaryService, "summarize", side_effect=summarize),
+    ):
+        await _summarize_file_in_background(1)
+
+    mock_repo.update_summaries.assert_called_once_with({0: "summary", 1: "summary"})
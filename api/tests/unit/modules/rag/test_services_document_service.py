@@ -1,21 +1,43 @@
 from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.core.exceptions import DeadlineExceededError
 from app.modules.files.repository import FileRepository
 from app.modules.files.schema import FileType
+from app.modules.rag.exceptions import AudioTooLargeError
+from app.modules.rag.models import Answer, ChunkImage, DocumentChunk, Image, Question
 from app.modules.rag.repositories.document_chunk import DocumentChunkRepository
 from app.modules.rag.repositories.image import ImageRepository
 from app.modules.rag.repositories.qa import QARepository
-from app.modules.rag.schema import AnswerResponse, QuestionRequest, QuestionStats
+from app.modules.rag.schema import AnswerImage, AnswerResponse, QuestionRequest, QuestionStats
 from app.modules.rag.services import DOCXContentManager, PDFContentManager
 from app.modules.rag.services.audio_processing_service import AudioProcessingService
 from app.modules.rag.services.document_service import DocumentService
+from app.modules.rag.services.image_storage_service import ImageStorageService
 from app.modules.rag.services.openai_service import OpenAIService
+from app.modules.rag.services.transcription_cache_service import TranscriptionCacheService
 from app.modules.rag.services.vector_store_manager import VectorStoreManager
 
 
+def _build_service(**overrides: MagicMock) -> DocumentService:
+    dependencies = {
+        "pdf_manager": MagicMock(spec=PDFContentManager),
+        "docx_manager": MagicMock(spec=DOCXContentManager),
+        "vector_store": MagicMock(spec=VectorStoreManager),
+        "openai_service": MagicMock(spec=OpenAIService),
+        "files_repository": MagicMock(spec=FileRepository),
+        "qa_repository": MagicMock(spec=QARepository),
+        "chunk_repository": MagicMock(spec=DocumentChunkRepository),
+        "image_repository": MagicMock(spec=ImageRepository),
+        "audio_service": MagicMock(spec=AudioProcessingService),
+        "transcription_cache": MagicMock(spec=TranscriptionCacheService),
+        "image_storage": MagicMock(spec=ImageStorageService),
+    }
+    return DocumentService(**(dependencies | overrides))
+
+
 @pytest.mark.asyncio
 async def test_process_question() -> None:
     mock_pdf_manager = MagicMock(spec=PDFContentManager)
@@ -39,9 +61,15 @@ async def test_process_question() -> None:
     mock_vector_store.search = AsyncMock(return_value=[
         {"text": "answer", "metadata": {"file_id": 1, "chunk_index": 0}, "distance": 0.1}
     ])
-    mock_openai_service.generate_answer.return_value = "Generated answer"
-    mock_files_repo.get_all = AsyncMock(return_value=[])
-    mock_chunk_repo.chunk_exists = AsyncMock(return_value=True)
+    mock_openai_service.generate_answer.return_value = {
+        "answer_text": "Generated answer",
+        "prompt_tokens": 100,
+        "cached_tokens": 0,
+    }
+    mock_files_repo.has_files = AsyncMock(return_value=True)
+    mock_chunk_repo.get_pending_file_ids = AsyncMock(return_value=[])
+    mock_chunk_repo.get_ids_by_positions = AsyncMock(return_value={})
+    mock_image_repo.get_by_chunk_ids = AsyncMock(return_value={})
 
     service = DocumentService(
         pdf_manager=mock_pdf_manager,
@@ -53,12 +81,19 @@ async def test_process_question() -> None:
         chunk_repository=mock_chunk_repo,
         image_repository=mock_image_repo,
         audio_service=mock_audio_service,
+        transcription_cache=MagicMock(spec=TranscriptionCacheService),
+        image_storage=MagicMock(spec=ImageStorageService),
     )
 
     question = QuestionRequest(question="Test question")
     result = await service.process_question(question, user_id=1)
 
     assert isinstance(result, AnswerResponse)
+    assert result.answer == "Generated answer"
+    answer_data = mock_qa_repo.create_answer.call_args[0][0]
+    assert answer_data.prompt_tokens == 100
+    assert answer_data.cached_prompt_tokens == 0
+    mock_qa_repo.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -94,9 +129,7 @@ async def test_get_question_history() -> None:
         "created_at": datetime.now(),
         "updated_at": datetime.now(),
     }
-    mock_qa_repo.get_qa_pairs = AsyncMock(return_value=[(mock_question, mock_answer)])
-    mock_image_repo.get_by_chunk_id = AsyncMock(return_value=[])
-    mock_chunk_repo.get_by_file_id_and_chunk_index = AsyncMock(return_value=None)
+    mock_qa_repo.get_history = AsyncMock(return_value=[(mock_question, mock_answer, [])])
 
     service = DocumentService(
         pdf_manager=mock_pdf_manager,
@@ -108,6 +141,8 @@ async def test_get_question_history() -> None:
         chunk_repository=mock_chunk_repo,
         image_repository=mock_image_repo,
         audio_service=mock_audio_service,
+        transcription_cache=MagicMock(spec=TranscriptionCacheService),
+        image_storage=MagicMock(spec=ImageStorageService),
     )
 
     result = await service.get_question_history(limit=50)
@@ -128,7 +163,6 @@ async def test_get_session_history() -> None:
     mock_audio_service = MagicMock(spec=AudioProcessingService)
 
     mock_question = MagicMock()
-    mock_question.id = 1
     mock_question.model_dump.return_value = {
         "id": 1,
         "question_text": "Test?",
@@ -149,10 +183,7 @@ async def test_get_session_history() -> None:
         "created_at": datetime.now(),
         "updated_at": datetime.now(),
     }
-    mock_qa_repo.get_questions_by_session = AsyncMock(return_value=[mock_question])
-    mock_qa_repo.get_answers_by_question_id = AsyncMock(return_value=[mock_answer])
-    mock_image_repo.get_by_chunk_id = AsyncMock(return_value=[])
-    mock_chunk_repo.get_by_file_id_and_chunk_index = AsyncMock(return_value=None)
+    mock_qa_repo.get_session_history = AsyncMock(return_value=[(mock_question, mock_answer, [])])
 
     service = DocumentService(
         pdf_manager=mock_pdf_manager,
@@ -164,11 +195,79 @@ async def test_get_session_history() -> None:
         chunk_repository=mock_chunk_repo,
         image_repository=mock_image_repo,
         audio_service=mock_audio_service,
+        transcription_cache=MagicMock(spec=TranscriptionCacheService),
+        image_storage=MagicMock(spec=ImageStorageService),
+    )
+
+    result = await service.get_session_history("session_123")
+
+    assert len(result) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_session_history_builds_image_references() -> None:
+    mock_qa_repo = MagicMock(spec=QARepository)
+    question = Question(
+        id=1,
+        question_text="Q?",
+        user_id=1,
+        session_id="session_123",
+        context_files=None,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
     )
+    answer = Answer(
+        id=1,
+        answer_text="A",
+        question_id=1,
+        confidence_score=0.9,
+        sources_used=None,
+        processing_time_ms=100,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+    images = [
+        AnswerImage(
+            image_id=5,
+            description=None,
+            page_number=None,
+            file_id=1,
+            chunk_index=0,
+            filename="a.pdf",
+            source_page_number=3,
+        ),
+        AnswerImage(
+            image_id=5,
+            description=None,
+            page_number=None,
+            file_id=1,
+            chunk_index=1,
+            filename="a.pdf",
+            source_page_number=4,
+        ),
+        AnswerImage(
+            image_id=6,
+            description="Chart",
+            page_number=7,
+            file_id=1,
+            chunk_index=1,
+            filename="a.pdf",
+            source_page_number=4,
+        ),
+    ]
+    mock_qa_repo.get_session_history = AsyncMock(return_value=[(question, answer, images)])
+
+    service = _build_service(qa_repository=mock_qa_repo)
 
     result = await service.get_session_history("session_123")
 
     assert len(result) == 1
+    assert result[0].answer.processing_time_ms == "100"
+    assert [(image.image_id, image.description, image.page_number) for image in result[0].images] == [
+        (5, "Image from a.pdf (chunk 0)", 3),
+        (6, "Chart", 7),
+    ]
+    assert result[0].images[0].thumbnail_path == "/rag/images/5?rendition=thumbnail"
 
 
 @pytest.mark.asyncio
@@ -195,6 +294,8 @@ async def test_delete_question() -> None:
         chunk_repository=mock_chunk_repo,
         image_repository=mock_image_repo,
         audio_service=mock_audio_service,
+        transcription_cache=MagicMock(spec=TranscriptionCacheService),
+        image_storage=MagicMock(spec=ImageStorageService),
     )
 
     result = await service.delete_question(1)
@@ -227,6 +328,8 @@ async def test_get_user_stats() -> None:
         chunk_repository=mock_chunk_repo,
         image_repository=mock_image_repo,
         audio_service=mock_audio_service,
+        transcription_cache=MagicMock(spec=TranscriptionCacheService),
+        image_storage=MagicMock(spec=ImageStorageService),
     )
 
     result = await service.get_user_stats(user_id=1)
@@ -246,7 +349,10 @@ async def test_process_audio_question(mock_audio_file: MagicMock) -> None:
     mock_image_repo = MagicMock(spec=ImageRepository)
     mock_audio_service = MagicMock(spec=AudioProcessingService)
 
-    mock_audio_service.transcribe_with_openai = AsyncMock(return_value=("Transcribed text", {}))
+    mock_audio_service.read_upload = AsyncMock(return_value=b"audio content")
+    mock_transcription_cache = MagicMock(spec=TranscriptionCacheService)
+    mock_transcription_cache.get = AsyncMock(return_value=None)
+    mock_audio_service.transcribe = AsyncMock(return_value=("Transcribed text", {}))
     mock_question = MagicMock()
     mock_question.id = 1
     mock_qa_repo.create_question = AsyncMock(return_value=mock_question)
@@ -256,9 +362,12 @@ async def test_process_audio_question(mock_audio_file: MagicMock) -> None:
     mock_vector_store.search = AsyncMock(return_value=[
         {"text": "answer", "metadata": {"file_id": 1, "chunk_index": 0}, "distance": 0.1}
     ])
-    mock_openai_service.generate_answer.return_value = "Generated answer"
-    mock_files_repo.get_all = AsyncMock(return_value=[])
-    mock_chunk_repo.chunk_exists = AsyncMock(return_value=True)
+    mock_openai_service.generate_answer.return_value = {
+        "answer_text": "Generated answer",
+        "prompt_tokens": 100,
+        "cached_tokens": 0,
+    }
+    mock_files_repo.has_files = AsyncMock(return_value=False)
 
     service = DocumentService(
         pdf_manager=mock_pdf_manager,
@@ -270,8 +379,316 @@ async def test_process_audio_question(mock_audio_file: MagicMock) -> None:
         chunk_repository=mock_chunk_repo,
         image_repository=mock_image_repo,
         audio_service=mock_audio_service,
+        transcription_cache=mock_transcription_cache,
+        image_storage=MagicMock(spec=ImageStorageService),
     )
 
     result = await service.process_audio_question(mock_audio_file, user_id=1)
 
     assert isinstance(result, AnswerResponse)
+    mock_audio_service.transcribe.assert_called_once_with(b"audio content", "test.webm")
+    mock_transcription_cache.set.assert_called_once_with(b"audio content", "Transcribed text", {})
+
+
+@pytest.mark.asyncio
+async def test_process_audio_question_caches_transcription_in_final_commit(mock_audio_file: MagicMock) -> None:
+    calls = MagicMock()
+    mock_audio_service = MagicMock(spec=AudioProcessingService)
+    mock_audio_service.read_upload = AsyncMock(return_value=b"audio content")
+    mock_audio_service.transcribe = AsyncMock(return_value=("Transcribed text", {}))
+    mock_transcription_cache = MagicMock(spec=TranscriptionCacheService)
+    mock_transcription_cache.get = AsyncMock(return_value=None)
+    mock_transcription_cache.set = AsyncMock()
+    mock_qa_repo = MagicMock(spec=QARepository)
+    mock_qa_repo.create_question = AsyncMock(return_value=MagicMock(id=1))
+    mock_qa_repo.rollback = AsyncMock()
+    mock_qa_repo.commit = AsyncMock()
+    calls.attach_mock(mock_transcription_cache.set, "set")
+    calls.attach_mock(mock_qa_repo.rollback, "rollback")
+    calls.attach_mock(mock_qa_repo.commit, "commit")
+
+    service = _build_service(
+        qa_repository=mock_qa_repo,
+        audio_service=mock_audio_service,
+        transcription_cache=mock_transcription_cache,
+    )
+
+    with patch.object(service, "_process_rag_query", AsyncMock(side_effect=RuntimeError("search failed"))):
+        await service.process_audio_question(mock_audio_file, user_id=1)
+
+    assert [name for name, _, _ in calls.mock_calls] == ["rollback", "set", "commit"]
+    mock_transcription_cache.set.assert_called_once_with(b"audio content", "Transcribed text", {})
+
+
+@pytest.mark.asyncio
+async def test_process_audio_question_propagates_validation_errors(mock_audio_file: MagicMock) -> None:
+    mock_audio_service = MagicMock(spec=AudioProcessingService)
+    mock_audio_service.read_upload = AsyncMock(side_effect=AudioTooLargeError("too large"))
+    mock_qa_repo = MagicMock(spec=QARepository)
+
+    service = _build_service(qa_repository=mock_qa_repo, audio_service=mock_audio_service)
+
+    with pytest.raises(AudioTooLargeError):
+        await service.process_audio_question(mock_audio_file, user_id=1)
+
+    mock_qa_repo.create_question.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_process_audio_question_uses_cached_transcription(mock_audio_file: MagicMock) -> None:
+    mock_audio_service = MagicMock(spec=AudioProcessingService)
+    mock_audio_service.read_upload = AsyncMock(return_value=b"audio content")
+    mock_transcription_cache = MagicMock(spec=TranscriptionCacheService)
+    mock_transcription_cache.get = AsyncMock(return_value=("Cached text", {"cached": True}))
+    mock_qa_repo = MagicMock(spec=QARepository)
+    mock_qa_repo.create_question = AsyncMock(return_value=MagicMock(id=1))
+    mock_files_repo = MagicMock(spec=FileRepository)
+    mock_files_repo.has_files = AsyncMock(return_value=False)
+
+    service = _build_service(
+        files_repository=mock_files_repo,
+        qa_repository=mock_qa_repo,
+        audio_service=mock_audio_service,
+        transcription_cache=mock_transcription_cache,
+    )
+
+    await service.process_audio_question(mock_audio_file, user_id=1)
+
+    mock_audio_service.transcribe.assert_not_called()
+    mock_transcription_cache.set.assert_not_called()
+    assert mock_qa_repo.create_question.call_args.args[0].question_text == "Cached text"
+
+
+@pytest.mark.asyncio
+async def test_process_documents_reuses_ingestion_for_identical_content() -> None:
+    mock_pdf_manager = MagicMock(spec=PDFContentManager)
+    mock_chunk_repo = MagicMock(spec=DocumentChunkRepository)
+    mock_chunk_repo.chunk_exists = AsyncMock(return_value=False)
+    mock_chunk_repo.get_ingested_file_id = AsyncMock(return_value=1)
+    mock_chunk_repo.get_by_file_id = AsyncMock(
+        return_value=[
+            DocumentChunk(
+                id=10,
+                text="chunk",
+                embedding=[0.1, 0.2],
+                file_id=1,
+                chunk_index=0,
+                chunk_metadata={"file_id": 1, "filename": "a.pdf", "chunk_index": 0},
+                summary="summary",
+            )
+        ]
+    )
+    mock_chunk_repo.create_batch = AsyncMock(
+        side_effect=lambda chunks: [chunk.model_copy(update={"id": 20}) for chunk in chunks]
+    )
+    mock_image_repo = MagicMock(spec=ImageRepository)
+    mock_image_repo.get_by_file_id = AsyncMock(return_value=[Image(id=5, image_data="aW1n", file_id=1, page_number=1)])
+    mock_image_repo.create_batch = AsyncMock(
+        side_effect=lambda images: [image.model_copy(update={"id": 30}) for image in images]
+    )
+    mock_image_repo.get_links_by_file_id = AsyncMock(return_value=[ChunkImage(chunk_id=10, image_id=5, image_index=0)])
+    mock_image_repo.create_links = AsyncMock()
+
+    service = _build_service(
+        pdf_manager=mock_pdf_manager,
+        chunk_repository=mock_chunk_repo,
+        image_repository=mock_image_repo,
+    )
+    file = MagicMock(id=2, content_hash="abc123", original_filename="b.pdf", file_type=FileType.PDF)
+
+    with patch("app.modules.rag.services.document_service.settings") as mock_settings:
+        mock_settings.CHUNK_SUMMARIES_ENABLED = False
+        await service._process_documents([file])
+
+    mock_pdf_manager.process.assert_not_called()
+    mock_chunk_repo.get_ingested_file_id.assert_called_once_with("abc123")
+    copied_chunk = mock_chunk_repo.create_batch.call_args.args[0][0]
+    assert copied_chunk.file_id == 2
+    assert copied_chunk.summary == "summary"
+    assert copied_chunk.chunk_metadata == {"file_id": 2, "filename": "b.pdf", "chunk_index": 0}
+    copied_image = mock_image_repo.create_batch.call_args.args[0][0]
+    assert copied_image.file_id == 2
+    assert copied_image.image_data == "aW1n"
+    copied_link = mock_image_repo.create_links.call_args.args[0][0]
+    assert (copied_link.chunk_id, copied_link.image_id) == (20, 30)
+    mock_chunk_repo.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_process_documents_rolls_back_failed_file() -> None:
+    mock_pdf_manager = MagicMock(spec=PDFContentManager)
+    mock_pdf_manager.process = AsyncMock(return_value=([MagicMock(metadata=MagicMock(page_number=1))], [[]]))
+    mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_vector_store.add_documents = AsyncMock(side_effect=RuntimeError("insert failed"))
+    mock_chunk_repo = MagicMock(spec=DocumentChunkRepository)
+    mock_chunk_repo.chunk_exists = AsyncMock(return_value=False)
+    mock_chunk_repo.get_ingested_file_id = AsyncMock(return_value=None)
+
+    service = _build_service(
+        pdf_manager=mock_pdf_manager,
+        vector_store=mock_vector_store,
+        chunk_repository=mock_chunk_repo,
+    )
+    file = MagicMock(id=2, content_hash="abc123", original_filename="b.pdf", file_type=FileType.PDF)
+
+    await service._process_documents([file])
+
+    mock_chunk_repo.commit.assert_not_called()
+    mock_chunk_repo.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_process_question_returns_sources_only_on_deadline() -> None:
+    mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_openai_service = MagicMock(spec=OpenAIService)
+    mock_files_repo = MagicMock(spec=FileRepository)
+    mock_qa_repo = MagicMock(spec=QARepository)
+    mock_chunk_repo = MagicMock(spec=DocumentChunkRepository)
+
+    mock_question = MagicMock()
+    mock_question.id = 1
+    mock_qa_repo.create_question = AsyncMock(return_value=mock_question)
+    mock_qa_repo.create_answer = AsyncMock()
+    mock_qa_repo.rollback = AsyncMock()
+    mock_vector_store.search = AsyncMock(return_value=[
+        {"text": "answer", "metadata": {"file_id": 1, "chunk_index": 0, "filename": "a.pdf"}, "distance": 0.1}
+    ])
+    mock_openai_service.generate_answer = AsyncMock(side_effect=DeadlineExceededError("Deadline exceeded"))
+    mock_files_repo.has_files = AsyncMock(return_value=True)
+    mock_chunk_repo.get_pending_file_ids = AsyncMock(return_value=[])
+    mock_chunk_repo.get_ids_by_positions = AsyncMock(return_value={})
+
+    service = _build_service(
+        vector_store=mock_vector_store,
+        openai_service=mock_openai_service,
+        files_repository=mock_files_repo,
+        qa_repository=mock_qa_repo,
+        chunk_repository=mock_chunk_repo,
+    )
+
+    result = await service.process_question(QuestionRequest(question="Test question"), user_id=1)
+
+    assert result.is_partial is True
+    assert len(result.sources) == 1
+    assert result.sources[0].file_id == 1
+    mock_qa_repo.rollback.assert_awaited_once()
+    mock_qa_repo.create_question.assert_called_once()
+    mock_qa_repo.create_answer.assert_called_once()
+    mock_qa_repo.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_process_rag_query_schedules_ingestion_instead_of_ingesting() -> None:
+    mock_pdf_manager = MagicMock(spec=PDFContentManager)
+    mock_vector_store = MagicMock(spec=VectorStoreManager)
+    mock_files_repo = MagicMock(spec=FileRepository)
+    mock_chunk_repo = MagicMock(spec=DocumentChunkRepository)
+    mock_files_repo.has_files = AsyncMock(return_value=True)
+    mock_chunk_repo.get_pending_file_ids = AsyncMock(return_value=[2])
+    mock_vector_store.search = AsyncMock(return_value=[])
+
+    service = _build_service(
+        pdf_manager=mock_pdf_manager,
+        vector_store=mock_vector_store,
+        files_repository=mock_files_repo,
+        chunk_repository=mock_chunk_repo,
+    )
+
+    with patch("app.modules.rag.services.ingestion_service.schedule_ingestion") as mock_schedule:
+        result = await service._process_rag_query("Test question")
+
+    mock_files_repo.has_files.assert_awaited_once_with([FileType.PDF, FileType.DOCX])
+    mock_chunk_repo.get_pending_file_ids.assert_awaited_once_with([FileType.PDF, FileType.DOCX])
+    mock_schedule.assert_called_once_with([2])
+    mock_pdf_manager.process.assert_not_called()
+    assert result["answer_text"] == "No relevant information found in the documents."
+
+
+@pytest.mark.asyncio
+async def test_store_images_for_chunks_deduplicates_and_links_images() -> None:
+    mock_chunk_repo = MagicMock(spec=DocumentChunkRepository)
+    mock_chunk_repo.get_by_file_id = AsyncMock(
+        return_value=[
+            DocumentChunk(id=10 + i, text=f"chunk{i}", embedding=[0.1], file_id=1, chunk_index=i) for i in range(2)
+        ]
+    )
+
+    async def create_batch(images: list[Image]) -> list[Image]:
+        for i, image in enumerate(images):
+            image.id = 100 + i
+        return images
+
+    mock_image_repo = MagicMock(spec=ImageRepository)
+    mock_image_repo.create_batch = AsyncMock(side_effect=create_batch)
+    mock_image_repo.create_links = AsyncMock()
+    mock_image_repo.lock_storage_keys = AsyncMock()
+    mock_image_storage = MagicMock(spec=ImageStorageService)
+    mock_image_storage.render = AsyncMock(
+        side_effect=lambda img_b64: None
+        if img_b64 == "dGlueQ=="
+        else {
+            "stored_image": {
+                "content_hash": f"hash-{img_b64}",
+                "storage_key": f"images/ha/hash-{img_b64}",
+                "mime_type": "image/webp",
+                "file_size": 3,
+                "thumbnail_key": "images/th/thumb",
+                "width": 640,
+                "height": 480,
+            },
+            "display": b"display",
+            "thumbnail": b"thumbnail",
+        }
+    )
+    mock_image_storage.store_rendered = AsyncMock(side_effect=lambda rendered: rendered["stored_image"])
+
+    service = _build_service(
+        chunk_repository=mock_chunk_repo,
+        image_repository=mock_image_repo,
+        image_storage=mock_image_storage,
+    )
+    texts = [MagicMock(metadata=MagicMock(page_number=page)) for page in (1, 2)]
+
+    await service._store_images_for_chunks(1, texts, [["aW1n", "dGlueQ=="], ["aW1n", "b3RoZXI="]])
+
+    assert mock_image_storage.render.call_count == 3
+    mock_image_repo.lock_storage_keys.assert_awaited_once_with(
+        ["images/ha/hash-aW1n", "images/ha/hash-b3RoZXI=", "images/th/thumb"]
+    )
+    assert mock_image_storage.store_rendered.call_count == 2
+    images = mock_image_repo.create_batch.call_args.args[0]
+    assert [(image.content_hash, image.page_number) for image in images] == [
+        ("hash-aW1n", 1),
+        ("hash-b3RoZXI=", 2),
+    ]
+    assert all(image.image_data is None and image.file_id == 1 for image in images)
+    assert images[0].thumbnail_key == "images/th/thumb"
+    assert images[0].mime_type == "image/webp"
+    links = mock_image_repo.create_links.call_args.args[0]
+    assert [(link.chunk_id, link.image_id, link.image_index) for link in links] == [
+        (10, 100, 0),
+        (11, 100, 0),
+        (11, 101, 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_build_images_returns_image_paths() -> None:
+    mock_chunk_repo = MagicMock(spec=DocumentChunkRepository)
+    mock_chunk_repo.get_ids_by_positions = AsyncMock(return_value={(1, 0): 10})
+    mock_image_repo = MagicMock(spec=ImageRepository)
+    mock_image_repo.get_by_chunk_ids = AsyncMock(
+        return_value={10: [Image(id=5, storage_key="images/ha/hash", file_id=1, page_number=2)]}
+    )
+
+    service = _build_service(chunk_repository=mock_chunk_repo, image_repository=mock_image_repo)
+
+    images = await service._build_images(
+        [{"text": "chunk", "metadata": {"file_id": 1, "chunk_index": 0, "filename": "a.pdf"}, "distance": 0.1}]
+    )
+
+    assert len(images) == 1
+    assert images[0].image_id == 5
+    assert images[0].image_path == "/rag/images/5"
+    assert images[0].thumbnail_path == "/rag/images/5?rendition=thumbnail"
+    assert images[0].page_number == 2
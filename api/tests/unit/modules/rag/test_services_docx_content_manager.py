@@ -1,10 +1,17 @@
+import base64
+import io
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import docx
+from PIL import Image as PILImage
+
+from app.core.storage import Storage
 from app.modules.rag.services.docx_content_manager import DOCXContentManager
 
 
 def test_partition_document() -> None:
-    manager = DOCXContentManager()
+    manager = DOCXContentManager(storage=MagicMock(spec=Storage))
     with patch("app.modules.rag.services.docx_content_manager.partition_docx") as mock_partition:
         mock_elements = [MagicMock(category="CompositeElement")]
         mock_partition.return_value = mock_elements
@@ -14,36 +21,24 @@ def test_partition_document() -> None:
         assert isinstance(result, list)
 
 
-def test_get_images_base64() -> None:
-    manager = DOCXContentManager()
-    elements = []
-
-    with patch("app.modules.rag.services.docx_content_manager.docx.Document") as mock_docx:
-        mock_doc = MagicMock()
-        mock_rel = MagicMock()
-        mock_rel.target_ref = "image"
-        mock_image_part = MagicMock()
-        mock_image_part.blob = b"image_data"
-        mock_rel.target_part = mock_image_part
-        mock_doc.part.rels.values.return_value = [mock_rel]
-        mock_docx.return_value = mock_doc
-
-        result = manager._get_images_base64("/path/to/file.docx", elements)
-
-        assert isinstance(result, list)
-
+def _png(color: str) -> bytes:
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (80, 80), color).save(buffer, format="PNG")
+    return buffer.getvalue()
 
-def test_get_images_base64_no_images() -> None:
-    manager = DOCXContentManager()
-    elements = []
 
-    with patch("app.modules.rag.services.docx_content_manager.docx.Document") as mock_docx:
-        mock_doc = MagicMock()
-        mock_rel = MagicMock()
-        mock_rel.target_ref = "other"
-        mock_doc.part.rels.values.return_value = [mock_rel]
-        mock_docx.return_value = mock_doc
+def test_process_file_attaches_images_to_their_chunks(tmp_path: Path) -> None:
+    red, blue = _png("red"), _png("blue")
+    document = docx.Document()
+    for title, image in (("First section", red), ("Second section", blue)):
+        document.add_heading(title, level=1)
+        document.add_paragraph("Item describing the figure. " * 100, style="List Bullet")
+        document.add_paragraph(style="List Bullet").add_run().add_picture(io.BytesIO(image))
+    file_path = tmp_path / "report.docx"
+    document.save(str(file_path))
 
-        result = manager._get_images_base64("/path/to/file.docx", elements)
+    manager = DOCXContentManager(storage=MagicMock(spec=Storage))
+    texts, chunk_images = manager._process_file(str(file_path))
 
-        assert len(result) == 0
+    assert len(texts) == 2
+    assert chunk_images == [[base64.b64encode(red).decode()], [base64.b64encode(blue).decode()]]
@@ -0,0 +1,56 @@
+import io
+from unittest.mock import patch
+
+from PIL import Image as PILImage
+
+from app.modules.rag.services.image_processing import get_image_pool, transcode_image
+
+
+def _png(width: int, height: int, mode: str = "RGB") -> bytes:
+    buffer = io.BytesIO()
+    PILImage.new(mode, (width, height)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_transcode_image_produces_capped_webp_renditions() -> None:
+    transcoded = transcode_image(_png(2000, 1000), 64, 1280, 256, 80)
+
+    assert transcoded is not None
+    assert (transcoded["width"], transcoded["height"]) == (1280, 640)
+    with PILImage.open(io.BytesIO(transcoded["display"])) as display:
+        assert display.format == "WEBP"
+        assert display.size == (1280, 640)
+    with PILImage.open(io.BytesIO(transcoded["thumbnail"])) as thumbnail:
+        assert thumbnail.format == "WEBP"
+        assert thumbnail.size == (256, 128)
+
+
+def test_transcode_image_keeps_alpha_and_small_images_unscaled() -> None:
+    transcoded = transcode_image(_png(100, 80, mode="RGBA"), 64, 1280, 256, 80)
+
+    assert transcoded is not None
+    with PILImage.open(io.BytesIO(transcoded["display"])) as display:
+        assert display.size == (100, 80)
+        assert display.mode == "RGBA"
+
+
+def test_transcode_image_drops_tiny_images() -> None:
+    assert transcode_image(_png(300, 20), 64, 1280, 256, 80) is None
+
+
+def test_transcode_image_drops_undecodable_data() -> None:
+    assert transcode_image(b"not an image", 64, 1280, 256, 80) is None
+
+
+def test_image_pool_uses_spawn_context() -> None:
+    get_image_pool.cache_clear()
+    with (
+        patch("app.modules.rag.services.image_processing.settings") as mock_settings,
+        patch("app.modules.rag.services.image_processing.ProcessPoolExecutor") as mock_pool,
+    ):
+        mock_settings.IMAGE_PROCESSING_WORKERS = 2
+        get_image_pool()
+    get_image_pool.cache_clear()
+
+    assert mock_pool.call_args.kwargs["max_workers"] == 2
+    assert mock_pool.call_args.kwargs["mp_context"].get_start_method() == "spawn"
@@ -0,0 +1,35 @@
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.modules.rag.models import Image
+from app.modules.rag.repositories.image import ImageRepository
+from app.modules.rag.schema import ImageRendition
+from app.modules.rag.services.image_service import ImageService
+from app.modules.rag.services.image_storage_service import ImageStorageService
+
+
+@pytest.mark.asyncio
+async def test_get_image_reads_repository() -> None:
+    image = Image(id=1, file_id=1, image_data="", mime_type="image/webp")
+    mock_repo = MagicMock(spec=ImageRepository)
+    mock_repo.get_by_id = AsyncMock(return_value=image)
+    service = ImageService(image_repository=mock_repo, image_storage=MagicMock(spec=ImageStorageService))
+
+    assert await service.get_image(1) is image
+    mock_repo.get_by_id.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_get_path_and_read_delegate_to_storage() -> None:
+    image = Image(id=1, file_id=1, image_data="", mime_type="image/webp")
+    mock_storage = MagicMock(spec=ImageStorageService)
+    mock_storage.get_path = AsyncMock(return_value=Path("/tmp/thumb.webp"))
+    mock_storage.read = AsyncMock(return_value=b"thumbnail")
+    service = ImageService(image_repository=MagicMock(spec=ImageRepository), image_storage=mock_storage)
+
+    assert await service.get_path(image, ImageRendition.THUMBNAIL) == Path("/tmp/thumb.webp")
+    assert await service.read(image, ImageRendition.THUMBNAIL) == b"thumbnail"
+    mock_storage.get_path.assert_called_once_with(image, ImageRendition.THUMBNAIL)
+    mock_storage.read.assert_called_once_with(image, ImageRendition.THUMBNAIL)
@@ -0,0 +1,107 @@
+import base64
+import hashlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from PIL import Image as PILImage
+
+from app.core.storage import LocalStorage
+from app.modules.rag.models import Image
+from app.modules.rag.schema import ImageRendition
+from app.modules.rag.services.image_storage_service import ImageStorageService
+
+PNG_DATA = b"\x89PNG\r\n\x1a\n" + b"pixels"
+
+
+def _service(tmp_path: Path) -> ImageStorageService:
+    with patch("app.modules.rag.services.image_storage_service.settings") as mock_settings:
+        mock_settings.STORAGE_DIR = tmp_path
+        return ImageStorageService(storage=LocalStorage(tmp_path))
+
+
+@pytest.mark.asyncio
+async def test_store_writes_content_addressed_blob(tmp_path: Path) -> None:
+    service = _service(tmp_path)
+    content_hash = hashlib.sha256(PNG_DATA).hexdigest()
+
+    stored_image = await service.store(PNG_DATA)
+
+    assert stored_image == {
+        "content_hash": content_hash,
+        "storage_key": f"images/{content_hash[:2]}/{content_hash}",
+        "mime_type": "image/png",
+        "file_size": len(PNG_DATA),
+    }
+    assert (tmp_path / stored_image["storage_key"]).read_bytes() == PNG_DATA
+
+
+@pytest.mark.asyncio
+async def test_store_skips_existing_blob(tmp_path: Path) -> None:
+    service = _service(tmp_path)
+    await service.store(PNG_DATA)
+    service.storage.put = AsyncMock()
+
+    await service.store(PNG_DATA)
+
+    service.storage.put.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_store_base64_strips_data_uri(tmp_path: Path) -> None:
+    service = _service(tmp_path)
+    data_uri = f"data:image/jpeg;base64,{base64.b64encode(b'\xff\xd8\xffjpeg').decode()}"
+
+    stored_image = await service.store_base64(data_uri)
+
+    assert stored_image["mime_type"] == "image/jpeg"
+    assert stored_image["file_size"] == 7
+
+
+@pytest.mark.asyncio
+async def test_read_stored_and_inline_images(tmp_path: Path) -> None:
+    service = _service(tmp_path)
+    stored_image = await service.store(PNG_DATA)
+    stored = Image(file_id=1, storage_key=stored_image["storage_key"])
+    inline = Image(file_id=1, image_data=base64.b64encode(PNG_DATA).decode())
+
+    assert await service.read(stored) == PNG_DATA
+    assert await service.read(inline) == PNG_DATA
+    assert await service.get_path(inline) is None
+
+
+@pytest.mark.asyncio
+async def test_render_and_store_display_and_thumbnail(tmp_path: Path) -> None:
+    service = _service(tmp_path)
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (400, 200)).save(buffer, format="PNG")
+    image_data = buffer.getvalue()
+
+    with (
+        ThreadPoolExecutor(max_workers=1) as pool,
+        patch("app.modules.rag.services.image_storage_service.get_image_pool", return_value=pool),
+        patch("app.modules.rag.services.image_storage_service.settings") as mock_settings,
+    ):
+        mock_settings.IMAGE_MIN_DIMENSION = 64
+        mock_settings.IMAGE_DISPLAY_MAX_DIMENSION = 300
+        mock_settings.IMAGE_THUMBNAIL_MAX_DIMENSION = 100
+        mock_settings.IMAGE_WEBP_QUALITY = 80
+        rendered = await service.render(base64.b64encode(image_data).decode())
+        dropped = await service.render(base64.b64encode(PNG_DATA).decode())
+
+    assert dropped is None
+    assert not (tmp_path / rendered["stored_image"]["storage_key"]).exists()
+    stored_image = await service.store_rendered(rendered)
+    assert stored_image["content_hash"] == hashlib.sha256(image_data).hexdigest()
+    assert stored_image["mime_type"] == "image/webp"
+    assert (stored_image["width"], stored_image["height"]) == (300, 150)
+    image = Image(
+        file_id=1,
+        storage_key=stored_image["storage_key"],
+        thumbnail_key=stored_image["thumbnail_key"],
+    )
+    with PILImage.open(await service.get_path(image, ImageRendition.THUMBNAIL)) as thumbnail:
+        assert thumbnail.size == (100, 50)
+    assert await service.read(image) == (tmp_path / stored_image["storage_key"]).read_bytes()
@@ -0,0 +1,70 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.files.models import File
+from app.modules.rag.schema import IngestionJobStatus
+from app.modules.rag.services import ingestion_service
+from app.modules.rag.services.ingestion_service import get_ingestion_job, schedule_ingestion
+
+
+@pytest.mark.asyncio
+async def test_schedule_ingestion_tracks_job_status(mock_file: File) -> None:
+    mock_files_repo = MagicMock()
+    mock_files_repo.get_by_ids = AsyncMock(return_value=[mock_file])
+    mock_document_service = MagicMock()
+    mock_document_service.ingest_file = AsyncMock(return_value=True)
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__ = AsyncMock()
+    session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    with (
+        patch.object(ingestion_service, "async_session", session_factory),
+        patch.object(ingestion_service, "FileRepository", return_value=mock_files_repo),
+        patch.object(ingestion_service, "_build_document_service", return_value=mock_document_service),
+    ):
+        job_ids = schedule_ingestion([mock_file.id, 99])
+        assert get_ingestion_job(job_ids[mock_file.id]).status == IngestionJobStatus.QUEUED
+        await asyncio.gather(*ingestion_service._background_tasks)
+
+    mock_document_service.ingest_file.assert_called_once_with(mock_file)
+    assert get_ingestion_job(job_ids[mock_file.id]).status == IngestionJobStatus.COMPLETED
+    missing_job = get_ingestion_job(job_ids[99])
+    assert missing_job.status == IngestionJobStatus.FAILED
+    assert missing_job.error == "File not found"
+
+
+def test_schedule_ingestion_without_files() -> None:
+    assert schedule_ingestion([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_schedule_ingestion_skips_files_already_scheduled(mock_file: File) -> None:
+    release = asyncio.Event()
+
+    async def ingest_file(file: File) -> bool:
+        await release.wait()
+        return True
+
+    mock_files_repo = MagicMock()
+    mock_files_repo.get_by_ids = AsyncMock(return_value=[mock_file])
+    mock_document_service = MagicMock()
+    mock_document_service.ingest_file = AsyncMock(side_effect=ingest_file)
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__ = AsyncMock()
+    session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    with (
+        patch.object(ingestion_service, "async_session", session_factory),
+        patch.object(ingestion_service, "FileRepository", return_value=mock_files_repo),
+        patch.object(ingestion_service, "_build_document_service", return_value=mock_document_service),
+    ):
+        assert mock_file.id in schedule_ingestion([mock_file.id])
+        assert schedule_ingestion([mock_file.id]) == {}
+        release.set()
+        await asyncio.gather(*ingestion_service._background_tasks)
+        assert mock_file.id in schedule_ingestion([mock_file.id])
+        await asyncio.gather(*ingestion_service._background_tasks)
+
+    assert mock_document_service.ingest_file.await_count == 2
@@ -0,0 +1,137 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.rag.services.llm_provider import (
+    LocalLLMProvider,
+    OpenAIProvider,
+    get_llm_provider,
+)
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_complete() -> None:
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+    with patch("app.modules.rag.services.llm_provider.openai.AsyncOpenAI", return_value=mock_client):
+        provider = OpenAIProvider(api_key="test_key", model="gpt-4o-mini")
+        result = await provider.complete([{"role": "user", "content": "Hi"}], max_tokens=10, temperature=0.0)
+
+        assert result == mock_response
+        mock_client.chat.completions.create.assert_called_once_with(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": "Hi"}],
+            max_tokens=10,
+            temperature=0.0,
+        )
+
+
+def test_get_llm_provider_openai() -> None:
+    get_llm_provider.cache_clear()
+    with patch("app.modules.rag.services.llm_provider.settings") as mock_settings:
+        mock_settings.LLM_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test_key"
+        mock_settings.CHAT_MODEL = "gpt-4o-mini"
+
+        provider = get_llm_provider()
+
+        assert type(provider) is OpenAIProvider
+    get_llm_provider.cache_clear()
+
+
+def test_get_llm_provider_local() -> None:
+    get_llm_provider.cache_clear()
+    with patch("app.modules.rag.services.llm_provider.settings") as mock_settings:
+        mock_settings.LLM_PROVIDER = "local"
+        mock_settings.LOCAL_LLM_BASE_URL = "http://localhost:8001/v1"
+        mock_settings.CHAT_MODEL = "gpt-4o-mini"
+
+        provider = get_llm_provider()
+
+        assert isinstance(provider, LocalLLMProvider)
+        assert str(provider.client.base_url).startswith("http://localhost:8001/v1")
+    get_llm_provider.cache_clear()
+
+
+def test_get_llm_provider_unknown() -> None:
+    get_llm_provider.cache_clear()
+    with patch("app.modules.rag.services.llm_provider.settings") as mock_settings:
+        mock_settings.LLM_PROVIDER = "unknown"
+
+        with pytest.raises(ValueError):
+            get_llm_provider()
+    get_llm_provider.cache_clear()
+
+
+def _chat_completion_body(content: str) -> dict:
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o-mini",
+        "choices": [
+            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_complete_batch() -> None:
+    mock_client = MagicMock()
+    mock_client.files.create = AsyncMock(return_value=MagicMock(id="file-in"))
+    mock_client.batches.create = AsyncMock(return_value=MagicMock(id="batch-1", status="in_progress"))
+    mock_client.batches.retrieve = AsyncMock(
+        return_value=MagicMock(id="batch-1", status="completed", output_file_id="file-out")
+    )
+    output_lines = [
+        json.dumps({"custom_id": "1", "response": {"status_code": 200, "body": _chat_completion_body("second")}}),
+        json.dumps({"custom_id": "0", "response": {"status_code": 500, "body": {}}, "error": None}),
+    ]
+    mock_client.files.content = AsyncMock(return_value=MagicMock(text="\n".join(output_lines)))
+
+    with (
+        patch("app.modules.rag.services.llm_provider.openai.AsyncOpenAI", return_value=mock_client),
+        patch("app.modules.rag.services.llm_provider.asyncio.sleep", new=AsyncMock()),
+    ):
+        provider = OpenAIProvider(api_key="test_key", model="gpt-4o-mini")
+        result = await provider.complete_batch(
+            [[{"role": "user", "content": "first"}], [{"role": "user", "content": "second"}]],
+            max_tokens=10,
+            temperature=0.0,
+        )
+
+    assert result["batch_id"] == "batch-1"
+    assert result["responses"][0] is None
+    assert result["responses"][1].choices[0].message.content == "second"
+    mock_client.batches.create.assert_called_once_with(
+        input_file_id="file-in", endpoint="/v1/chat/completions", completion_window="24h"
+    )
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_complete_batch_skips_empty_batch() -> None:
+    mock_client = MagicMock()
+    mock_client.files.create = AsyncMock()
+
+    with patch("app.modules.rag.services.llm_provider.openai.AsyncOpenAI", return_value=mock_client):
+        provider = OpenAIProvider(api_key="test_key", model="gpt-4o-mini")
+        result = await provider.complete_batch([], max_tokens=10, temperature=0.0)
+
+    assert result == {"batch_id": None, "responses": []}
+    mock_client.files.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_local_provider_complete_batch_runs_concurrently() -> None:
+    provider = LocalLLMProvider(base_url="http://localhost:8001/v1", model="gpt-4o-mini")
+    response = MagicMock()
+    provider.complete = AsyncMock(side_effect=[response, Exception("boom")])
+
+    result = await provider.complete_batch(
+        [[{"role": "user", "content": "a"}], [{"role": "user", "content": "b"}]], max_tokens=10, temperature=0.0
+    )
+
+    assert result == {"batch_id": None, "responses": [response, None]}
@@ -0,0 +1,36 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from app.modules.rag.services import local_whisper
+
+
+def test_transcribe_uses_worker_model() -> None:
+    mock_model = MagicMock()
+    mock_model.transcribe.return_value = {"text": " Hello world "}
+
+    with (
+        patch.object(local_whisper, "_model", mock_model),
+        patch("app.modules.rag.services.local_whisper.decode_audio", return_value=np.zeros(16000)),
+    ):
+        text = local_whisper.transcribe(b"audio", "en")
+
+    assert text == "Hello world"
+    assert mock_model.transcribe.call_args.kwargs == {"language": "en", "fp16": False}
+
+
+def test_whisper_pool_spawns_workers_that_load_the_model() -> None:
+    local_whisper.get_whisper_pool.cache_clear()
+    with (
+        patch("app.modules.rag.services.local_whisper.settings") as mock_settings,
+        patch("app.modules.rag.services.local_whisper.ProcessPoolExecutor") as mock_pool,
+    ):
+        mock_settings.LOCAL_WHISPER_WORKERS = 2
+        mock_settings.LOCAL_WHISPER_MODEL = "small"
+        local_whisper.get_whisper_pool()
+    local_whisper.get_whisper_pool.cache_clear()
+
+    kwargs = mock_pool.call_args.kwargs
+    assert kwargs["mp_context"].get_start_method() == "spawn"
+    assert kwargs["initializer"] is local_whisper._load_model
+    assert kwargs["initargs"] == ("small",)
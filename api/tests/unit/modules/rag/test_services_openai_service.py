@@ -1,26 +1,179 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.core.deadline import Deadline
+from app.core.exceptions import DeadlineExceededError
+from app.core.latency import LatencyTracker
+from app.modules.rag.services.llm_provider import LLMProvider
 from app.modules.rag.services.openai_service import OpenAIService
 
 
-def test_generate_answer() -> None:
-    mock_client = MagicMock()
+@pytest.mark.asyncio
+async def test_generate_answer() -> None:
+    mock_provider = MagicMock(spec=LLMProvider)
+    mock_provider.model = "gpt-4o-mini"
     mock_response = MagicMock()
     mock_response.choices = [MagicMock()]
     mock_response.choices[0].message.content = "Generated answer"
     mock_response.usage.total_tokens = 100
-    mock_client.chat.completions.create.return_value = mock_response
+    mock_provider.complete = AsyncMock(return_value=mock_response)
 
-    with patch("app.modules.rag.services.openai_service.openai.OpenAI", return_value=mock_client):
-        with patch("app.modules.rag.services.openai_service.settings") as mock_settings:
-            mock_settings.OPENAI_API_KEY = "test_key"
-            mock_settings.CHAT_MODEL = "gpt-4o-mini"
-            mock_settings.MAX_TOKENS = 1000
+    with patch("app.modules.rag.services.openai_service.settings") as mock_settings:
+        mock_settings.MAX_TOKENS = 1000
+        mock_settings.LLM_HEDGING_ENABLED = False
+        mock_settings.PROMPT_LAYOUT = "context_first"
 
-            service = OpenAIService()
-            result = service.generate_answer("Question?", "Context")
+        service = OpenAIService(provider=mock_provider)
+        result = await service.generate_answer("Question?", "Context")
 
-            assert result == "Generated answer"
-            mock_client.chat.completions.create.assert_called_once()
+        assert result["answer_text"] == "Generated answer"
+        mock_provider.complete.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_generate_answer_cache_friendly_layout() -> None:
+    mock_provider = MagicMock(spec=LLMProvider)
+    mock_provider.model = "gpt-4o-mini"
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = "Generated answer"
+    mock_response.usage.prompt_tokens = 1500
+    mock_response.usage.prompt_tokens_details.cached_tokens = 1024
+    mock_provider.complete = AsyncMock(return_value=mock_response)
+
+    with patch("app.modules.rag.services.openai_service.settings") as mock_settings:
+        mock_settings.MAX_TOKENS = 1000
+        mock_settings.LLM_HEDGING_ENABLED = False
+        mock_settings.PROMPT_LAYOUT = "cache_friendly"
+
+        service = OpenAIService(provider=mock_provider)
+        result = await service.generate_answer("Question?", "Context")
+
+        messages = mock_provider.complete.call_args.kwargs["messages"]
+        assert "Instructions:" in messages[0]["content"]
+        assert "Context" not in messages[0]["content"]
+        assert messages[1]["content"].endswith("Question:\nQuestion?")
+        assert result["prompt_tokens"] == 1500
+        assert result["cached_tokens"] == 1024
+
+
+@pytest.mark.asyncio
+async def test_generate_answer_sends_hedged_request() -> None:
+    mock_provider = MagicMock(spec=LLMProvider)
+    mock_provider.model = "gpt-4o-mini"
+    fast_response = MagicMock()
+    fast_response.choices = [MagicMock()]
+    fast_response.choices[0].message.content = "Hedged answer"
+
+    calls = 0
+
+    async def complete(**kwargs: object) -> MagicMock:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(10)
+        return fast_response
+
+    mock_provider.complete = complete
+
+    with patch("app.modules.rag.services.openai_service.settings") as mock_settings:
+        mock_settings.MAX_TOKENS = 1000
+        mock_settings.PROMPT_LAYOUT = "context_first"
+        mock_settings.LLM_HEDGING_ENABLED = True
+        mock_settings.LLM_HEDGE_MIN_SAMPLES = 20
+        mock_settings.LLM_HEDGE_DELAY_MS = 10
+
+        service = OpenAIService(provider=mock_provider)
+        result = await service.generate_answer("Question?", "Context")
+
+        assert result["answer_text"] == "Hedged answer"
+        assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_answer_raises_when_all_hedged_requests_fail() -> None:
+    mock_provider = MagicMock(spec=LLMProvider)
+    mock_provider.model = "gpt-4o-mini"
+
+    async def complete(**kwargs: object) -> MagicMock:
+        await asyncio.sleep(0.05)
+        raise RuntimeError("provider unavailable")
+
+    mock_provider.complete = complete
+
+    with patch("app.modules.rag.services.openai_service.settings") as mock_settings:
+        mock_settings.MAX_TOKENS = 1000
+        mock_settings.PROMPT_LAYOUT = "context_first"
+        mock_settings.LLM_HEDGING_ENABLED = True
+        mock_settings.LLM_HEDGE_MIN_SAMPLES = 20
+        mock_settings.LLM_HEDGE_DELAY_MS = 10
+
+        service = OpenAIService(provider=mock_provider)
+        with pytest.raises(RuntimeError, match="provider unavailable"):
+            await service.generate_answer("Question?", "Context")
+
+
+def test_hedge_delay_falls_back_to_configured_delay() -> None:
+    mock_provider = MagicMock(spec=LLMProvider)
+    mock_provider.model = "gpt-4o-mini"
+
+    with (
+        patch("app.modules.rag.services.openai_service.settings") as mock_settings,
+        patch("app.modules.rag.services.openai_service.llm_latency", LatencyTracker()) as tracker,
+    ):
+        mock_settings.PROMPT_LAYOUT = "context_first"
+        mock_settings.LLM_HEDGE_DELAY_MS = 250
+        mock_settings.LLM_HEDGE_MIN_SAMPLES = 0
+        mock_settings.LLM_HEDGE_PERCENTILE = 95
+        service = OpenAIService(provider=mock_provider)
+
+        assert service._hedge_delay() == 0.25
+        tracker.record(0.4)
+        assert service._hedge_delay() == 0.4
+
+
+@pytest.mark.asyncio
+async def test_generate_answer_deadline_exceeded() -> None:
+    mock_provider = MagicMock(spec=LLMProvider)
+    mock_provider.model = "gpt-4o-mini"
+
+    async def complete(**kwargs: object) -> MagicMock:
+        await asyncio.sleep(10)
+        return MagicMock()
+
+    mock_provider.complete = complete
+
+    with patch("app.modules.rag.services.openai_service.settings") as mock_settings:
+        mock_settings.MAX_TOKENS = 1000
+        mock_settings.PROMPT_LAYOUT = "context_first"
+        mock_settings.LLM_HEDGING_ENABLED = False
+
+        service = OpenAIService(provider=mock_provider)
+        with pytest.raises(DeadlineExceededError):
+            await service.generate_answer("Question?", "Context", Deadline(0.05))
+
+
+@pytest.mark.asyncio
+async def test_generate_answers_batch() -> None:
+    mock_provider = MagicMock(spec=LLMProvider)
+    mock_provider.model = "gpt-4o-mini"
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = "Batch answer"
+    mock_response.usage.prompt_tokens = 200
+    mock_response.usage.prompt_tokens_details.cached_tokens = 0
+    mock_provider.complete_batch = AsyncMock(return_value={"batch_id": "batch-1", "responses": [mock_response, None]})
+
+    with patch("app.modules.rag.services.openai_service.settings") as mock_settings:
+        mock_settings.MAX_TOKENS = 1000
+        mock_settings.PROMPT_LAYOUT = "context_first"
+
+        service = OpenAIService(provider=mock_provider)
+        result = await service.generate_answers_batch([("Q1?", "C1"), ("Q2?", "C2")])
+
+    assert result["batch_id"] == "batch-1"
+    assert result["answers"][0] == {"answer_text": "Batch answer", "prompt_tokens": 200, "cached_tokens": 0}
+    assert result["answers"][1] is None
+    assert len(mock_provider.complete_batch.call_args.args[0]) == 2
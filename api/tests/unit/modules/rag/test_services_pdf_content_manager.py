@@ -1,12 +1,14 @@
-from unittest.mock import MagicMock, patch
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.core.storage import Storage
 from app.modules.rag.services.pdf_content_manager import PDFContentManager
 
 
 def test_partition_document() -> None:
-    manager = PDFContentManager()
+    manager = PDFContentManager(storage=MagicMock(spec=Storage))
     with patch("app.modules.rag.services.pdf_content_manager.partition_pdf") as mock_partition:
         mock_elements = [MagicMock(category="CompositeElement")]
         mock_partition.return_value = mock_elements
@@ -16,31 +18,40 @@ def test_partition_document() -> None:
         assert isinstance(result, list)
 
 
-def test_get_images_base64() -> None:
-    manager = PDFContentManager()
-    mock_element = MagicMock()
-    mock_element.category = "CompositeElement"
-    mock_element.metadata.orig_elements = []
-    elements = [mock_element]
+def test_get_chunk_images() -> None:
+    image = MagicMock(category="Image")
+    image.metadata.image_base64 = "aW1n"
+    blank_image = MagicMock(category="Image")
+    blank_image.metadata.image_base64 = None
+    chunk = MagicMock(category="CompositeElement")
+    chunk.metadata.orig_elements = [MagicMock(category="NarrativeText"), image, blank_image, image]
 
-    result = manager._get_images_base64("/path/to/file.pdf", elements)
+    result = PDFContentManager._get_chunk_images(chunk)
 
-    assert isinstance(result, list)
+    assert result == ["aW1n"]
 
 
-def test_get_images_base64_with_image_elements() -> None:
-    manager = PDFContentManager()
-    mock_image_element = MagicMock()
-    mock_image_element.category = "Image"
-    mock_image_element.metadata.image_base64 = "base64image"
+def test_get_chunk_images_without_orig_elements() -> None:
+    chunk = MagicMock(category="CompositeElement")
+    chunk.metadata.orig_elements = None
 
-    mock_composite = MagicMock()
-    mock_composite.category = "CompositeElement"
-    mock_composite.metadata.orig_elements = []
+    assert PDFContentManager._get_chunk_images(chunk) == []
 
-    elements = [mock_composite, mock_image_element]
 
-    result = manager._get_images_base64("/path/to/file.pdf", elements)
+@pytest.mark.asyncio
+async def test_process_fetches_file_from_storage() -> None:
+    mock_storage = MagicMock(spec=Storage)
+    mock_storage.fetch = AsyncMock(return_value=Path("/cache/blobs/ab/abc123"))
+    manager = PDFContentManager(storage=mock_storage)
+    composite = MagicMock(category="CompositeElement")
+    composite.metadata.orig_elements = []
 
-    assert len(result) == 1
-    assert result[0] == "base64image"
+    with patch(
+        "app.modules.rag.services.pdf_content_manager.partition_pdf", return_value=[composite]
+    ) as mock_partition:
+        texts, images = await manager.process("blobs/ab/abc123")
+
+    mock_storage.fetch.assert_called_once_with("blobs/ab/abc123")
+    assert mock_partition.call_args.kwargs["filename"] == "/cache/blobs/ab/abc123"
+    assert texts == [composite]
+    assert images == [[]]
@@ -0,0 +1,53 @@
+from unittest.mock import patch
+
+from app.modules.rag.services.search_results import build_context, build_sources, calculate_confidence
+
+
+def test_build_context_cache_friendly_orders_chunks() -> None:
+    search_results = [
+        {"text": "third", "metadata": {"file_id": 2, "chunk_index": 0, "filename": "b.pdf"}, "distance": 0.1},
+        {"text": "second", "metadata": {"file_id": 1, "chunk_index": 5, "filename": "a.pdf"}, "distance": 0.2},
+        {"text": "first", "metadata": {"file_id": 1, "chunk_index": 1, "filename": "a.pdf"}, "distance": 0.3},
+    ]
+
+    with patch("app.modules.rag.services.search_results.settings") as mock_settings:
+        mock_settings.PROMPT_LAYOUT = "cache_friendly"
+        context = build_context(search_results)
+
+    assert context.index("first") < context.index("second") < context.index("third")
+
+
+def test_build_context_uses_summaries_except_best_chunk() -> None:
+    search_results = [
+        {"text": "best full", "summary": "best summary", "metadata": {"filename": "a.pdf"}, "distance": 0.1},
+        {"text": "other full", "summary": "other summary", "metadata": {"filename": "a.pdf"}, "distance": 0.3},
+        {"text": "unsummarized full", "summary": None, "metadata": {"filename": "b.pdf"}, "distance": 0.4},
+    ]
+
+    with patch("app.modules.rag.services.search_results.settings") as mock_settings:
+        mock_settings.PROMPT_LAYOUT = "context_first"
+        context = build_context(search_results, use_summaries=True)
+
+    assert "best full" in context
+    assert "other summary" in context
+    assert "other full" not in context
+    assert "unsummarized full" in context
+
+
+def test_build_sources_skips_irrelevant_and_duplicate_results() -> None:
+    search_results = [
+        {"text": "a", "metadata": {"file_id": 1, "chunk_index": 0, "filename": "a.pdf"}, "distance": 0.2},
+        {"text": "a", "metadata": {"file_id": 1, "chunk_index": 0, "filename": "a.pdf"}, "distance": 0.3},
+        {"text": "b", "metadata": {"file_id": 2, "chunk_index": 1, "filename": "b.pdf"}, "distance": 0.9},
+    ]
+
+    sources = build_sources(search_results)
+
+    assert len(sources) == 1
+    assert sources[0].file_id == 1
+    assert sources[0].relevance_score == 0.8
+
+
+def test_calculate_confidence() -> None:
+    assert calculate_confidence([]) == 0.0
+    assert calculate_confidence([{"distance": 0.2}, {"distance": 0.4}]) == 0.7
@@ -0,0 +1,83 @@
+import hashlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.rag.models import TranscriptionCache
+from app.modules.rag.repositories.transcription_cache import TranscriptionCacheRepository
+from app.modules.rag.services.transcription_cache_service import (
+    TranscriptionCacheService,
+    transcription_memory_cache,
+)
+
+
+@pytest.fixture
+def cache_settings() -> MagicMock:
+    transcription_memory_cache.clear()
+    with patch("app.modules.rag.services.transcription_cache_service.settings") as mock_settings:
+        mock_settings.TRANSCRIPTION_CACHE_ENABLED = True
+        mock_settings.TRANSCRIPTION_BACKEND = "openai"
+        mock_settings.TRANSCRIPTION_MODEL = "whisper-1"
+        mock_settings.TRANSCRIPTION_LANGUAGE = "en"
+        yield mock_settings
+    transcription_memory_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_reads_database_then_memory(cache_settings: MagicMock) -> None:
+    audio_hash = hashlib.sha256(b"audio").hexdigest()
+    mock_repo = MagicMock(spec=TranscriptionCacheRepository)
+    mock_repo.get = AsyncMock(
+        return_value=TranscriptionCache(
+            audio_hash=audio_hash,
+            model="whisper-1",
+            language="en",
+            transcript_text="Hello",
+            audio_metadata={"provider": "openai"},
+        )
+    )
+    service = TranscriptionCacheService(repository=mock_repo)
+
+    first = await service.get(b"audio")
+    second = await service.get(b"audio")
+
+    assert first == ("Hello", {"provider": "openai", "cached": True})
+    assert second == first
+    mock_repo.get.assert_called_once_with(audio_hash, "whisper-1", "en")
+
+
+@pytest.mark.asyncio
+async def test_get_miss(cache_settings: MagicMock) -> None:
+    mock_repo = MagicMock(spec=TranscriptionCacheRepository)
+    mock_repo.get = AsyncMock(return_value=None)
+    service = TranscriptionCacheService(repository=mock_repo)
+
+    assert await service.get(b"audio") is None
+
+
+@pytest.mark.asyncio
+async def test_set_persists_and_keys_by_backend_model(cache_settings: MagicMock) -> None:
+    cache_settings.TRANSCRIPTION_BACKEND = "local"
+    cache_settings.LOCAL_WHISPER_MODEL = "small"
+    mock_repo = MagicMock(spec=TranscriptionCacheRepository)
+    service = TranscriptionCacheService(repository=mock_repo)
+
+    await service.set(b"audio", "Hello", {"provider": "local"})
+
+    entry = mock_repo.create.call_args.args[0]
+    assert entry.model == "local:small"
+    assert entry.transcript_text == "Hello"
+    assert await service.get(b"audio") == ("Hello", {"provider": "local", "cached": True})
+    mock_repo.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache(cache_settings: MagicMock) -> None:
+    cache_settings.TRANSCRIPTION_CACHE_ENABLED = False
+    mock_repo = MagicMock(spec=TranscriptionCacheRepository)
+    service = TranscriptionCacheService(repository=mock_repo)
+
+    await service.set(b"audio", "Hello", {})
+
+    assert await service.get(b"audio") is None
+    mock_repo.create.assert_not_called()
@@ -19,6 +19,8 @@ const AppContent: React.FC = () => {
   const { isAuthenticated, user, login, isLoading } = useAuth()
   const [activeTab, setActiveTab] = useState<'chat' | 'files' | 'history' | 'stats' | 'admin'>('chat')
   const [files, setFiles] = useState<any[]>([])
+  const [filesCursor, setFilesCursor] = useState<string | null>(null)
+  const [filesTotal, setFilesTotal] = useState<number | null>(null)
   const [filesLoading, setFilesLoading] = useState(false)
   const [uploading, setUploading] = useState(false)
   const [filesError, setFilesError] = useState<string | null>(null)
@@ -77,8 +79,10 @@ const AppContent: React.FC = () => {
     setFilesLoading(true)
     setFilesError(null)
     try {
-      const loadedFiles = await FileService.getFiles()
-      setFiles(loadedFiles)
+      const page = await FileService.getFiles()
+      setFiles(page.files)
+      setFilesCursor(page.next_cursor)
+      setFilesTotal(page.estimated_total)
     } catch (error) {
       console.error('Error loading files:', error)
       setFilesError('Failed to load files')
@@ -87,6 +91,20 @@ const AppContent: React.FC = () => {
     }
   }
 
+  const loadMoreFiles = async () => {
+    if (!filesCursor) {
+      return
+    }
+    try {
+      const page = await FileService.getFiles(filesCursor)
+      setFiles(prev => [...prev, ...page.files])
+      setFilesCursor(page.next_cursor)
+    } catch (error) {
+      console.error('Error loading files:', error)
+      setFilesError('Failed to load files')
+    }
+  }
+
   const handleFileUpload = async (file: File) => {
     setUploading(true)
     setFilesError(null)
@@ -246,17 +264,31 @@ const AppContent: React.FC = () => {
                   </Card>
                   <Card>
                     <div className="p-6">
-                      <h2 className="text-2xl font-semibold mb-4">Your Files</h2>
+                      <h2 className="text-2xl font-semibold mb-4">
+                        Your Files
+                        {filesTotal !== null && (
+                          <span className="ml-2 text-sm font-normal text-muted-foreground">~{filesTotal}</span>
+                        )}
+                      </h2>
                       {filesLoading ? (
                         <div className="flex items-center justify-center py-8">
                           <Loader2 className="h-6 w-6 animate-spin" />
                         </div>
                       ) : (
-                        <FileList
-                          files={files}
-                          onDeleteFile={handleFileDelete}
-                          isDeleting={filesLoading}
-                        />
+                        <>
+                          <FileList
+                            files={files}
+                            onDeleteFile={handleFileDelete}
+                            isDeleting={filesLoading}
+                          />
+                          {filesCursor && (
+                            <div className="flex justify-center pt-4">
+                              <Button variant="outline" onClick={loadMoreFiles}>
+                                Load more
+                              </Button>
+                            </div>
+                          )}
+                        </>
                       )}
                     </div>
                   </Card>
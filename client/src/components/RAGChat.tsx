@@ -179,11 +179,14 @@ export function RAGChat() {
                           <div className="grid grid-cols-1 sm:grid-cols-2 gap-2">
                             {message.images.map((image, idx) => (
                               <div key={idx} className="relative rounded-lg overflow-hidden border">
-                                <img
-                                  src={image.image_path}
-                                  alt={image.description || `Image ${idx + 1}`}
-                                  className="w-full h-auto object-contain max-h-64"
-                                />
+                                <a href={image.image_path} target="_blank" rel="noreferrer">
+                                  <img
+                                    src={image.thumbnail_path ?? image.image_path}
+                                    alt={image.description || `Image ${idx + 1}`}
+                                    loading="lazy"
+                                    className="w-full h-auto object-contain max-h-64"
+                                  />
+                                </a>
                                 {image.description && (
                                   <div className="absolute bottom-0 left-0 right-0 bg-black/60 text-white text-xs p-2">
                                     {image.description}
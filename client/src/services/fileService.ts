@@ -11,6 +11,12 @@ export interface FileItem {
   error_message?: string
 }
 
+export interface FileListPage {
+  files: FileItem[]
+  next_cursor: string | null
+  estimated_total: number | null
+}
+
 export class FileService {
   static async uploadFile(file: File): Promise<FileItem> {
     const formData = new FormData()
@@ -28,8 +34,12 @@ export class FileService {
     return response.json()
   }
 
-  static async getFiles(): Promise<FileItem[]> {
-    const response = await apiFetch('/files/')
+  static async getFiles(cursor?: string | null): Promise<FileListPage> {
+    const params = new URLSearchParams({ include_total: 'true' })
+    if (cursor) {
+      params.set('cursor', cursor)
+    }
+    const response = await apiFetch(`/files/?${params}`)
 
     if (!response.ok) {
       throw new Error(`Failed to fetch files: ${response.statusText}`)
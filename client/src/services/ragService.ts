@@ -9,7 +9,9 @@ export interface SourceReference {
 }
 
 export interface ImageReference {
+  image_id: number
   image_path: string
+  thumbnail_path: string | null
   description: string | null
   page_number: number | null
   file_id: number